@@ -0,0 +1,90 @@
+"""
+Path: benchmarks/bench_async_engine.py
+Compara la latencia de ciclo del bucle síncrono (leer y luego escribir) contra el
+motor asyncio (escritura solapada con la siguiente lectura), usando un dispositivo
+y un repositorio simulados con latencias configurables.
+
+Uso: python -m benchmarks.bench_async_engine [ciclos] [latencia_bus_ms] [latencia_db_ms]
+"""
+
+import sys
+import time
+import asyncio
+import logging
+from src.infrastructure.register_map_loader import cargar_plan_lectura
+from src.infrastructure.async_engine import AsyncAcquisitionEngine
+from src.modbus_processor import ModbusProcessor
+
+
+class SlowDevice:
+    connection_lost = False
+
+    def __init__(self, latencia_s):
+        self.latencia_s = latencia_s
+
+    def select_slave(self, slave_address):
+        pass
+
+    def read_registers(self, start, count, functioncode=3):
+        time.sleep(self.latencia_s)
+        return [0] * count
+
+    def read_digital_inputs(self, start, count, functioncode=2):
+        time.sleep(self.latencia_s)
+        return [0] * count
+
+
+class SlowSession:
+    def __init__(self, device):
+        self.device = device
+
+    def get_device(self):
+        return self.device
+
+    def invalidate(self):
+        pass
+
+
+class SlowRepository:
+    def __init__(self, latencia_s):
+        self.latencia_s = latencia_s
+
+    def actualizar_registro(self, consulta, parametros):
+        time.sleep(self.latencia_s)
+
+
+def bench_sync(device, repository, plan, logger, ciclos):
+    processor = ModbusProcessor(device, repository, logger, plan)
+    inicio = time.perf_counter()
+    for _ in range(ciclos):
+        processor.process()
+    return (time.perf_counter() - inicio) / ciclos
+
+
+def bench_async(device, repository, plan, logger, ciclos):
+    engine = AsyncAcquisitionEngine(SlowSession(device), repository, plan, logger, periodo_s=0.0)
+    inicio = time.perf_counter()
+    asyncio.run(engine.run(lambda: engine.stats["ciclos"] < ciclos))
+    total = (time.perf_counter() - inicio) / ciclos
+    return total, engine.get_stats()["latencia_promedio_s"]
+
+
+def main():
+    ciclos = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    latencia_bus = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.02
+    latencia_db = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.005
+    logger = logging.getLogger("bench")
+    logger.disabled = True
+    plan = cargar_plan_lectura()
+    device = SlowDevice(latencia_bus)
+    repository = SlowRepository(latencia_db)
+
+    sync_ciclo = bench_sync(device, repository, plan, logger, ciclos)
+    async_ciclo, async_latencia = bench_async(device, repository, plan, logger, ciclos)
+    print(f"Ciclos: {ciclos}, latencia bus {latencia_bus * 1000:.1f} ms, latencia DB {latencia_db * 1000:.1f} ms")
+    print(f"Síncrono: {sync_ciclo * 1000:.2f} ms por ciclo")
+    print(f"asyncio:  {async_ciclo * 1000:.2f} ms por ciclo (adquisición {async_latencia * 1000:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
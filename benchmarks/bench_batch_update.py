@@ -0,0 +1,74 @@
+"""
+Path: benchmarks/bench_batch_update.py
+Compara la persistencia de un ciclo registro por registro (un commit por fila, como
+actualizar_registro) contra actualizar_lote (una transacción y un commit por ciclo),
+usando el SQLAlchemyDatabaseRepository real sobre una base SQLite local en archivo.
+
+Uso: python -m benchmarks.bench_batch_update --registros 50 --ciclos 100
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from sqlalchemy import create_engine, text
+from src.domain.modbus_register import ModbusRegister
+from src.domain.register_map import DefinicionRegistro, compilar_plan
+from src.infrastructure.db_operations import SQLAlchemyDatabaseRepository
+from src.modbus_processor import ModbusProcessor
+
+
+class SinLoteRepository:
+    """Expone solo actualizar_registro, para forzar el camino de una escritura por registro."""
+    def __init__(self, repository):
+        self.repository = repository
+
+    def actualizar_registro(self, consulta, parametros):
+        self.repository.actualizar_registro(consulta, parametros)
+
+
+def medir(processor, registros: int, ciclos: int):
+    duraciones = []
+    for ciclo in range(ciclos):
+        lecturas = [ModbusRegister(i, ciclo, f"R{i}") for i in range(registros)]
+        inicio = time.perf_counter()
+        processor.persist(lecturas)
+        duraciones.append(time.perf_counter() - inicio)
+    duraciones.sort()
+    return duraciones[len(duraciones) // 2], duraciones[int(len(duraciones) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=50)
+    parser.add_argument("--ciclos", type=int, default=100)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    plan = compilar_plan([DefinicionRegistro(f"R{i}", i, direccion_db=i) for i in range(args.registros)])
+    with tempfile.TemporaryDirectory() as directorio:
+        engine = create_engine(f"sqlite:///{os.path.join(directorio, 'bench.db')}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE registros_modbus (direccion_modbus INTEGER PRIMARY KEY, valor INTEGER)"))
+            conn.execute(
+                text("INSERT INTO registros_modbus VALUES (:d, 0)"), [{"d": i} for i in range(args.registros)]
+            )
+        repository = SQLAlchemyDatabaseRepository(engine=engine)
+        logger = logging.getLogger("bench")
+        resultados = {
+            "por registro": medir(
+                ModbusProcessor(None, SinLoteRepository(repository), logger, plan), args.registros, args.ciclos
+            ),
+            "en lote": medir(ModbusProcessor(None, repository, logger, plan), args.registros, args.ciclos),
+        }
+        repository.cerrar_conexion()
+
+    print(f"Registros por ciclo: {args.registros}, ciclos: {args.ciclos}")
+    for nombre, (p50, p99) in resultados.items():
+        print(f"{nombre:>13}: p50 {p50 * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms por ciclo")
+    print(f"Mejora p50: x{resultados['por registro'][0] / resultados['en lote'][0]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Path: benchmarks/bench_modbus_tcp.py
+Mide la tasa de sondeo de ModbusProcessor sobre Modbus TCP contra el simulador local,
+sin hardware ni base de datos.
+
+Uso: python -m benchmarks.bench_modbus_tcp [ciclos]
+"""
+
+import sys
+import time
+import logging
+from src.infrastructure.modbus_tcp import ModbusTcpConnectionManager
+from src.infrastructure.modbus_tcp_simulator import ModbusTcpSimulator
+from src.infrastructure.register_map_loader import cargar_plan_lectura
+from src.modbus_processor import ModbusSession, ModbusProcessor
+
+
+class NullRepository:
+    def actualizar_registro(self, consulta, parametros):
+        pass
+
+
+def main():
+    ciclos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    logger = logging.getLogger("bench")
+    logger.disabled = True
+    plan = cargar_plan_lectura()
+    with ModbusTcpSimulator() as simulator:
+        manager = ModbusTcpConnectionManager(logger, "127.0.0.1", simulator.port)
+        session = ModbusSession(logger, connection_manager=manager)
+        processor = ModbusProcessor(session.get_device(), NullRepository(), logger, plan)
+        inicio = time.perf_counter()
+        for _ in range(ciclos):
+            processor.acquire()
+        duracion = time.perf_counter() - inicio
+        session.cerrar_conexion()
+    print(f"Ciclos: {ciclos}, peticiones: {simulator.requests}")
+    print(f"{ciclos / duracion:.0f} ciclos/s, {simulator.requests / duracion:.0f} peticiones/s, "
+          f"{duracion / ciclos * 1e6:.1f} µs por ciclo")
+
+
+if __name__ == "__main__":
+    main()
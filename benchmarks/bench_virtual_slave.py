@@ -0,0 +1,107 @@
+"""
+Path: benchmarks/bench_virtual_slave.py
+Generador de carga: ejecuta el ModbusProcessor real (lectura en bloques, conversión,
+detección de cambios y persistencia contra un repositorio nulo) sobre el esclavo virtual,
+con mapas de registros grandes, latencia, jitter y errores configurables.
+
+Uso: python -m benchmarks.bench_virtual_slave --registros 500 --esclavos 2 --ciclos 200 \\
+         --latencia-ms 2 --jitter-ms 1 --tasa-timeouts 0.01 --cambios 0.1
+"""
+
+import argparse
+import logging
+import random
+import time
+from src.domain.change_detection import DetectorCambios
+from src.domain.register_map import DefinicionRegistro, compilar_plan
+from src.infrastructure.modbus_metrics import ModbusTransactionMetrics
+from src.infrastructure.modbus_virtual_slave import VirtualSlaveInstrument
+from src.modbus_processor import ModbusDevice, ModbusProcessor, ModbusReadError
+
+
+class NullRepository:
+    def __init__(self):
+        self.escrituras = 0
+
+    def actualizar_registro(self, consulta, parametros):
+        self.escrituras += 1
+
+
+def generar_plan(registros: int, esclavos: int):
+    """Plan con registros de retención consecutivos repartidos entre los esclavos."""
+    por_esclavo = max(1, registros // esclavos)
+    definiciones = [
+        DefinicionRegistro(f"S{esclavo}_R{i}", i, dispositivo=esclavo, direccion_db=esclavo * 100000 + i)
+        for esclavo in range(1, esclavos + 1)
+        for i in range(por_esclavo)
+    ]
+    return compilar_plan(definiciones)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=500)
+    parser.add_argument("--esclavos", type=int, default=1)
+    parser.add_argument("--ciclos", type=int, default=200)
+    parser.add_argument("--latencia-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--tasa-timeouts", type=float, default=0.0)
+    parser.add_argument("--tasa-crc", type=float, default=0.0)
+    parser.add_argument("--baudios", type=int, default=0, help="modela el tiempo de línea (0 = sin modelar)")
+    parser.add_argument("--cambios", type=float, default=0.1, help="fracción de registros que cambia por ciclo")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench")
+    logger.disabled = True
+    plan = generar_plan(args.registros, args.esclavos)
+    instrument = VirtualSlaveInstrument(
+        slave_ids=tuple(range(1, args.esclavos + 1)),
+        latencia_s=args.latencia_ms / 1000,
+        jitter_s=args.jitter_ms / 1000,
+        tasa_timeouts=args.tasa_timeouts,
+        tasa_crc=args.tasa_crc,
+        modelar_linea=bool(args.baudios),
+        seed=args.seed,
+    )
+    instrument.serial.timeout = 1.0
+    if args.baudios:
+        instrument.serial.baudrate = args.baudios
+    metrics = ModbusTransactionMetrics()
+    repository = NullRepository()
+    processor = ModbusProcessor(
+        ModbusDevice(instrument, logger, metrics), repository, logger, plan,
+        DetectorCambios(refresco_forzado_s=float("inf")),
+    )
+    rng = random.Random(args.seed)
+    direcciones = [(paso.dispositivo, direccion) for paso in plan.pasos for direccion in paso.bloque.addresses]
+    por_ciclo = int(len(direcciones) * args.cambios)
+
+    fallos = 0
+    duraciones = []
+    inicio = time.perf_counter()
+    for ciclo in range(args.ciclos):
+        for esclavo, direccion in rng.sample(direcciones, por_ciclo):
+            instrument.bank(esclavo).set_register(direccion, ciclo)
+        inicio_ciclo = time.perf_counter()
+        try:
+            processor.process()
+        except ModbusReadError:
+            fallos += 1
+        duraciones.append(time.perf_counter() - inicio_ciclo)
+    duracion = time.perf_counter() - inicio
+
+    duraciones.sort()
+    leidos = len(direcciones) * (args.ciclos - fallos)
+    print(f"Registros: {len(direcciones)} en {len(plan.pasos)} bloques, esclavos: {args.esclavos}")
+    print(f"Ciclos: {args.ciclos}, fallidos: {fallos}, peticiones: {instrument.peticiones}, "
+          f"escrituras: {repository.escrituras}")
+    print(f"{args.ciclos / duracion:.0f} ciclos/s, {leidos / duracion:.0f} registros/s")
+    print(f"Ciclo p50: {duraciones[len(duraciones) // 2] * 1000:.2f} ms, "
+          f"p99: {duraciones[int(len(duraciones) * 0.99) - 1] * 1000:.2f} ms, "
+          f"max: {duraciones[-1] * 1000:.2f} ms")
+    print(f"Transacciones: {metrics.totales()}")
+
+
+if __name__ == "__main__":
+    main()
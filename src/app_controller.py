@@ -5,19 +5,76 @@ Este módulo se encarga de controlar el ciclo principal de la aplicación,
 procesando operaciones Modbus y transferencias de datos.
 """
 
-import time
 import signal
+import asyncio
 import platform
 from src.utils.logging.dependency_injection import get_logger
-from src.modbus_processor import process_modbus_operations
+from src.modbus_processor import process_modbus_operations, adquirir_registros, ModbusProcessor, ModbusSession
 from src.data_transfer_controller import main_transfer_controller
 from src.infrastructure.CLI.app_view import clear_screen
+from src.infrastructure.register_map_loader import cargar_plan_lectura, cargar_planes_por_puerto
+from src.infrastructure.modbus_bus_scheduler import ModbusBusScheduler
+from src.infrastructure.parallel_acquisition import ParallelAcquisition
+from src.infrastructure.async_engine import AsyncAcquisitionEngine
+from src.infrastructure.acquisition_pipeline import AcquisitionPipeline
+from src.infrastructure.sample_ring_buffer import SampleStore
+from src.infrastructure.engine_registry import obtener_registro_engines
+from src.infrastructure.statement_cache import obtener_cache_sentencias
+from src.domain.change_detection import DetectorCambios
+from src.utils.circuit_breaker import CircuitBreaker
+from src.utils.cycle_stats import CycleJitterStats
+from src.utils.fixed_rate_scheduler import FixedRateScheduler
+from src.domain.modbus_register import ultima_lectura
 
 class AppController:
     """Controlador principal que gestiona el ciclo de la aplicación."""
-    def __init__(self, logger=None, repository=None):
+    def __init__(self, logger=None, repository=None, modbus_session=None, read_plan=None,
+                 parallel=False, async_mode=False, loop_scheduler=None, pipeline=False, sample_store=None):
         self.logger = logger or get_logger()
         self.repository = repository
+        # Ritmo del bucle principal: plazos absolutos (MAIN_LOOP_PERIOD_S), sin deriva
+        self.loop_scheduler = loop_scheduler or FixedRateScheduler.from_env()
+        periodo_s = self.loop_scheduler.periodo_s
+        # La sesión Modbus vive mientras viva el controlador: el puerto se abre una vez
+        if modbus_session is None:
+            from src.infrastructure.factories import create_modbus_connection_manager
+            modbus_session = ModbusSession(self.logger, create_modbus_connection_manager(self.logger))
+        self.modbus_session = modbus_session
+        # El mapa de registros se compila una sola vez al inicio
+        self.read_plan = read_plan or cargar_plan_lectura()
+        # Últimas N muestras de cada registro en memoria, alimentadas por la adquisición
+        self.sample_store = sample_store or SampleStore.from_env()
+        # Caché de últimos valores escritos: solo los cambios llegan a la base de datos
+        self.change_detector = DetectorCambios(self.read_plan.bandas, self.read_plan.refresco_forzado_s)
+        # Un dispositivo caído se omite sin tocar el puerto hasta el próximo intento de prueba
+        self.circuit_breaker = CircuitBreaker("dispositivo Modbus", self.logger)
+        # Con varios esclavos en el bus se sondean con el planificador round-robin
+        self.bus_scheduler = None
+        if len(self.read_plan.dispositivos()) > 1:
+            self.bus_scheduler = ModbusBusScheduler(
+                self.modbus_session, self.read_plan, self.logger, change_detector=self.change_detector
+            )
+        # Modo paralelo: un hilo por adaptador serie (mapa propio por puerto), persistencia desde este hilo
+        self.parallel_acquisition = None
+        if parallel:
+            self.parallel_acquisition = ParallelAcquisition(
+                self.read_plan, self.logger, planes_por_puerto=cargar_planes_por_puerto(),
+                periodo_s=periodo_s, sample_store=self.sample_store,
+                politica_overrun=self.loop_scheduler.politica,
+            )
+        self.async_mode = async_mode
+        # Modo pipeline: hilo de adquisición y hilo escritor desacoplados por una cola acotada
+        self.pipeline = None
+        if pipeline:
+            self.pipeline = AcquisitionPipeline.from_env(
+                self._adquirir, self._persistir, self.logger,
+                periodo_s=periodo_s, politica_overrun=self.loop_scheduler.politica,
+            )
+        self._repositorio_pipeline = None
+        # Controlador de transferencia de larga vida: conserva el snapshot anterior de ProductionLog
+        self.transfer_controller = None
+        # Período real del bucle principal y su desvío respecto del período configurado
+        self.cycle_stats = CycleJitterStats(periodo_objetivo_s=periodo_s)
         self.running = True
 
     def setup_signal_handlers(self):
@@ -41,35 +98,128 @@ class AppController:
     @log_execution()
     def execute_main_operations(self):
         "Se encarga de ejecutar las operaciones principales del programa."
+        self.cycle_stats.marcar()
         self.logger.debug(
             "Ejecutando iteración del bucle principal.",
             extra={"event": "main_loop_iteration", "controller": "AppController"}
         )
-        repo = self.repository
-        if repo is None:
-            from src.infrastructure.factories import create_repository
-            repo = create_repository()
+        repo = self._obtener_repositorio()
         self.logger.info(
             "Procesando operaciones Modbus.",
             extra={"event": "process_modbus", "repository": type(repo).__name__}
         )
-        process_modbus_operations(repository=repo)
+        marca_lectura = None
+        if self.pipeline is not None:
+            marca_lectura = self.pipeline.ultima_lectura
+            self.logger.debug(f"Métricas del pipeline: {self.pipeline.get_stats()}")
+        elif self.parallel_acquisition is not None:
+            self.parallel_acquisition.drain(repo)
+            marca_lectura = self.parallel_acquisition.ultima_lectura
+            self.logger.debug(f"Métricas de adquisición en paralelo: {self.parallel_acquisition.get_stats()}")
+        elif self.bus_scheduler is not None:
+            marca_lectura = self._recordar(self.bus_scheduler.poll_once(repo))
+            self.logger.debug(f"Métricas por esclavo: {self.bus_scheduler.get_stats()}")
+        else:
+            registros = process_modbus_operations(
+                repository=repo, session=self.modbus_session, read_plan=self.read_plan,
+                change_detector=self.change_detector, circuit_breaker=self.circuit_breaker,
+            )
+            marca_lectura = self._recordar(registros or [])
+            self.logger.debug(f"Circuito del dispositivo Modbus: {self.circuit_breaker.get_stats()}")
+        self.logger.debug(f"Métricas de sesión Modbus: {self.modbus_session.get_stats()}")
+        self.logger.debug(f"Escrituras omitidas por banda muerta: {self.change_detector.get_stats()}")
+        self.logger.debug(f"Muestras en memoria: {self.sample_store.get_stats()}")
+        self.logger.debug(f"Jitter del bucle principal: {self.cycle_stats.get_stats()}")
+        self.logger.debug(f"Plazos del bucle principal: {self.loop_scheduler.get_stats()}")
+        buffer = getattr(repo, "buffer", None)
+        if buffer is not None:
+            self.logger.debug(f"Buffer local de escrituras: {buffer.get_stats()}")
+        self.logger.debug(f"Pool de conexiones: {obtener_registro_engines().get_stats()}")
+        self.logger.debug(f"Caché de sentencias SQL: {obtener_cache_sentencias().get_stats()}")
         print("")  # Se puede remover o delegar a la vista según convenga
         self.logger.info(
             "Ejecutando transferencia de datos.",
             extra={"event": "data_transfer", "controller": "AppController"}
         )
-        main_transfer_controller()
-        time.sleep(1)
+        self._transferir(marca_lectura, repo)
         clear_screen()  # se utiliza la función de la vista
 
+    def _transferir(self, marca_lectura, repository):
+        "Ejecuta la transferencia reutilizando el mismo controlador en cada iteración."
+        self.transfer_controller = main_transfer_controller(
+            marca_lectura=marca_lectura, valores_locales=self.sample_store.ultimos_valores,
+            repository=repository, controller=self.transfer_controller,
+        )
+
+    def _obtener_repositorio(self):
+        "Repositorio del hilo principal: el inyectado o uno creado una sola vez (engine compartido)."
+        if self.repository is None:
+            from src.infrastructure.factories import create_repository
+            self.repository = create_repository()
+        return self.repository
+
+    def _recordar(self, registros):
+        "Agrega las lecturas al almacén de muestras y retorna el instante de la más reciente."
+        self.sample_store.registrar(registros)
+        return ultima_lectura(registros)
+
+    def _adquirir(self):
+        "Adquisición sin persistencia, ejecutada en el hilo de adquisición del pipeline."
+        if self.bus_scheduler is not None:
+            registros = self.bus_scheduler.poll_once()
+        else:
+            registros = adquirir_registros(self.modbus_session, self.read_plan, self.circuit_breaker)
+        self._recordar(registros)
+        return registros
+
+    def _persistir(self, registros):
+        "Persistencia de un lote, ejecutada en el hilo escritor del pipeline (único usuario de su repositorio)."
+        if self._repositorio_pipeline is None:
+            # Sesión propia: la del hilo principal la usa la transferencia (el engine es compartido)
+            from src.infrastructure.factories import create_repository
+            self._repositorio_pipeline = create_repository()
+        ModbusProcessor(
+            None, self._repositorio_pipeline, self.logger, self.read_plan, self.change_detector
+        ).persist(registros)
+
+    def run_async(self):
+        "Ejecuta la adquisición, persistencia y transferencia con el motor asyncio."
+        from src.infrastructure.factories import create_repository
+        repo = self._obtener_repositorio()
+        # La transferencia corre en su propio hilo: usa otra sesión sobre el mismo engine
+        repo_transferencia = create_repository()
+        engine = AsyncAcquisitionEngine(
+            self.modbus_session, repo, self.read_plan, self.logger, periodo_s=self.loop_scheduler.periodo_s,
+            transfer_callback=lambda: self._transferir(engine.ultima_lectura, repo_transferencia),
+            change_detector=self.change_detector, sample_store=self.sample_store,
+            circuit_breaker=self.circuit_breaker,
+        )
+        asyncio.run(engine.run(lambda: self.running))
+        self.logger.info(f"Motor asyncio finalizado: {engine.get_stats()}")
+
     def run(self):
         "Ejecuta el ciclo principal de la aplicación."
         self.setup_signal_handlers()
         try:
             self.logger.info("Iniciando bucle principal")
             input("Presione Enter para comenzar el bucle principal...")
+            if self.async_mode:
+                self.run_async()
+                return
+            if self.parallel_acquisition is not None:
+                self.parallel_acquisition.start()
+            if self.pipeline is not None:
+                self.pipeline.start()
+            self.loop_scheduler.iniciar()
             while self.running:
                 self.execute_main_operations()
+                self.loop_scheduler.esperar()
         except KeyboardInterrupt:
             self.logger.info("Interrupción (Ctrl+C) recibida. Terminando el bucle principal...")
+        finally:
+            if self.parallel_acquisition is not None:
+                self.parallel_acquisition.stop()
+            if self.pipeline is not None:
+                self.pipeline.stop()
+            self.modbus_session.cerrar_conexion()
+            obtener_registro_engines().cerrar_todos()
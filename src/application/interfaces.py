@@ -4,7 +4,7 @@ Este script define la interfaz de la clase DatabaseRepository.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 
 class IDatabaseRepository(ABC):
     """Interfaz para la clase DatabaseRepository."""
@@ -45,3 +45,44 @@ class IModbusProcessor(ABC):
     def procesar_datos(self, datos: dict) -> dict:
         """Procesa los datos leídos de un dispositivo Modbus y retorna el resultado."""
         pass
+
+
+class IAsyncModbusDevice(ABC):
+    """Puerto asíncrono equivalente a IModbusDevice, para el motor basado en asyncio."""
+    @abstractmethod
+    async def leer_registro(self, direccion: int) -> int:
+        """Lee el valor de un registro Modbus."""
+        pass
+
+    @abstractmethod
+    async def escribir_registro(self, direccion: int, valor: int) -> None:
+        """Escribe un valor en un registro Modbus."""
+        pass
+
+    @abstractmethod
+    async def leer_bloque(self, esclavo: int, bloque) -> Optional[List[int]]:
+        """Lee del esclavo indicado un bloque del plan de lectura; retorna None si falla."""
+        pass
+
+
+class IAsyncDatabaseRepository(ABC):
+    """Puerto asíncrono equivalente a IDatabaseRepository, para el motor basado en asyncio."""
+    @abstractmethod
+    async def ejecutar_consulta(self, consulta: str, parametros: Dict[str, Any]) -> List[Any]:
+        """Ejecuta una consulta de lectura y retorna las filas."""
+        pass
+
+    @abstractmethod
+    async def actualizar_registro(self, consulta: str, parametros: Dict[str, Any]) -> None:
+        """Ejecuta una consulta de actualización de manera transaccional."""
+        pass
+
+    @abstractmethod
+    async def insertar_lote(self, consulta: str, lista_parametros: List[Dict[str, Any]]) -> None:
+        """Realiza inserciones en lote de manera transaccional."""
+        pass
+
+    @abstractmethod
+    async def cerrar_conexion(self) -> None:
+        """Cierra la conexión con la base de datos."""
+        pass
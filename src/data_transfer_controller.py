@@ -5,29 +5,80 @@ entre la base de datos y el servidor, utilizando una arquitectura
 basada en clases que facilita la extensión y el mantenimiento.
 """
 
+import os
 import time
 from datetime import datetime
 from src.utils.logging.dependency_injection import get_logger
 from src.application.interfaces import IDatabaseRepository
+from src.domain.production_counter import calcular_deltas, ensamblar_serie
 
 logger = get_logger()
 
 
+def construir_consulta_pivote(registros) -> str:
+    """
+    Retorna la consulta que lee los valores de los registros indicados de registros_modbus en una
+    sola pasada (una fila, una columna por registro), usando el índice sobre registro (ver db_schema).
+    """
+    columnas = ",\n".join(
+        f"                MAX(CASE WHEN registro = '{registro}' THEN valor END) AS {registro}" for registro in registros
+    )
+    lista = ", ".join(f"'{registro}'" for registro in registros)
+    return f"""
+            SELECT
+{columnas}
+            FROM registros_modbus
+            WHERE registro IN ({lista})
+        """
+
+
 class BaseDataTransferService:
     """
     Servicio base que contiene métodos comunes para obtener el tiempo UNIX, leer e insertar datos
     en la base de datos.
     """
-    def __init__(self, log, repository: IDatabaseRepository, intervalo_segundos=300):
+    # Tabla destino y sus dos formas de inserción idempotente (las definen las subclases)
+    TABLA = None
+    CONSULTA_INSERT = None
+    CONSULTA_INSERT_SIN_CLAVE = None
+    # Espera entre verificaciones de la clave única mientras no esté confirmada
+    REINTENTO_CLAVES_S = 600.0
+
+    def __init__(self, log, repository: IDatabaseRepository, intervalo_segundos=300, tamano_lote=None,
+                 confirmar_claves=None):
         self.logger = log
         self.repository = repository
         self.intervalo_segundos = intervalo_segundos
+        # Filas por INSERT de varias filas (y por transacción); TRANSFER_BATCH_SIZE por defecto
+        self.tamano_lote = tamano_lote or int(os.getenv("TRANSFER_BATCH_SIZE", "500"))
+        # Callable que retorna las tablas con clave única confirmada (sin DDL)
+        self.confirmar_claves = confirmar_claves
+        self.clave_confirmada = False
+        self._proxima_verificacion = 0.0
+        self.stats = {"insertados": 0, "duplicados": 0}
 
-    def _get_unix_time(self):
+    def consulta_insercion(self) -> str:
+        """
+        Retorna INSERT IGNORE si la clave única de la tabla está confirmada; si no, la inserción
+        con NOT EXISTS, que no depende de la clave. Mientras no se confirme, se vuelve a verificar
+        como mucho cada REINTENTO_CLAVES_S segundos.
+        """
+        if (not self.clave_confirmada and self.confirmar_claves is not None
+                and time.monotonic() >= self._proxima_verificacion):
+            self._proxima_verificacion = time.monotonic() + self.REINTENTO_CLAVES_S
+            try:
+                self.clave_confirmada = self.TABLA in self.confirmar_claves()
+            except Exception as e:
+                self.logger.warning("No se pudo confirmar la clave única de %s: %s", self.TABLA, e)
+        return self.CONSULTA_INSERT if self.clave_confirmada else self.CONSULTA_INSERT_SIN_CLAVE
+
+    def _get_unix_time(self, marca_lectura=None):
         """
         Calcula el tiempo UNIX redondeado al múltiplo de self.intervalo_segundos.
+        Si se indica marca_lectura (instante de la lectura Modbus), se redondea ese
+        instante en lugar del momento de la transferencia.
         """
-        unixtime = int(time.time())
+        unixtime = int(time.time() if marca_lectura is None else marca_lectura)
         return round(unixtime / self.intervalo_segundos) * self.intervalo_segundos
 
     def obtener_datos(self, consulta):
@@ -42,47 +93,77 @@ class BaseDataTransferService:
 
     def insertar_datos(self, datos, consulta_insercion, campos):
         """
-        Inserta los datos en la base de datos usando la consulta de inserción proporcionada.
+        Inserta los datos en la base de datos usando la consulta de inserción proporcionada,
+        en lotes de tamano_lote filas con insertar_lote: una transacción por lote.
+        Con INSERT IGNORE (o NOT EXISTS), las filas no afectadas son duplicados
+        (si el repositorio no informa filas afectadas, por ejemplo al guardar en el buffer local,
+        el lote se cuenta como insertado). Si un lote falla, los anteriores ya quedaron confirmados.
+        Retorna la cantidad de filas insertadas.
         """
+        parametros = []
+        for fila in datos:
+            if len(fila) == len(campos):
+                parametros.append(dict(zip(campos, fila)))
+            else:
+                self.logger.warning("Fila con número incorrecto de elementos: %s", fila)
+        insertados = duplicados = 0
         try:
-            for fila in datos:
-                if len(fila) == len(campos):
-                    parametros = dict(zip(campos, fila))
-                    self.repository.actualizar_registro(consulta_insercion, parametros)
-                else:
-                    self.logger.warning("Fila con número incorrecto de elementos: %s", fila)
-            self.repository.commit()
-            self.logger.info("%s registros insertados con éxito.", len(datos))
+            for inicio in range(0, len(parametros), self.tamano_lote):
+                lote = parametros[inicio:inicio + self.tamano_lote]
+                afectadas = self.repository.insertar_lote(consulta_insercion, lote)
+                afectadas = len(lote) if afectadas is None else afectadas
+                insertados += afectadas
+                duplicados += len(lote) - afectadas
         except Exception as e:
             self.logger.error("Error al insertar datos: %s", e)
             self.repository.rollback()
+        self.stats["insertados"] += insertados
+        self.stats["duplicados"] += duplicados
+        if duplicados:
+            self.logger.warning("%s registros duplicados ignorados.", duplicados)
+        self.logger.info("%s registros insertados con éxito.", insertados)
+        return insertados
 
 class ProductionLogTransferService(BaseDataTransferService):
     """
     Servicio encargado de transferir los datos de ProductionLog.
+    valores_locales: callable opcional que retorna {registro: valor} con las últimas lecturas
+    Modbus del proceso (el almacén de muestras de la adquisición). Es la fuente del snapshot;
+    registros_modbus se consulta solo si faltan lecturas locales de algún registro.
     """
-    def __init__(self, log, repository: IDatabaseRepository):
-        super().__init__(log, repository)
-
-    def get_queries(self):
-        " Establece las consultas SELECT e INSERT para ProductionLog. "
-        consulta_select = """
-            SELECT
-                (SELECT valor FROM registros_modbus WHERE registro = 'HR_COUNTER1_LO') AS HR_COUNTER1_LO, 
-                (SELECT valor FROM registros_modbus WHERE registro = 'HR_COUNTER1_HI') AS HR_COUNTER1_HI, 
-                (SELECT valor FROM registros_modbus WHERE registro = 'HR_COUNTER2_LO') AS HR_COUNTER2_LO, 
-                (SELECT valor FROM registros_modbus WHERE registro = 'HR_COUNTER2_HI') AS HR_COUNTER2_HI;
+    CAMPOS = ("unixtime", "HR_COUNTER1_LO", "HR_COUNTER1_HI", "HR_COUNTER2_LO", "HR_COUNTER2_HI")
+    # Consultas constantes: el mismo texto en cada ciclo aprovecha la caché de sentencias del repositorio
+    CONSULTA_SELECT = construir_consulta_pivote(CAMPOS[1:])
+    TABLA = "ProductionLog"
+    # Inserción idempotente sobre la clave única de unixtime (ver db_schema): puede reenviarse
+    # desde el buffer local o ejecutarse desde varias instancias sin duplicar el intervalo
+    CONSULTA_INSERT = """
+            INSERT IGNORE INTO ProductionLog (unixtime, HR_COUNTER1_LO, HR_COUNTER1_HI, HR_COUNTER2_LO, HR_COUNTER2_HI)
+            VALUES (:unixtime, :HR_COUNTER1_LO, :HR_COUNTER1_HI, :HR_COUNTER2_LO, :HR_COUNTER2_HI)
         """
-        consulta_insert = """
+    # Mientras la clave única no esté confirmada
+    CONSULTA_INSERT_SIN_CLAVE = """
             INSERT INTO ProductionLog (unixtime, HR_COUNTER1_LO, HR_COUNTER1_HI, HR_COUNTER2_LO, HR_COUNTER2_HI)
-            VALUES (:unixtime, :HR_COUNTER1_LO, :HR_COUNTER1_HI, :HR_COUNTER2_LO, :HR_COUNTER2_HI)
+            SELECT :unixtime, :HR_COUNTER1_LO, :HR_COUNTER1_HI, :HR_COUNTER2_LO, :HR_COUNTER2_HI FROM DUAL
+            WHERE NOT EXISTS (SELECT 1 FROM ProductionLog WHERE unixtime = :unixtime)
         """
-        campos = ["unixtime", "HR_COUNTER1_LO", "HR_COUNTER1_HI", "HR_COUNTER2_LO", "HR_COUNTER2_HI"]
-        return consulta_select, consulta_insert, campos
 
-    def transfer(self):
+    def __init__(self, log, repository: IDatabaseRepository, valores_locales=None, confirmar_claves=None):
+        super().__init__(log, repository, confirmar_claves=confirmar_claves)
+        self.valores_locales = valores_locales
+        # unixtime del último snapshot escrito por este proceso: se escribe uno solo por intervalo
+        self.ultimo_unixtime = None
+
+    def get_queries(self):
+        " Retorna las consultas SELECT e INSERT para ProductionLog. "
+        return self.CONSULTA_SELECT, self.consulta_insercion(), list(self.CAMPOS)
+
+    def transfer(self, marca_lectura=None):
         """
         Ejecuta la transferencia de datos para ProductionLog.
+        Retorna la fila escrita (unixtime, HR_COUNTER1_LO, HR_COUNTER1_HI, HR_COUNTER2_LO,
+        HR_COUNTER2_HI), o None si no se escribió (sin datos, unixtime ya registrado o ya escrito
+        por este proceso, aunque haya quedado pendiente en el buffer local).
         """
         try:
             if not self.repository:
@@ -90,75 +171,131 @@ class ProductionLogTransferService(BaseDataTransferService):
                 return
 
             self.logger.info("Iniciando transferencia de ProductionLog.")
-            unixtime = self._get_unix_time()
+            unixtime = self._get_unix_time(marca_lectura)
+            if unixtime == self.ultimo_unixtime:
+                # Durante un corte la escritura va al buffer local y no informa duplicados: sin este
+                # control cada llamada de la ventana se contaría como un snapshot nuevo
+                self.logger.info("El snapshot de ProductionLog para %s ya fue escrito.", unixtime)
+                return None
             consulta_select, consulta_insert, campos = self.get_queries()
-            datos_originales = self.obtener_datos(consulta_select)
+            datos_originales = self._snapshot_local(campos) or self._snapshot_db(consulta_select)
             datos = []
             if datos_originales:
                 datos = [(unixtime,) + tuple(int(x) for x in fila) for fila in datos_originales]
 
             if datos:
-                # Verificar que no exista ya un registro para el mismo unixtime
-                result = self.repository.ejecutar_consulta(
-                    "SELECT COUNT(*) FROM ProductionLog WHERE unixtime = :unixtime", {"unixtime": unixtime}
-                )
-                if result and result[0][0] == 0:
-                    self.insertar_datos(datos, consulta_insert, campos)
+                # La inserción ignora un unixtime ya registrado
+                if self.insertar_datos(datos, consulta_insert, campos):
+                    self.ultimo_unixtime = unixtime
                     self.logger.info("Transferencia de ProductionLog completada exitosamente.")
-                else:
-                    self.logger.warning("Registro duplicado para unixtime %s.", unixtime)
+                    return datos[0]
             else:
                 self.logger.warning("No se obtuvieron datos para ProductionLog.")
         except Exception as e:
             self.logger.error(f"Error inesperado en la transferencia de ProductionLog: {e}")
+        return None
+
+    def _snapshot_local(self, campos):
+        """Arma la fila del snapshot con las últimas lecturas locales, si están todas disponibles."""
+        if self.valores_locales is None:
+            return None
+        valores = self.valores_locales()
+        if not all(campo in valores for campo in campos[1:]):
+            return None
+        return [tuple(valores[campo] for campo in campos[1:])]
+
+    def _snapshot_db(self, consulta_select):
+        """Lee el snapshot de registros_modbus; None si falta algún registro en la tabla."""
+        self.logger.info("Sin lecturas locales de todos los registros: se consulta registros_modbus.")
+        filas = self.obtener_datos(consulta_select)
+        if not filas or any(valor is None for valor in filas[0]):
+            return None
+        return filas
 
 class IntervalProductionTransferService(BaseDataTransferService):
     """
     Servicio encargado de transferir los datos de intervalproduction.
     """
-    def __init__(self, log, repository: IDatabaseRepository):
-        super().__init__(log, repository)
-
-    def get_queries(self):
-        " Establece las consultas SELECT e INSERT para intervalproduction. "
-        consulta_select = """
-            SELECT 
-                ((SELECT HR_COUNTER1_LO FROM ProductionLog ORDER BY ID DESC LIMIT 1) - 
-                 (SELECT HR_COUNTER1_LO FROM ProductionLog WHERE ID = (SELECT MAX(ID) - 1 FROM ProductionLog))) AS HR_COUNTER1,
-                ((SELECT HR_COUNTER2_LO FROM ProductionLog ORDER BY ID DESC LIMIT 1) - 
-                 (SELECT HR_COUNTER2_LO FROM ProductionLog WHERE ID = (SELECT MAX(ID) - 1 FROM ProductionLog))) AS HR_COUNTER2
+    # Snapshot anterior al primero escrito por este proceso (se lee una sola vez, por la clave de unixtime)
+    CONSULTA_SELECT = """
+            SELECT HR_COUNTER1_LO, HR_COUNTER1_HI, HR_COUNTER2_LO, HR_COUNTER2_HI
             FROM ProductionLog
+            WHERE unixtime < :unixtime
+            ORDER BY unixtime DESC
             LIMIT 1;
         """
-        consulta_insert = """
-            INSERT INTO intervalproduction (unixtime, HR_COUNTER1, HR_COUNTER2)
+    TABLA = "intervalproduction"
+    CONSULTA_INSERT = """
+            INSERT IGNORE INTO intervalproduction (unixtime, HR_COUNTER1, HR_COUNTER2)
             VALUES (:unixtime, :HR_COUNTER1, :HR_COUNTER2)
         """
-        campos = ["unixtime", "HR_COUNTER1", "HR_COUNTER2"]
-        return consulta_select, consulta_insert, campos
+    CONSULTA_INSERT_SIN_CLAVE = """
+            INSERT INTO intervalproduction (unixtime, HR_COUNTER1, HR_COUNTER2)
+            SELECT :unixtime, :HR_COUNTER1, :HR_COUNTER2 FROM DUAL
+            WHERE NOT EXISTS (SELECT 1 FROM intervalproduction WHERE unixtime = :unixtime)
+        """
+    CAMPOS = ("unixtime", "HR_COUNTER1", "HR_COUNTER2")
+
+    def __init__(self, log, repository: IDatabaseRepository, confirmar_claves=None):
+        super().__init__(log, repository, confirmar_claves=confirmar_claves)
+        # Último snapshot de ProductionLog (HR_COUNTER1_LO, HR_COUNTER1_HI, HR_COUNTER2_LO, HR_COUNTER2_HI)
+        self.snapshot_anterior = None
+        self._sembrado = False
+
+    def get_queries(self):
+        " Retorna las consultas SELECT e INSERT para intervalproduction. "
+        return self.CONSULTA_SELECT, self.consulta_insercion(), list(self.CAMPOS)
+
+    @staticmethod
+    def calcular_intervalos(filas):
+        """
+        Recibe filas (HR_COUNTER1_LO, HR_COUNTER1_HI, HR_COUNTER2_LO, HR_COUNTER2_HI) en orden
+        cronológico y retorna la producción de cada intervalo como tuplas (HR_COUNTER1, HR_COUNTER2),
+        ensamblando los contadores de 32 bits y tolerando desbordes y reinicios.
+        Sirve tanto para el último intervalo como para recalcular series completas en una pasada.
+        """
+        columnas = list(zip(*filas))
+        contador1 = calcular_deltas(ensamblar_serie(columnas[0], columnas[1]))
+        contador2 = calcular_deltas(ensamblar_serie(columnas[2], columnas[3]))
+        return list(zip(contador1.deltas, contador2.deltas))
 
-    def transfer(self):
+    def _sembrar(self, unixtime):
+        """
+        Al iniciar, toma de la base el snapshot previo al primero que escribe este proceso.
+        Si la consulta falla se reintenta en la próxima transferencia.
+        """
+        try:
+            filas = self.repository.ejecutar_consulta(self.CONSULTA_SELECT, {"unixtime": unixtime})
+        except Exception as e:
+            self.logger.error("No se pudo leer el snapshot anterior de ProductionLog: %s", e)
+            return
+        self._sembrado = True
+        if filas:
+            self.snapshot_anterior = tuple(int(x) for x in filas[0])
+
+    def transfer(self, marca_lectura=None, snapshot=None):
         """
         Ejecuta la transferencia de datos para intervalproduction.
+        snapshot es la fila que ProductionLogTransferService acaba de escribir (con su unixtime);
+        el intervalo se calcula contra el snapshot anterior guardado en memoria, sin releer la tabla.
         """
         try:
             if not self.repository:
                 self.logger.error("No se pudo establecer conexión con la base de datos.")
                 return
-            self.logger.info("Iniciando transferencia de intervalproduction.")
-            unixtime = self._get_unix_time()
-            consulta_select, consulta_insert, campos = self.get_queries()
-            # Verificar que no exista ya un registro para el mismo unixtime
-            result = self.repository.ejecutar_consulta(
-                "SELECT COUNT(*) FROM intervalproduction WHERE unixtime = :unixtime", {"unixtime": unixtime}
-            )
-            if result and result[0][0] > 0:
-                self.logger.warning("Registro duplicado para unixtime %s en intervalproduction.", unixtime)
+            if snapshot is None:
+                self.logger.info("Sin snapshot nuevo de ProductionLog: no hay intervalo que transferir.")
                 return
-            datos_originales = self.obtener_datos(consulta_select)
+            self.logger.info("Iniciando transferencia de intervalproduction.")
+            unixtime, contadores = snapshot[0], tuple(snapshot[1:])
+            if not self._sembrado:
+                self._sembrar(unixtime)
+            _, consulta_insert, campos = self.get_queries()
             datos = []
-            if datos_originales:
-                datos = [(unixtime,) + tuple(int(x) for x in fila) for fila in datos_originales]
+            if self.snapshot_anterior is not None:
+                # Un unixtime ya registrado lo descarta la clave única (INSERT IGNORE) o NOT EXISTS
+                datos = [(unixtime,) + self.calcular_intervalos([self.snapshot_anterior, contadores])[-1]]
+            self.snapshot_anterior = contadores
             if datos:
                 self.insertar_datos(datos, consulta_insert, campos)
                 self.logger.info("Transferencia de intervalproduction completada exitosamente.")
@@ -172,11 +309,12 @@ class DataTransferController:
     Controlador que orquesta la transferencia de datos:
       - Verifica si es el momento de transferir (según la hora actual).
       - Ejecuta la transferencia de ProductionLog e intervalproduction.
+    Debe vivir mientras viva el bucle: el servicio de intervalos guarda el snapshot anterior.
     """
-    def __init__(self, log, repository: IDatabaseRepository):
+    def __init__(self, log, repository: IDatabaseRepository, valores_locales=None, confirmar_claves=None):
         self.logger = log
-        self.production_service = ProductionLogTransferService(log, repository)
-        self.interval_service = IntervalProductionTransferService(log, repository)
+        self.production_service = ProductionLogTransferService(log, repository, valores_locales, confirmar_claves)
+        self.interval_service = IntervalProductionTransferService(log, repository, confirmar_claves)
 
     def es_tiempo_cercano_multiplo_cinco(self, tolerancia=5):
         """
@@ -195,26 +333,31 @@ class DataTransferController:
         )
         return cercano_a_multiplo
 
-    def run_transfer(self):
+    def run_transfer(self, marca_lectura=None):
         """
         Orquesta la transferencia de datos:
           - Si es tiempo de transferencia, ejecuta los dos servicios.
           - De lo contrario, informa que no es el momento.
+        marca_lectura es el wall_time de la última lectura Modbus; los registros se fechan con él.
         """
         if self.es_tiempo_cercano_multiplo_cinco():
             self.logger.info("Iniciando transferencia de datos.")
-            self.production_service.transfer()
-            self.interval_service.transfer()
+            snapshot = self.production_service.transfer(marca_lectura)
+            self.interval_service.transfer(marca_lectura, snapshot)
         else:
             self.logger.info(
                 "No es momento de transferir datos. Esperando la próxima verificación."
             )
 
-def main_transfer_controller():
+def main_transfer_controller(marca_lectura=None, valores_locales=None, repository=None, controller=None):
     """
     Función principal que instancia el controlador de transferencia y ejecuta la operación.
+    El repositorio y el controlador los provee quien controla el bucle, para no crearlos por
+    iteración y conservar el snapshot anterior entre transferencias. Retorna el controlador.
     """
-    from src.infrastructure.db_operations import SQLAlchemyDatabaseRepository
-    repo = SQLAlchemyDatabaseRepository()
-    controller = DataTransferController(logger, repo)
-    controller.run_transfer()
+    if controller is None:
+        from src.infrastructure.factories import confirmar_claves_unicas, create_repository
+        repo = repository if repository is not None else create_repository()
+        controller = DataTransferController(logger, repo, valores_locales, confirmar_claves_unicas)
+    controller.run_transfer(marca_lectura)
+    return controller
@@ -0,0 +1,59 @@
+"""
+Servicio de dominio: Detección de cambios con banda muerta.
+Recuerda el último valor escrito de cada registro para que solo los cambios
+significativos lleguen a la base de datos, con un refresco forzado periódico.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+from src.domain.modbus_register import ModbusRegister
+
+
+class DetectorCambios:
+    """
+    Un registro se considera cambiado si:
+      - nunca se escribió,
+      - |valor - último escrito| supera su banda muerta (0 = cualquier cambio), o
+      - pasaron refresco_forzado_s segundos desde su última escritura.
+    El caché solo se actualiza con confirmar(), tras una escritura exitosa.
+    """
+    def __init__(self, bandas: Optional[Dict[str, float]] = None, refresco_forzado_s: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.bandas = dict(bandas or {})
+        self.refresco_forzado_s = refresco_forzado_s
+        self.clock = clock
+        self._ultimos: Dict[str, tuple] = {}
+        self.evaluados = 0
+        self.omitidos = 0
+
+    def filtrar(self, registros: List[ModbusRegister]) -> List[ModbusRegister]:
+        """Retorna los registros que deben escribirse."""
+        ahora = self.clock()
+        cambiados = []
+        for reg in registros:
+            self.evaluados += 1
+            ultimo = self._ultimos.get(reg.description)
+            if ultimo is not None:
+                valor, escrito_en = ultimo
+                vigente = ahora - escrito_en < self.refresco_forzado_s
+                if vigente and abs(reg.value - valor) <= self.bandas.get(reg.description, 0):
+                    self.omitidos += 1
+                    continue
+            cambiados.append(reg)
+        return cambiados
+
+    def confirmar(self, reg: ModbusRegister) -> None:
+        """Registra que el valor fue escrito en la base de datos."""
+        self._ultimos[reg.description] = (reg.value, self.clock())
+
+    def olvidar(self) -> None:
+        """Vacía el caché, forzando la escritura de todos los registros en el próximo ciclo."""
+        self._ultimos.clear()
+
+    def get_stats(self) -> dict:
+        """Retorna registros evaluados, omitidos y la fracción de escrituras evitadas."""
+        return {
+            "evaluados": self.evaluados,
+            "omitidos": self.omitidos,
+            "fraccion_omitida": self.omitidos / self.evaluados if self.evaluados else 0.0,
+        }
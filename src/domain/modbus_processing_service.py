@@ -5,7 +5,8 @@ Extrae la lógica de negocio de ModbusProcessor.
 from src.domain.modbus_register import ModbusRegister
 from src.domain.production_counter import ProductionCounter
 from src.domain.interval_production import IntervalProduction
-from typing import Callable
+from src.domain.register_map import PasoLectura
+from typing import Callable, List, Optional
 
 def procesar_entrada_digital(address: int, description: str, read_function: Callable[[int], int]) -> ModbusRegister:
     value = read_function(address)
@@ -18,3 +19,13 @@ def procesar_registro_alta_resolucion(register: int, description: str, read_func
     if value is None:
         raise ValueError(f"Error al leer el registro en la dirección {register}")
     return ModbusRegister(address=register, value=value, description=description)
+
+def procesar_paso(paso: PasoLectura, valores: List[int], monotonic_ns: Optional[int] = None,
+                  wall_time: Optional[float] = None) -> List[ModbusRegister]:
+    return [
+        ModbusRegister(
+            address=lectura.direccion, value=lectura.convertir(valores), description=lectura.nombre,
+            monotonic_ns=monotonic_ns, wall_time=wall_time,
+        )
+        for lectura in paso.lecturas
+    ]
@@ -0,0 +1,61 @@
+"""
+Servicio de dominio: Planificación de lecturas Modbus en bloque.
+Agrupa direcciones contiguas en una sola petición para reducir los viajes de ida y vuelta por el bus.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+# Límites de cantidad por petición definidos por la especificación Modbus
+MAX_REGISTROS_POR_PETICION = 125
+MAX_BITS_POR_PETICION = 2000
+
+FUNCIONES_BITS = (1, 2)
+
+
+@dataclass(frozen=True)
+class BloqueLectura:
+    functioncode: int
+    start: int
+    count: int
+
+    @property
+    def addresses(self) -> Tuple[int, ...]:
+        return tuple(range(self.start, self.start + self.count))
+
+
+def limite_por_funcion(functioncode: int) -> int:
+    """Retorna la cantidad máxima de elementos por petición para el código de función."""
+    if functioncode in FUNCIONES_BITS:
+        return MAX_BITS_POR_PETICION
+    return MAX_REGISTROS_POR_PETICION
+
+
+def planificar_bloques(addresses: Iterable[int], functioncode: int) -> List[BloqueLectura]:
+    """
+    Fusiona direcciones adyacentes en bloques de lectura, respetando el límite
+    de la especificación Modbus para el código de función.
+    """
+    return planificar_tramos(((address, 1) for address in addresses), functioncode)
+
+
+def planificar_tramos(tramos: Iterable[Tuple[int, int]], functioncode: int) -> List[BloqueLectura]:
+    """
+    Igual que planificar_bloques, pero recibe tramos (inicio, ancho) que nunca
+    se parten entre dos bloques (por ejemplo, valores de 32 bits en dos registros).
+    """
+    limite = limite_por_funcion(functioncode)
+    bloques = []
+    start = None
+    end = None
+    for inicio, ancho in sorted(set(tramos)):
+        fin = inicio + ancho
+        if start is not None and inicio <= end and max(end, fin) - start <= limite:
+            end = max(end, fin)
+            continue
+        if start is not None:
+            bloques.append(BloqueLectura(functioncode, start, end - start))
+        start, end = inicio, fin
+    if start is not None:
+        bloques.append(BloqueLectura(functioncode, start, end - start))
+    return bloques
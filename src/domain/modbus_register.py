@@ -1,6 +1,8 @@
 """
 Entidad de dominio: ModbusRegister
 Representa un registro Modbus con dirección, valor y metadatos opcionales.
+monotonic_ns y wall_time marcan el instante de la lectura: el primero (time.monotonic_ns)
+sirve para medir intervalos, el segundo (time.time, segundos UNIX) para fechar los datos.
 """
 
 from dataclasses import dataclass
@@ -12,3 +14,10 @@ class ModbusRegister:
     value: int
     description: Optional[str] = None
     unit: Optional[str] = None
+    monotonic_ns: Optional[int] = None
+    wall_time: Optional[float] = None
+
+
+def ultima_lectura(registros) -> Optional[float]:
+    """Retorna el wall_time más reciente de los registros, o None si ninguno lo tiene."""
+    return max((reg.wall_time for reg in registros if reg.wall_time is not None), default=None)
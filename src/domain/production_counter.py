@@ -1,10 +1,19 @@
 """
 Entidad de dominio: ProductionCounter
 Representa un contador de producción industrial.
+
+Incluye la aritmética de los contadores del equipo: el valor de 32 bits se guarda en dos
+palabras de 16 bits (HR_COUNTER*_LO / HR_COUNTER*_HI) y las diferencias entre lecturas
+deben tolerar el desborde del contador y los reinicios del equipo.
 """
 
+from array import array
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Optional, Sequence
+
+MODULO_16 = 1 << 16
+MODULO_32 = 1 << 32
+
 
 @dataclass
 class ProductionCounter:
@@ -12,3 +21,55 @@ class ProductionCounter:
     count: int
     timestamp: Optional[str] = None
     description: Optional[str] = None
+
+
+@dataclass
+class SerieDeltas:
+    """Diferencias entre lecturas consecutivas y los eventos detectados al calcularlas."""
+    deltas: array
+    vueltas: int = 0
+    reinicios: int = 0
+
+
+def ensamblar_32(lo: int, hi: int) -> int:
+    """Combina las palabras baja y alta en el valor de 32 bits del contador."""
+    return (int(hi) % MODULO_16) << 16 | (int(lo) % MODULO_16)
+
+
+def ensamblar_serie(lo: Iterable[int], hi: Iterable[int]) -> array:
+    """Ensambla una serie completa de pares (lo, hi) en un array de valores de 32 bits."""
+    return array("Q", (ensamblar_32(l, h) for l, h in zip(lo, hi)))
+
+
+def delta_contador(anterior: int, actual: int, modulo: int = MODULO_32, max_delta: Optional[int] = None) -> int:
+    """
+    Retorna las unidades contadas entre dos lecturas.
+    Si el valor bajó, se interpreta como desborde cuando la diferencia modular no supera
+    max_delta (por defecto, medio rango del contador); si no, como reinicio del equipo,
+    y el delta es el valor actual (lo contado desde el reinicio).
+    """
+    if actual >= anterior:
+        return actual - anterior
+    limite = modulo // 2 if max_delta is None else max_delta
+    modular = (actual - anterior) % modulo
+    return modular if modular <= limite else actual
+
+
+def calcular_deltas(valores: Sequence[int], modulo: int = MODULO_32, max_delta: Optional[int] = None) -> SerieDeltas:
+    """
+    Calcula en una sola pasada las diferencias entre valores consecutivos de la serie
+    (len(valores) - 1 deltas), contando desbordes y reinicios.
+    """
+    limite = modulo // 2 if max_delta is None else max_delta
+    deltas = array("q", (b - a for a, b in zip(valores, valores[1:])))
+    vueltas = reinicios = 0
+    for i, delta in enumerate(deltas):
+        if delta >= 0:
+            continue
+        if delta % modulo <= limite:
+            deltas[i] = delta % modulo
+            vueltas += 1
+        else:
+            deltas[i] = valores[i + 1]
+            reinicios += 1
+    return SerieDeltas(deltas, vueltas, reinicios)
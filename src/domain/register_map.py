@@ -0,0 +1,163 @@
+"""
+Servicio de dominio: Mapa declarativo de registros Modbus.
+Compila una lista de definiciones en un plan de lectura optimizado (bloques agrupados
+por dispositivo y código de función, con las consultas UPDATE ya construidas).
+"""
+
+import re
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.domain.modbus_read_plan import BloqueLectura, FUNCIONES_BITS, planificar_tramos
+
+FUNCIONES_SOPORTADAS = (1, 2, 3, 4)
+ANCHOS_SOPORTADOS = (1, 2)
+_IDENTIFICADOR_SQL = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+@dataclass(frozen=True)
+class DefinicionRegistro:
+    nombre: str
+    direccion: int
+    funcion: int = 3
+    dispositivo: int = 1
+    ancho: int = 1
+    escala: float = 1
+    desplazamiento: float = 0
+    columna: str = "valor"
+    direccion_db: Optional[int] = None
+    banda_muerta: float = 0
+
+    @classmethod
+    def desde_dict(cls, datos: dict) -> "DefinicionRegistro":
+        """Crea una definición a partir de una entrada del archivo de mapa de registros."""
+        campos = set(cls.__dataclass_fields__)
+        desconocidos = set(datos) - campos
+        if desconocidos:
+            raise ValueError(f"Campos desconocidos en el mapa de registros: {sorted(desconocidos)}")
+        return cls(**datos)
+
+
+@dataclass(frozen=True)
+class LecturaCompilada:
+    nombre: str
+    direccion: int
+    offset: int
+    ancho: int
+    escala: float
+    desplazamiento: float
+    consulta: str
+    direccion_db: int
+
+    def convertir(self, valores: List[int]):
+        """Extrae y escala el valor de esta lectura a partir de la respuesta del bloque."""
+        raw = valores[self.offset]
+        if self.ancho == 2:
+            # Palabra baja primero, igual que los pares HR_COUNTER*_LO / _HI
+            raw |= valores[self.offset + 1] << 16
+        if self.escala == 1 and self.desplazamiento == 0:
+            return raw
+        return raw * self.escala + self.desplazamiento
+
+
+@dataclass(frozen=True)
+class PasoLectura:
+    dispositivo: int
+    bloque: BloqueLectura
+    lecturas: Tuple[LecturaCompilada, ...]
+
+
+@dataclass(frozen=True)
+class PlanLectura:
+    pasos: Tuple[PasoLectura, ...]
+    destinos: Dict[str, Tuple[str, int]] = field(default_factory=dict)
+    periodos: Dict[int, float] = field(default_factory=dict)
+    bandas: Dict[str, float] = field(default_factory=dict)
+    refresco_forzado_s: float = 60.0
+
+    def dispositivos(self) -> Tuple[int, ...]:
+        """Retorna las direcciones de esclavo presentes en el plan, sin repetir."""
+        return tuple(dict.fromkeys(paso.dispositivo for paso in self.pasos))
+
+    def filtrar(self, dispositivo: Optional[int] = None, funciones: Optional[Iterable[int]] = None) -> "PlanLectura":
+        """Retorna un sub-plan con los pasos del dispositivo y/o códigos de función indicados."""
+        funciones = tuple(funciones) if funciones is not None else None
+        pasos = tuple(
+            paso for paso in self.pasos
+            if (dispositivo is None or paso.dispositivo == dispositivo)
+            and (funciones is None or paso.bloque.functioncode in funciones)
+        )
+        return replace(self, pasos=pasos)
+
+
+def _validar(definicion: DefinicionRegistro) -> None:
+    if definicion.funcion not in FUNCIONES_SOPORTADAS:
+        raise ValueError(f"Código de función no soportado para {definicion.nombre}: {definicion.funcion}")
+    if definicion.ancho not in ANCHOS_SOPORTADOS:
+        raise ValueError(f"Ancho no soportado para {definicion.nombre}: {definicion.ancho}")
+    if definicion.ancho != 1 and definicion.funcion in FUNCIONES_BITS:
+        raise ValueError(f"Las entradas de bit no admiten ancho mayor a 1: {definicion.nombre}")
+    if definicion.banda_muerta < 0:
+        raise ValueError(f"Banda muerta negativa para {definicion.nombre}: {definicion.banda_muerta}")
+    if not _IDENTIFICADOR_SQL.match(definicion.columna):
+        raise ValueError(f"Columna destino inválida para {definicion.nombre}: {definicion.columna}")
+
+
+def construir_consulta_update(columna: str) -> str:
+    """Construye la consulta UPDATE sobre registros_modbus para la columna destino."""
+    return f"UPDATE registros_modbus SET {columna} = :valor WHERE direccion_modbus = :direccion"
+
+
+def compilar_plan(definiciones: Iterable[DefinicionRegistro], periodos: Optional[Dict[int, float]] = None,
+                  refresco_forzado_s: float = 60.0) -> PlanLectura:
+    """
+    Compila las definiciones en un PlanLectura: agrupa por (dispositivo, función),
+    fusiona direcciones contiguas en bloques y precalcula las consultas UPDATE.
+    periodos indica, opcionalmente, el período de sondeo en segundos por dispositivo;
+    refresco_forzado_s, cada cuánto se reescribe un registro aunque no haya cambiado.
+    """
+    grupos: Dict[Tuple[int, int], List[DefinicionRegistro]] = {}
+    nombres = set()
+    for definicion in definiciones:
+        _validar(definicion)
+        if definicion.nombre in nombres:
+            raise ValueError(f"Nombre de registro duplicado en el mapa: {definicion.nombre}")
+        nombres.add(definicion.nombre)
+        grupos.setdefault((definicion.dispositivo, definicion.funcion), []).append(definicion)
+
+    consultas: Dict[str, str] = {}
+    destinos: Dict[str, Tuple[str, int]] = {}
+    bandas: Dict[str, float] = {}
+    pasos = []
+    for (dispositivo, funcion), grupo in sorted(grupos.items()):
+        bloques = planificar_tramos(((d.direccion, d.ancho) for d in grupo), funcion)
+        for bloque in bloques:
+            lecturas = []
+            for d in sorted(grupo, key=lambda d: d.direccion):
+                if not bloque.start <= d.direccion < bloque.start + bloque.count:
+                    continue
+                consulta = consultas.setdefault(d.columna, construir_consulta_update(d.columna))
+                direccion_db = d.direccion if d.direccion_db is None else d.direccion_db
+                lecturas.append(LecturaCompilada(
+                    nombre=d.nombre,
+                    direccion=d.direccion,
+                    offset=d.direccion - bloque.start,
+                    ancho=d.ancho,
+                    escala=d.escala,
+                    desplazamiento=d.desplazamiento,
+                    consulta=consulta,
+                    direccion_db=direccion_db,
+                ))
+                destinos[d.nombre] = (consulta, direccion_db)
+                if d.banda_muerta:
+                    bandas[d.nombre] = d.banda_muerta
+            pasos.append(PasoLectura(dispositivo=dispositivo, bloque=bloque, lecturas=tuple(lecturas)))
+    periodos = dict(periodos or {})
+    for dispositivo, periodo in periodos.items():
+        if periodo <= 0:
+            raise ValueError(f"Período de sondeo inválido para el dispositivo {dispositivo}: {periodo}")
+    if refresco_forzado_s <= 0:
+        raise ValueError(f"Refresco forzado inválido: {refresco_forzado_s}")
+    return PlanLectura(
+        pasos=tuple(pasos), destinos=destinos, periodos=periodos,
+        bandas=bandas, refresco_forzado_s=refresco_forzado_s,
+    )
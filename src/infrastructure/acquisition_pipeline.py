@@ -0,0 +1,176 @@
+"""
+Path: src/infrastructure/acquisition_pipeline.py
+Pipeline productor/consumidor: un hilo de adquisición lee el bus a ritmo fijo y encola las
+lecturas (con su marca de tiempo) en una cola acotada; un hilo escritor la vacía en lotes
+hacia el repositorio. Una demora de MySQL ya no retrasa la próxima lectura Modbus.
+"""
+
+import os
+import queue
+import threading
+from src.domain.modbus_register import ultima_lectura
+from src.utils.fixed_rate_scheduler import FixedRateScheduler, OMITIR
+
+DESCARTAR_ANTIGUO = "descartar_antiguo"
+DESCARTAR_NUEVO = "descartar_nuevo"
+BLOQUEAR = "bloquear"
+POLITICAS_DESBORDE = (DESCARTAR_ANTIGUO, DESCARTAR_NUEVO, BLOQUEAR)
+
+
+class AcquisitionPipeline:
+    """
+    adquirir(): retorna la lista de ModbusRegister de un ciclo (vacía si no hubo lectura).
+    persistir(registros): escribe un lote; se invoca siempre desde el hilo escritor.
+
+    Con la cola llena, la política de desborde decide:
+      - descartar_antiguo: se descarta la muestra más vieja (se prioriza el dato reciente);
+      - descartar_nuevo: se descarta la muestra recién leída;
+      - bloquear: la adquisición espera lugar en la cola (contrapresión; baja la tasa de muestreo).
+    Dentro de un lote se escribe solo la lectura más reciente de cada registro, ya que el
+    destino guarda el último valor.
+    """
+    def __init__(self, adquirir, persistir, log, periodo_s=1.0, capacidad=100,
+                 politica=DESCARTAR_ANTIGUO, tamano_lote=50, politica_overrun=OMITIR):
+        if politica not in POLITICAS_DESBORDE:
+            raise ValueError(
+                f"Política de desborde desconocida: {politica} (opciones: {', '.join(POLITICAS_DESBORDE)})"
+            )
+        self.adquirir = adquirir
+        self.persistir = persistir
+        self.logger = log
+        self.periodo_s = periodo_s
+        self.politica = politica
+        self.tamano_lote = tamano_lote
+        self.politica_overrun = politica_overrun
+        self.cola = queue.Queue(maxsize=capacidad)
+        self._stop_event = threading.Event()
+        self._adquisicion_terminada = threading.Event()
+        self._hilos = []
+        self.ultima_lectura = None
+        # Los contadores los actualizan los dos hilos y los lee get_stats desde un tercero
+        self._lock = threading.Lock()
+        self.stats = {
+            "ciclos": 0,
+            "encoladas": 0,
+            "descartadas": 0,
+            "profundidad_max": 0,
+            "lotes": 0,
+            "registros_escritos": 0,
+            "errores_escritura": 0,
+        }
+
+    @classmethod
+    def from_env(cls, adquirir, persistir, log, **kwargs):
+        """Crea el pipeline con PIPELINE_QUEUE_SIZE, PIPELINE_OVERFLOW_POLICY y PIPELINE_BATCH_SIZE."""
+        return cls(
+            adquirir, persistir, log,
+            capacidad=int(os.getenv("PIPELINE_QUEUE_SIZE", "100")),
+            politica=os.getenv("PIPELINE_OVERFLOW_POLICY", DESCARTAR_ANTIGUO),
+            tamano_lote=int(os.getenv("PIPELINE_BATCH_SIZE", "50")),
+            **kwargs,
+        )
+
+    def start(self):
+        """Lanza los hilos de adquisición y escritura."""
+        self._stop_event.clear()
+        self._adquisicion_terminada.clear()
+        self._hilos = [
+            threading.Thread(target=self._bucle_adquisicion, name="pipeline-adquisicion", daemon=True),
+            threading.Thread(target=self._bucle_escritura, name="pipeline-escritura", daemon=True),
+        ]
+        for hilo in self._hilos:
+            hilo.start()
+        self.logger.info(
+            f"Pipeline de adquisición iniciado (período {self.periodo_s} s, cola {self.cola.maxsize}, "
+            f"desborde: {self.politica})"
+        )
+
+    def stop(self, timeout=5.0):
+        """Detiene la adquisición; el escritor vacía la cola antes de terminar."""
+        self._stop_event.set()
+        for hilo in self._hilos:
+            hilo.join(timeout)
+        self._hilos = []
+
+    def _encolar(self, registros):
+        if self.politica == BLOQUEAR:
+            while not self._stop_event.is_set():
+                try:
+                    self.cola.put(registros, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            else:
+                # Se detuvo el pipeline sin que se liberara lugar en la cola
+                return
+        else:
+            try:
+                self.cola.put_nowait(registros)
+            except queue.Full:
+                with self._lock:
+                    self.stats["descartadas"] += 1
+                if self.politica == DESCARTAR_NUEVO:
+                    return
+                try:
+                    self.cola.get_nowait()
+                except queue.Empty:
+                    pass
+                self.cola.put_nowait(registros)
+        with self._lock:
+            self.stats["encoladas"] += 1
+            self.stats["profundidad_max"] = max(self.stats["profundidad_max"], self.cola.qsize())
+
+    def _bucle_adquisicion(self):
+        scheduler = FixedRateScheduler(self.periodo_s, self.politica_overrun, sleep=self._stop_event.wait)
+        scheduler.iniciar()
+        try:
+            while not self._stop_event.is_set():
+                registros = self.adquirir()
+                with self._lock:
+                    self.stats["ciclos"] += 1
+                if registros:
+                    self._encolar(registros)
+                scheduler.esperar()
+        finally:
+            self._adquisicion_terminada.set()
+
+    def _siguiente_lote(self):
+        """Espera la primera muestra y agrega, sin esperar, las que ya estén en la cola."""
+        muestras = [self.cola.get(timeout=0.1)]
+        while len(muestras) < self.tamano_lote:
+            try:
+                muestras.append(self.cola.get_nowait())
+            except queue.Empty:
+                break
+        ultimos = {}
+        for registros in muestras:
+            for reg in registros:
+                ultimos[reg.description] = reg
+        return list(ultimos.values())
+
+    def _bucle_escritura(self):
+        # Se termina cuando la adquisición terminó y la cola quedó vacía: no se pierde la última muestra
+        while not (self._adquisicion_terminada.is_set() and self.cola.empty()):
+            try:
+                lote = self._siguiente_lote()
+            except queue.Empty:
+                continue
+            try:
+                self.persistir(lote)
+            except Exception as e:  # El hilo escritor no debe terminar por un error de la base de datos
+                with self._lock:
+                    self.stats["errores_escritura"] += 1
+                self.logger.error(f"Error al persistir un lote de {len(lote)} registros: {e}")
+                continue
+            with self._lock:
+                self.stats["lotes"] += 1
+                self.stats["registros_escritos"] += len(lote)
+            marca = ultima_lectura(lote)
+            if marca is not None:
+                self.ultima_lectura = marca
+
+    def get_stats(self) -> dict:
+        """Retorna los contadores del pipeline y la profundidad actual de la cola."""
+        with self._lock:
+            stats = dict(self.stats)
+        return {**stats, "profundidad": self.cola.qsize(), "capacidad": self.cola.maxsize}
@@ -0,0 +1,224 @@
+"""
+Path: src/infrastructure/async_engine.py
+Motor de adquisición basado en asyncio.
+La lectura Modbus, la escritura en la base de datos y la transferencia periódica
+corren como tareas independientes de un mismo event loop, de modo que una
+escritura lenta no retrasa la siguiente lectura. La E/S bloqueante se delega a
+un hilo dedicado por recurso (el puerto serie y la sesión de SQLAlchemy no son
+seguros entre hilos, así que cada uno tiene su propio executor de un solo hilo).
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.application.interfaces import IAsyncDatabaseRepository, IAsyncModbusDevice
+from src.domain.modbus_register import ultima_lectura
+from src.infrastructure.db_operations import DatabaseUpdateError
+from src.domain.modbus_processing_service import procesar_paso
+from src.modbus_processor import (
+    ModbusConnectionError, ModbusProcessor, ModbusReadError, leer_bloque, validar_bloque,
+)
+
+
+class _BlockingAdapter:
+    """Ejecuta llamadas bloqueantes en un executor de un solo hilo propio."""
+    def __init__(self, nombre):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=nombre)
+
+    async def run_blocking(self, func, *args):
+        """Ejecuta func(*args) en el hilo del adaptador y espera su resultado."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class AsyncModbusDeviceAdapter(_BlockingAdapter, IAsyncModbusDevice):
+    """
+    Adapta un ModbusDevice síncrono al puerto IAsyncModbusDevice.
+    Con una sesión, cada llamada usa el dispositivo vigente de la sesión (que reconecta si
+    hace falta) y la invalida si el puerto serie se perdió durante la llamada.
+    """
+    def __init__(self, device=None, session=None):
+        super().__init__("modbus-io")
+        self.device = device
+        self.session = session
+
+    def _llamar(self, operacion, *args):
+        device = self.session.get_device() if self.session is not None else self.device
+        try:
+            return operacion(device, *args)
+        finally:
+            if self.session is not None and getattr(device, "connection_lost", False):
+                self.session.invalidate()
+
+    @staticmethod
+    def _leer_bloque(device, esclavo, bloque):
+        select_slave = getattr(device, "select_slave", None)
+        if select_slave is not None:
+            select_slave(esclavo)
+        return leer_bloque(device, bloque)
+
+    async def leer_registro(self, direccion: int) -> int:
+        return await self.run_blocking(self._llamar, lambda d, a: d.read_register(a), direccion)
+
+    async def escribir_registro(self, direccion: int, valor: int) -> None:
+        await self.run_blocking(self._llamar, lambda d, a, v: d.write_register(a, v), direccion, valor)
+
+    async def leer_bloque(self, esclavo: int, bloque):
+        return await self.run_blocking(self._llamar, self._leer_bloque, esclavo, bloque)
+
+    async def read_registers(self, start: int, count: int, functioncode: int = 3):
+        return await self.run_blocking(
+            self._llamar, lambda d, *a: d.read_registers(*a), start, count, functioncode
+        )
+
+    async def read_digital_inputs(self, start: int, count: int, functioncode: int = 2):
+        return await self.run_blocking(
+            self._llamar, lambda d, *a: d.read_digital_inputs(*a), start, count, functioncode
+        )
+
+
+class AsyncRepositoryAdapter(_BlockingAdapter, IAsyncDatabaseRepository):
+    """Adapta un IDatabaseRepository síncrono al puerto IAsyncDatabaseRepository."""
+    def __init__(self, repository):
+        super().__init__("db-io")
+        self.repository = repository
+
+    async def ejecutar_consulta(self, consulta, parametros):
+        return await self.run_blocking(self.repository.ejecutar_consulta, consulta, parametros)
+
+    async def actualizar_registro(self, consulta, parametros):
+        await self.run_blocking(self.repository.actualizar_registro, consulta, parametros)
+
+    async def insertar_lote(self, consulta, lista_parametros):
+        await self.run_blocking(self.repository.insertar_lote, consulta, lista_parametros)
+
+    async def cerrar_conexion(self):
+        await self.run_blocking(self.repository.cerrar_conexion)
+
+
+class AsyncAcquisitionEngine:
+    """
+    Ejecuta sobre un event loop tres tareas que se solapan:
+      - adquisición: cada periodo_s lee los bloques del plan a través de AsyncModbusDeviceAdapter
+        (un await por bloque, en el hilo del puerto) y los convierte con procesar_paso;
+      - persistencia: consume las lecturas y corre ModbusProcessor.persist en el hilo de la DB;
+      - transferencia: invoca transfer_callback cada intervalo_transferencia_s en su propio hilo.
+    """
+    def __init__(self, session, repository, read_plan, log, periodo_s=1.0,
+                 transfer_callback=None, intervalo_transferencia_s=1.0, max_pendientes=100,
+                 change_detector=None, circuit_breaker=None, sample_store=None):
+        self.session = session
+        self.repository = repository
+        self.read_plan = read_plan
+        self.logger = log
+        self.periodo_s = periodo_s
+        self.transfer_callback = transfer_callback
+        self.intervalo_transferencia_s = intervalo_transferencia_s
+        self.max_pendientes = max_pendientes
+        self.change_detector = change_detector
+        self.circuit_breaker = circuit_breaker
+        # wall_time de la lectura más reciente, para fechar la transferencia
+        self.ultima_lectura = None
+        self.sample_store = sample_store
+        self.stats = {"ciclos": 0, "errores": 0, "omitidos": 0, "latencia_total_s": 0.0, "latencia_max_s": 0.0}
+        self._modbus = AsyncModbusDeviceAdapter(session=session)
+        self._db = AsyncRepositoryAdapter(repository)
+        self._transfer = _BlockingAdapter("transfer-io")
+
+    async def _acquire(self):
+        registros = []
+        for paso in self.read_plan.pasos:
+            valores = await self._modbus.leer_bloque(paso.dispositivo, paso.bloque)
+            validar_bloque(paso, valores)
+            registros.extend(procesar_paso(paso, valores, time.monotonic_ns(), time.time()))
+        return registros
+
+    async def acquire_once(self):
+        """Ejecuta un ciclo de adquisición y registra su latencia; con el circuito abierto lo omite."""
+        if self.circuit_breaker is not None and not self.circuit_breaker.permitir():
+            self.stats["omitidos"] += 1
+            return []
+        inicio = time.perf_counter()
+        try:
+            registros = await self._acquire()
+        except (ModbusConnectionError, ModbusReadError) as e:
+            self.stats["errores"] += 1
+            self.logger.error(f"Error durante la adquisición Modbus: {e}")
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.registrar_fallo()
+            return []
+        finally:
+            latencia = time.perf_counter() - inicio
+            self.stats["ciclos"] += 1
+            self.stats["latencia_total_s"] += latencia
+            self.stats["latencia_max_s"] = max(self.stats["latencia_max_s"], latencia)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.registrar_exito()
+        self.ultima_lectura = ultima_lectura(registros) or self.ultima_lectura
+        if self.sample_store is not None:
+            self.sample_store.registrar(registros)
+        return registros
+
+    async def _acquisition_loop(self, cola, should_run):
+        loop = asyncio.get_running_loop()
+        proximo = loop.time()
+        while should_run():
+            registros = await self.acquire_once()
+            if registros:
+                if cola.full():
+                    # Se prioriza el dato más reciente
+                    cola.get_nowait()
+                cola.put_nowait(registros)
+            proximo += self.periodo_s
+            await asyncio.sleep(max(0.0, proximo - loop.time()))
+        await cola.put(None)
+
+    async def _persistence_loop(self, cola):
+        processor = ModbusProcessor(None, self.repository, self.logger, self.read_plan, self.change_detector)
+        while True:
+            registros = await cola.get()
+            if registros is None:
+                return
+            try:
+                await self._db.run_blocking(processor.persist, registros)
+            except DatabaseUpdateError as e:
+                self.logger.error(f"Error al persistir las lecturas: {e}")
+
+    async def _transfer_loop(self, should_run):
+        while should_run():
+            try:
+                await self._transfer.run_blocking(self.transfer_callback)
+            except Exception as e:
+                self.logger.error(f"Error en la transferencia de datos: {e}")
+            await asyncio.sleep(self.intervalo_transferencia_s)
+
+    async def run(self, should_run):
+        """
+        Ejecuta el motor hasta que should_run() retorne False.
+        """
+        cola = asyncio.Queue(maxsize=self.max_pendientes)
+        tareas = [
+            asyncio.create_task(self._acquisition_loop(cola, should_run)),
+            asyncio.create_task(self._persistence_loop(cola)),
+        ]
+        if self.transfer_callback is not None:
+            tareas.append(asyncio.create_task(self._transfer_loop(should_run)))
+        try:
+            await asyncio.gather(*tareas)
+        finally:
+            for adaptador in (self._modbus, self._db, self._transfer):
+                adaptador.shutdown()
+
+    def get_stats(self) -> dict:
+        """Retorna ciclos, errores, ciclos omitidos y latencia de adquisición (promedio y máxima)."""
+        ciclos = self.stats["ciclos"]
+        return {
+            "ciclos": ciclos,
+            "errores": self.stats["errores"],
+            "omitidos": self.stats["omitidos"],
+            "latencia_promedio_s": self.stats["latencia_total_s"] / ciclos if ciclos else 0.0,
+            "latencia_max_s": self.stats["latencia_max_s"],
+        }
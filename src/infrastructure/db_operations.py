@@ -5,9 +5,10 @@ Este módulo se encarga de realizar operaciones de lectura y escritura en la bas
 
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from src.application.interfaces import IDatabaseRepository
+from src.infrastructure.engine_registry import obtener_registro_engines
+from src.infrastructure.statement_cache import obtener_cache_sentencias
 from src.utils.logging.dependency_injection import get_logger
 
 # Cargamos las variables de entorno desde el archivo .env
@@ -17,11 +18,14 @@ logger = get_logger()
 class SQLAlchemyDatabaseRepository(IDatabaseRepository):
     "Implementación de la interfaz IDatabaseRepository utilizando SQLAlchemy."
 
-    def __init__(self):
+    def __init__(self, engine=None, cache_sentencias=None):
         # Inicializa el engine y la sesión utilizando la configuración definida
-        self.engine = self.obtener_engine()
+        # (se puede inyectar otro engine, por ejemplo SQLite para benchmarks)
+        self.engine = engine if engine is not None else self.obtener_engine()
         self.session_local = sessionmaker(bind=self.engine)
         self.session = self.session_local()
+        # Las consultas del bucle se repiten: cada texto se convierte en TextClause una sola vez
+        self.sentencias = cache_sentencias or obtener_cache_sentencias()
 
     def get_db_config(self):
         """
@@ -44,7 +48,8 @@ class SQLAlchemyDatabaseRepository(IDatabaseRepository):
 
     def obtener_engine(self) -> any:
         """
-        Retorna el objeto engine de SQLAlchemy configurado para la conexión a la base de datos.
+        Retorna el engine de SQLAlchemy configurado para la conexión a la base de datos.
+        El engine (y su pool de conexiones) es compartido por todos los repositorios del proceso.
         """
         try:
             config = self.get_db_config()
@@ -52,8 +57,7 @@ class SQLAlchemyDatabaseRepository(IDatabaseRepository):
                 f"mysql+pymysql://{config['user']}:{config['password']}@"
                 f"{config['host']}:{config['port']}/{config['db']}"
             )
-            engine = create_engine(conn_str, pool_pre_ping=True)
-            return engine
+            return obtener_registro_engines().obtener(conn_str)
         except Exception as e:
             logger.error(f"Error al obtener el engine de SQLAlchemy: {e}")
             raise e
@@ -74,7 +78,7 @@ class SQLAlchemyDatabaseRepository(IDatabaseRepository):
         Ejecuta una consulta de lectura (SELECT) y retorna los resultados.
         """
         try:
-            result = self.session.execute(text(consulta), parametros)
+            result = self.session.execute(self.sentencias.obtener(consulta), parametros)
             rows = result.fetchall()
             return rows
         except Exception as e:
@@ -84,16 +88,18 @@ class SQLAlchemyDatabaseRepository(IDatabaseRepository):
             self.session.rollback()
             raise e
 
-    def actualizar_registro(self, consulta: str, parametros: dict) -> None:
+    def actualizar_registro(self, consulta: str, parametros: dict) -> int:
         """
         Ejecuta una consulta de actualización (UPDATE) de manera transaccional.
+        Retorna la cantidad de filas afectadas (0 para un INSERT IGNORE duplicado).
         """
         try:
-            self.session.execute(text(consulta), parametros)
+            result = self.session.execute(self.sentencias.obtener(consulta), parametros)
             self.session.commit()
             logger.info(
                 f"Actualización exitosa con consulta: {consulta} y parámetros: {parametros}"
             )
+            return result.rowcount
         except Exception as e:
             self.session.rollback()
             logger.error(
@@ -102,14 +108,33 @@ class SQLAlchemyDatabaseRepository(IDatabaseRepository):
             )
             raise DatabaseUpdateError(f"Error al actualizar la base de datos: {e}") from e
 
-    def insertar_lote(self, consulta: str, lista_parametros: list) -> None:
+    def actualizar_lote(self, consulta: str, lista_parametros: list) -> None:
+        """
+        Ejecuta la consulta de actualización para cada juego de parámetros (executemany)
+        en una única transacción, con un solo commit.
+        """
+        if not lista_parametros:
+            return
+        try:
+            self.session.execute(self.sentencias.obtener(consulta), lista_parametros)
+            self.session.commit()
+            logger.info(f"Actualización en lote exitosa: {len(lista_parametros)} filas con consulta: {consulta}")
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error actualizando lote con consulta: {consulta}. Error: {e}")
+            raise DatabaseUpdateError(f"Error al actualizar la base de datos: {e}") from e
+
+    def insertar_lote(self, consulta: str, lista_parametros: list) -> int:
         """
         Realiza inserciones en lote (batch insert) de manera transaccional.
+        Con un INSERT ... VALUES, PyMySQL envía el executemany como un único INSERT de varias filas.
+        Retorna la cantidad de filas afectadas (las ignoradas por INSERT IGNORE no cuentan).
         """
         try:
-            self.session.execute(text(consulta), lista_parametros)
+            result = self.session.execute(self.sentencias.obtener(consulta), lista_parametros)
             self.session.commit()
             logger.info(f"Inserción en lote exitosa con consulta: {consulta}")
+            return result.rowcount
         except Exception as e:
             self.session.rollback()
             logger.error(f"Error insertando lote con consulta: {consulta}. Error: {e}")
@@ -134,10 +159,10 @@ class SQLAlchemyDatabaseRepository(IDatabaseRepository):
 
     def cerrar_conexion(self) -> None:
         """
-        Cierra la sesión y la conexión de la base de datos.
+        Cierra la sesión y devuelve su conexión al pool. El engine es compartido:
+        sus conexiones se cierran con obtener_registro_engines().cerrar_todos().
         """
         self.session.close()
-        self.engine.dispose()
         logger.info("Conexión cerrada exitosamente")
 
 class DatabaseUpdateError(Exception):
@@ -0,0 +1,64 @@
+"""
+Path: src/infrastructure/db_schema.py
+Índices de los que dependen las transferencias:
+  - una clave única por unixtime en ProductionLog e intervalproduction: cada transferencia es un
+    único INSERT IGNORE, atómico aun con varias instancias, y los duplicados se detectan por las
+    filas afectadas. Mientras la clave no esté confirmada (ver claves_unicas_presentes), las
+    transferencias usan la inserción con NOT EXISTS;
+  - un índice sobre registro en registros_modbus: la consulta pivote del snapshot busca solo las
+    filas de los registros pedidos, sin recorrer la tabla. No incluye valor, que se actualiza en
+    cada ciclo: mantenerlo en el índice encarecería todas las escrituras de la adquisición.
+"""
+
+from sqlalchemy import text
+
+# (tabla, nombre del índice, columnas, único)
+INDICES = (
+    ("ProductionLog", "uq_productionlog_unixtime", ("unixtime",), True),
+    ("intervalproduction", "uq_intervalproduction_unixtime", ("unixtime",), True),
+    ("registros_modbus", "ix_registros_modbus_registro", ("registro",), False),
+)
+
+CONSULTA_INDICE_EXISTENTE = """
+    SELECT COUNT(*) FROM information_schema.statistics
+    WHERE table_schema = DATABASE() AND table_name = :tabla AND index_name = :nombre
+"""
+
+
+def ddl_indice(tabla: str, nombre: str, columnas, unico: bool) -> str:
+    """Retorna la sentencia que agrega el índice."""
+    return f"ALTER TABLE {tabla} ADD {'UNIQUE KEY' if unico else 'INDEX'} {nombre} ({', '.join(columnas)})"
+
+
+def asegurar_indices(engine, log) -> list:
+    """
+    Agrega los índices que falten (MySQL). Si una tabla ya tiene unixtime repetidos, la clave
+    única no puede crearse: se informa el error y se continúa con los demás.
+    Retorna los nombres de los índices creados.
+    """
+    creados = []
+    with engine.connect() as conn:
+        for tabla, nombre, columnas, unico in INDICES:
+            existe = conn.execute(text(CONSULTA_INDICE_EXISTENTE), {"tabla": tabla, "nombre": nombre}).scalar()
+            if existe:
+                continue
+            try:
+                conn.execute(text(ddl_indice(tabla, nombre, columnas, unico)))
+                conn.commit()
+                creados.append(nombre)
+                log.info(f"Índice {nombre} creado en {tabla}")
+            except Exception as e:
+                conn.rollback()
+                motivo = f" (¿hay filas con el mismo {', '.join(columnas)}?)" if unico else ""
+                log.error(f"No se pudo crear el índice {nombre} en {tabla}{motivo}: {e}")
+    return creados
+
+
+def claves_unicas_presentes(engine) -> set:
+    """Retorna las tablas cuya clave única ya existe en la base."""
+    with engine.connect() as conn:
+        return {
+            tabla
+            for tabla, nombre, _, unico in INDICES
+            if unico and conn.execute(text(CONSULTA_INDICE_EXISTENTE), {"tabla": tabla, "nombre": nombre}).scalar()
+        }
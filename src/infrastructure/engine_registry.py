@@ -0,0 +1,118 @@
+"""
+Path: src/infrastructure/engine_registry.py
+Registro de engines de SQLAlchemy del proceso: un único engine (y su pool de conexiones)
+por URL, compartido por todos los repositorios. El tamaño del pool, el desborde y el
+reciclado se configuran por entorno, y el pool mide sus checkouts y el tiempo de espera.
+"""
+
+import os
+import threading
+import time
+from functools import lru_cache
+from sqlalchemy import create_engine, exc as sa_exc
+from sqlalchemy.pool import QueuePool
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool que cuenta los checkouts y mide cuánto se espera por una conexión libre."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metricas = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "espera_total_s": 0.0,
+            "espera_max_s": 0.0,
+        }
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.metricas["timeouts"] += 1
+            raise
+        espera = time.perf_counter() - inicio
+        self.metricas["checkouts"] += 1
+        self.metricas["espera_total_s"] += espera
+        self.metricas["espera_max_s"] = max(self.metricas["espera_max_s"], espera)
+        return conexion
+
+    def get_stats(self) -> dict:
+        """Retorna las métricas de checkout y el estado actual del pool."""
+        checkouts = self.metricas["checkouts"]
+        return {
+            **self.metricas,
+            "espera_media_s": self.metricas["espera_total_s"] / checkouts if checkouts else 0.0,
+            "tamano": self.size(),
+            "en_uso": self.checkedout(),
+            "libres": self.checkedin(),
+            "desborde": self.overflow(),
+        }
+
+
+class EngineRegistry:
+    """
+    Engines compartidos por URL. Opciones del pool (por entorno):
+      - DB_POOL_SIZE: conexiones que se mantienen abiertas;
+      - DB_MAX_OVERFLOW: conexiones extra permitidas en picos;
+      - DB_POOL_RECYCLE_S: antigüedad máxima de una conexión (por debajo de wait_timeout de MySQL);
+      - DB_POOL_TIMEOUT_S: espera máxima por una conexión libre.
+    """
+    def __init__(self, pool_size=5, max_overflow=5, pool_recycle_s=3600, pool_timeout_s=10.0):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_recycle_s = pool_recycle_s
+        self.pool_timeout_s = pool_timeout_s
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Crea el registro con DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE_S y DB_POOL_TIMEOUT_S."""
+        return cls(
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "5")),
+            pool_recycle_s=int(os.getenv("DB_POOL_RECYCLE_S", "3600")),
+            pool_timeout_s=float(os.getenv("DB_POOL_TIMEOUT_S", "10")),
+        )
+
+    def obtener(self, url: str):
+        """Retorna el engine de la URL, creándolo con el pool configurado la primera vez."""
+        with self._lock:
+            engine = self._engines.get(url)
+            if engine is None:
+                engine = create_engine(
+                    url,
+                    poolclass=MeteredQueuePool,
+                    pool_size=self.pool_size,
+                    max_overflow=self.max_overflow,
+                    pool_recycle=self.pool_recycle_s,
+                    pool_timeout=self.pool_timeout_s,
+                    pool_pre_ping=True,
+                )
+                self._engines[url] = engine
+            return engine
+
+    def get_stats(self) -> dict:
+        """Retorna las métricas del pool de cada engine (clave: URL sin contraseña)."""
+        with self._lock:
+            engines = list(self._engines.values())
+        return {
+            engine.url.render_as_string(hide_password=True): engine.pool.get_stats()
+            for engine in engines
+            if isinstance(engine.pool, MeteredQueuePool)
+        }
+
+    def cerrar_todos(self) -> None:
+        """Cierra las conexiones de todos los engines (al terminar el proceso)."""
+        with self._lock:
+            engines = list(self._engines.values())
+            self._engines.clear()
+        for engine in engines:
+            engine.dispose()
+
+
+@lru_cache(maxsize=None)
+def obtener_registro_engines() -> EngineRegistry:
+    """Retorna el registro de engines del proceso."""
+    return EngineRegistry.from_env()
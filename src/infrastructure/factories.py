@@ -1,15 +1,67 @@
 """
 Fábricas centralizadas para la creación de dependencias principales.
 """
+import os
 from src.infrastructure.db_operations import SQLAlchemyDatabaseRepository
+from src.infrastructure.db_schema import asegurar_indices, claves_unicas_presentes
+from src.infrastructure.modbus_tcp import ModbusTcpConnectionManager, DEFAULT_TCP_PORT
+from src.infrastructure.store_and_forward import StoreAndForwardRepository, obtener_buffer
 from src.modbus_processor import ModbusDevice, ModbusConnectionManager
 from src.utils.logging.dependency_injection import get_logger
 from src.data_transfer_controller import DataTransferController
 
 
 def create_repository():
-    """Crea una instancia del repositorio de base de datos."""
-    return SQLAlchemyDatabaseRepository()
+    """
+    Crea una instancia del repositorio de base de datos. Cada repositorio tiene su propia sesión
+    sobre el engine compartido del proceso (ver engine_registry), así que crear uno es barato.
+    Salvo STORE_FORWARD_ENABLED=0, las escrituras que fallan por un corte se guardan en el
+    buffer local y se reenvían luego.
+    """
+    repository = SQLAlchemyDatabaseRepository()
+    if os.getenv('STORE_FORWARD_ENABLED', '1') == '0':
+        return repository
+    return StoreAndForwardRepository(repository, obtener_buffer(), get_logger())
+
+
+def ensure_schema(logger=None):
+    """Agrega los índices que requieren las transferencias (ver db_schema)."""
+    logger = logger or get_logger()
+    repository = SQLAlchemyDatabaseRepository()
+    try:
+        return asegurar_indices(repository.engine, logger)
+    finally:
+        repository.cerrar_conexion()
+
+
+def confirmar_claves_unicas() -> set:
+    """
+    Retorna las tablas cuya clave única existe (solo consulta information_schema; los índices
+    se crean una única vez al iniciar, en ensure_schema). Los servicios de transferencia lo
+    invocan, espaciado, hasta que su tabla aparezca en el resultado.
+    """
+    repository = SQLAlchemyDatabaseRepository()
+    try:
+        return claves_unicas_presentes(repository.engine)
+    finally:
+        repository.cerrar_conexion()
+
+
+def create_modbus_connection_manager(logger=None):
+    """
+    Crea el gestor de conexiones Modbus: TCP si MODBUS_TCP_HOST está definido, serie en caso contrario.
+    """
+    logger = logger or get_logger()
+    host = os.getenv('MODBUS_TCP_HOST')
+    if host:
+        return ModbusTcpConnectionManager(
+            logger,
+            host,
+            port=int(os.getenv('MODBUS_TCP_PORT', DEFAULT_TCP_PORT)),
+            timeout=float(os.getenv('MODBUS_TCP_TIMEOUT', '1.0')),
+            connect_timeout=float(os.getenv('MODBUS_TCP_CONNECT_TIMEOUT', '3.0')),
+        )
+    return ModbusConnectionManager(logger)
 
 
 def create_modbus_device():
@@ -24,4 +76,4 @@ def create_data_transfer_controller():
     """Crea una instancia de DataTransferController con sus dependencias inyectadas."""
     logger = get_logger()
     repo = create_repository()
-    return DataTransferController(logger, repo)
+    return DataTransferController(logger, repo, confirmar_claves=confirmar_claves_unicas)
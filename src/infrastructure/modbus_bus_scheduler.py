@@ -0,0 +1,146 @@
+"""
+Path: src/infrastructure/modbus_bus_scheduler.py
+Planificador de sondeo para varios esclavos Modbus en un mismo bus RS-485.
+Mantiene un único puerto abierto (vía ModbusSession), recorre los esclavos en
+round-robin según el período de cada uno y posterga de forma adaptativa a los
+esclavos lentos o ausentes para que un nodo caído no frene a los demás.
+"""
+
+import time
+from dataclasses import dataclass
+from src.infrastructure.db_operations import DatabaseUpdateError
+from src.modbus_processor import ModbusProcessor, ModbusConnectionError, ModbusReadError
+from src.utils.circuit_breaker import CircuitBreaker
+
+
+@dataclass
+class EstadoEsclavo:
+    direccion: int
+    periodo_s: float
+    proximo_sondeo: float = 0.0
+    sondeos: int = 0
+    fallos: int = 0
+    fallos_consecutivos: int = 0
+    omisiones: int = 0
+    ultimo_ciclo_s: float = 0.0
+    ciclo_total_s: float = 0.0
+    ciclo_max_s: float = 0.0
+
+    def a_dict(self) -> dict:
+        """Retorna las estadísticas de ciclo del esclavo."""
+        return {
+            "periodo_s": self.periodo_s,
+            "sondeos": self.sondeos,
+            "fallos": self.fallos,
+            "fallos_consecutivos": self.fallos_consecutivos,
+            "omisiones": self.omisiones,
+            "ultimo_ciclo_s": self.ultimo_ciclo_s,
+            "ciclo_promedio_s": self.ciclo_total_s / self.sondeos if self.sondeos else 0.0,
+            "ciclo_max_s": self.ciclo_max_s,
+        }
+
+
+class ModbusBusScheduler:
+    """
+    Sondea todos los esclavos presentes en el plan de lectura sobre un único puerto.
+    - Cada esclavo se sondea como máximo una vez por su período (plan.periodos).
+    - Cada esclavo tiene su CircuitBreaker: tras un fallo se omite sin tocar el bus y se
+      vuelve a probar con backoff exponencial (2, 4, 8... períodos, hasta backoff_max_s).
+    - Si un sondeo tarda más que umbral_lento_s, el siguiente se posterga un período extra.
+    - El orden de recorrido rota en cada ronda para que ningún esclavo quede siempre al final.
+    """
+    def __init__(self, session, read_plan, log, periodo_por_defecto_s=1.0,
+                 umbral_lento_s=0.5, backoff_max_s=60.0, clock=time.monotonic, change_detector=None):
+        self.session = session
+        self.read_plan = read_plan
+        self.logger = log
+        self.change_detector = change_detector
+        self.umbral_lento_s = umbral_lento_s
+        self.backoff_max_s = backoff_max_s
+        self.clock = clock
+        self._planes = {}
+        self._circuitos = {}
+        self.esclavos = []
+        for direccion in read_plan.dispositivos():
+            self._planes[direccion] = read_plan.filtrar(dispositivo=direccion)
+            periodo = read_plan.periodos.get(direccion, periodo_por_defecto_s)
+            self.esclavos.append(EstadoEsclavo(direccion=direccion, periodo_s=periodo))
+            self._circuitos[direccion] = CircuitBreaker(
+                f"esclavo {direccion}", log, umbral_fallos=1, espera_inicial_s=2 * periodo,
+                espera_max_s=backoff_max_s, clock=clock,
+            )
+        self._turno = 0
+
+    def poll_once(self, repository=None) -> list:
+        """
+        Ejecuta una ronda: sondea los esclavos cuyo período venció y persiste sus lecturas.
+        Retorna los ModbusRegister leídos en la ronda. Con repository=None solo adquiere,
+        dejando la persistencia a cargo del llamador.
+        """
+        try:
+            device = self.session.get_device()
+        except ModbusConnectionError as e:
+            self.logger.error(f"Error de conexión Modbus: {e}")
+            return []
+
+        registros = []
+        cantidad = len(self.esclavos)
+        orden = [self.esclavos[(self._turno + i) % cantidad] for i in range(cantidad)]
+        self._turno = (self._turno + 1) % max(cantidad, 1)
+        for esclavo in orden:
+            inicio = self.clock()
+            if esclavo.proximo_sondeo > inicio or not self._circuitos[esclavo.direccion].permitir():
+                esclavo.omisiones += 1
+                continue
+            registros.extend(self._poll_slave(esclavo, device, repository, inicio))
+            if getattr(device, "connection_lost", False):
+                # Sin puerto no tiene sentido seguir con el resto de la ronda
+                self.session.invalidate()
+                break
+        return registros
+
+    def _poll_slave(self, esclavo, device, repository, inicio) -> list:
+        processor = ModbusProcessor(
+            device, repository, self.logger, self._planes[esclavo.direccion], self.change_detector
+        )
+        registros = []
+        ok = True
+        try:
+            registros = processor.acquire()
+        except ModbusReadError as e:
+            ok = False
+            self.logger.error(f"Esclavo {esclavo.direccion} sin respuesta: {e}")
+        duracion = self.clock() - inicio
+        self._registrar(esclavo, inicio, duracion, ok)
+        if registros and repository is not None:
+            try:
+                processor.persist(registros)
+            except DatabaseUpdateError as e:
+                self.logger.error(f"Error al persistir las lecturas del esclavo {esclavo.direccion}: {e}")
+        return registros
+
+    def _registrar(self, esclavo, inicio, duracion, ok):
+        esclavo.sondeos += 1
+        esclavo.ultimo_ciclo_s = duracion
+        esclavo.ciclo_total_s += duracion
+        esclavo.ciclo_max_s = max(esclavo.ciclo_max_s, duracion)
+        circuito = self._circuitos[esclavo.direccion]
+        espera = esclavo.periodo_s
+        if ok:
+            circuito.registrar_exito()
+            if duracion > self.umbral_lento_s:
+                espera += esclavo.periodo_s
+        else:
+            esclavo.fallos += 1
+            circuito.registrar_fallo()
+        esclavo.fallos_consecutivos = circuito.fallos_consecutivos
+        esclavo.proximo_sondeo = inicio + espera
+
+    def get_stats(self) -> dict:
+        """
+        Retorna las estadísticas de ciclo por esclavo, indexadas por dirección.
+        """
+        return {
+            esclavo.direccion: {**esclavo.a_dict(), "circuito": self._circuitos[esclavo.direccion].estado}
+            for esclavo in self.esclavos
+        }
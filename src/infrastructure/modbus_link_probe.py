@@ -0,0 +1,98 @@
+"""
+Path: src/infrastructure/modbus_link_probe.py
+Modo de sondeo del enlace serie: mide los tiempos de respuesta del plan de lectura
+para cada combinación de baudios y timeout, y sugiere la configuración estable más rápida.
+
+Nota: el esclavo debe estar configurado (o autodetectar) cada velocidad probada;
+las velocidades que no soporta aparecen como inestables.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+from src.infrastructure.modbus_metrics import ModbusTransactionMetrics
+from src.modbus_processor import ModbusDevice, ModbusProcessor, ModbusReadError, SerialSettings
+
+BAUDRATES = (9600, 19200, 38400, 57600, 115200)
+TIMEOUTS_S = (0.05, 0.1, 0.2, 0.5)
+
+
+@dataclass
+class ResultadoSondeo:
+    baudrate: int
+    timeout: float
+    ciclos: int
+    fallos: int
+    timeouts: int
+    errores_crc: int
+    latencia_promedio_s: float
+    latencia_max_s: float
+
+    @property
+    def estable(self) -> bool:
+        return self.fallos == 0
+
+
+def sondear_enlace(instrument, read_plan, log, baudrates=BAUDRATES, timeouts=TIMEOUTS_S,
+                   ciclos: int = 20, base: SerialSettings = None) -> List[ResultadoSondeo]:
+    """
+    Ejecuta ciclos lecturas completas del plan por cada combinación y retorna los resultados.
+    """
+    base = base or SerialSettings.from_env()
+    resultados = []
+    for baudrate in baudrates:
+        for timeout in timeouts:
+            SerialSettings(baudrate, base.parity, base.bytesize, base.stopbits, timeout).aplicar(instrument)
+            metrics = ModbusTransactionMetrics()
+            processor = ModbusProcessor(ModbusDevice(instrument, log, metrics), None, log, read_plan)
+            fallos = 0
+            duraciones = []
+            for _ in range(ciclos):
+                inicio = time.perf_counter()
+                try:
+                    processor.acquire()
+                except ModbusReadError:
+                    fallos += 1
+                duraciones.append(time.perf_counter() - inicio)
+            totales = metrics.totales()
+            resultados.append(ResultadoSondeo(
+                baudrate=baudrate,
+                timeout=timeout,
+                ciclos=ciclos,
+                fallos=fallos,
+                timeouts=totales["timeouts"],
+                errores_crc=totales["errores_crc"],
+                latencia_promedio_s=sum(duraciones) / len(duraciones) if duraciones else 0.0,
+                latencia_max_s=max(duraciones, default=0.0),
+            ))
+    # Se restaura la configuración original
+    base.aplicar(instrument)
+    return resultados
+
+
+def sugerir_configuracion(resultados: List[ResultadoSondeo]) -> Optional[ResultadoSondeo]:
+    """
+    Retorna la combinación estable de menor latencia; ante empate, la de mayor timeout (más margen).
+    """
+    estables = [r for r in resultados if r.estable]
+    if not estables:
+        return None
+    return min(estables, key=lambda r: (round(r.latencia_promedio_s, 4), -r.timeout))
+
+
+def formatear_resultados(resultados: List[ResultadoSondeo]) -> str:
+    """Retorna una tabla de texto con los resultados y la sugerencia."""
+    lineas = [f"{'baudios':>8} {'timeout':>8} {'fallos':>7} {'timeouts':>9} {'crc':>5} {'prom ms':>9} {'max ms':>9}"]
+    for r in resultados:
+        lineas.append(
+            f"{r.baudrate:>8} {r.timeout:>8.3f} {r.fallos:>7} {r.timeouts:>9} {r.errores_crc:>5} "
+            f"{r.latencia_promedio_s * 1000:>9.2f} {r.latencia_max_s * 1000:>9.2f}"
+        )
+    sugerida = sugerir_configuracion(resultados)
+    if sugerida is None:
+        lineas.append("Ninguna combinación fue estable.")
+    else:
+        lineas.append(
+            f"Sugerencia: MODBUS_BAUDRATE={sugerida.baudrate} MODBUS_TIMEOUT={sugerida.timeout}"
+        )
+    return "\n".join(lineas)
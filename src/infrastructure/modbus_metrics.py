@@ -0,0 +1,137 @@
+"""
+Path: src/infrastructure/modbus_metrics.py
+Métricas por transacción Modbus: histograma de latencia, timeouts y errores de CRC
+por operación y dirección. Las lecturas en bloque se atribuyen a cada registro que cubren,
+de modo que las métricas siguen siendo por registro aunque el plan agrupe las peticiones.
+"""
+
+import bisect
+import threading
+import minimalmodbus  # pylint: disable=import-error
+
+# Límites superiores de los buckets del histograma, en milisegundos
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets fijos (el último bucket es > 1000 ms)."""
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def add(self, segundos: float):
+        self.buckets[bisect.bisect_left(BUCKETS_MS, segundos * 1000)] += 1
+        self.count += 1
+        self.total_s += segundos
+        if segundos > self.max_s:
+            self.max_s = segundos
+
+    def percentil(self, p: float) -> float:
+        """Retorna el límite superior (ms) del bucket que contiene el percentil p (0-100)."""
+        if not self.count:
+            return 0.0
+        objetivo = self.count * p / 100
+        acumulado = 0
+        for i, cantidad in enumerate(self.buckets):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else float("inf")
+        return float("inf")
+
+    def a_dict(self) -> dict:
+        return {
+            "cantidad": self.count,
+            "promedio_ms": self.total_s / self.count * 1000 if self.count else 0.0,
+            "max_ms": self.max_s * 1000,
+            "p50_ms": self.percentil(50),
+            "p99_ms": self.percentil(99),
+            "buckets_ms": dict(zip([str(b) for b in BUCKETS_MS] + [">1000"], self.buckets)),
+        }
+
+
+class TransactionStats:
+    """Métricas de una operación sobre una dirección."""
+    def __init__(self):
+        self.latencia = LatencyHistogram()
+        self.timeouts = 0
+        self.errores_crc = 0
+        self.otros_errores = 0
+
+    def a_dict(self) -> dict:
+        return {
+            "latencia": self.latencia.a_dict(),
+            "timeouts": self.timeouts,
+            "errores_crc": self.errores_crc,
+            "otros_errores": self.otros_errores,
+        }
+
+
+def clasificar_error(error: Exception) -> str:
+    """Clasifica un error de lectura como 'timeout', 'crc' u 'otro'."""
+    if isinstance(error, minimalmodbus.NoResponseError):
+        return "timeout"
+    if isinstance(error, minimalmodbus.InvalidResponseError) and "Checksum" in str(error):
+        return "crc"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    return "otro"
+
+
+class ModbusTransactionMetrics:
+    """
+    Registro de métricas de transacciones, indexado por (operación, dirección).
+    Una petición en bloque suma su latencia y su error a cada dirección del bloque;
+    los totales cuentan cada petición una sola vez.
+    """
+    def __init__(self):
+        self._stats = {}
+        self._totales = {"transacciones": 0, "timeouts": 0, "errores_crc": 0, "otros_errores": 0}
+        self._lock = threading.Lock()
+
+    def _get(self, operacion: str, direccion: int) -> TransactionStats:
+        # Se invoca con self._lock tomado
+        clave = (operacion, direccion)
+        stats = self._stats.get(clave)
+        if stats is None:
+            stats = self._stats[clave] = TransactionStats()
+        return stats
+
+    def registrar(self, operacion: str, direccion: int, segundos: float, error: Exception = None,
+                  cantidad: int = 1):
+        """
+        Registra una transacción sobre las cantidad direcciones que empiezan en direccion;
+        la latencia se cuenta también para las fallidas.
+        """
+        tipo = clasificar_error(error) if error is not None else None
+        direcciones = range(direccion, direccion + cantidad) if direccion is not None else (None,)
+        # Con --parallel o --pipeline se escribe desde los hilos de adquisición y se lee desde otro
+        with self._lock:
+            self._totales["transacciones"] += 1
+            if tipo is not None:
+                self._totales[_CAMPO_ERROR[tipo]] += 1
+            for actual in direcciones:
+                stats = self._get(operacion, actual)
+                stats.latencia.add(segundos)
+                if tipo == "timeout":
+                    stats.timeouts += 1
+                elif tipo == "crc":
+                    stats.errores_crc += 1
+                elif tipo is not None:
+                    stats.otros_errores += 1
+
+    def resumen(self) -> dict:
+        """Retorna las métricas de cada registro, con clave 'operacion@direccion'."""
+        with self._lock:
+            return {
+                f"{operacion}@{direccion}": stats.a_dict() for (operacion, direccion), stats in self._stats.items()
+            }
+
+    def totales(self) -> dict:
+        """Retorna la cantidad total de transacciones (peticiones), timeouts y errores de CRC."""
+        with self._lock:
+            return dict(self._totales)
+
+
+_CAMPO_ERROR = {"timeout": "timeouts", "crc": "errores_crc", "otro": "otros_errores"}
@@ -0,0 +1,173 @@
+"""
+Path: src/infrastructure/modbus_tcp.py
+Transporte Modbus TCP detrás del mismo puerto IModbusConnectionManager que el serie.
+ModbusTcpInstrument expone la misma superficie que minimalmodbus.Instrument
+(read_register, read_registers, read_bit, read_bits, write_register, address),
+de modo que ModbusDevice, ModbusSession y ModbusProcessor lo usan sin cambios.
+El socket se mantiene abierto entre peticiones y se reabre solo tras un error.
+"""
+
+import socket
+import struct
+import threading
+import minimalmodbus  # pylint: disable=import-error
+from src.application.interfaces import IModbusConnectionManager
+from src.modbus_processor import ModbusConnectionError
+
+MBAP_HEADER = struct.Struct(">HHHB")
+DEFAULT_TCP_PORT = 502
+
+
+def _recv_exact(sock, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("El esclavo Modbus TCP cerró la conexión")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _unpack_bits(payload: bytes, count: int) -> list:
+    return [(payload[i // 8] >> (i % 8)) & 1 for i in range(count)]
+
+
+class ModbusTcpInstrument:
+    """
+    Cliente Modbus TCP con socket persistente.
+    Los errores de socket se propagan como OSError (ModbusDevice los trata como
+    pérdida de conexión); los errores de protocolo, como excepciones de minimalmodbus.
+    """
+    def __init__(self, host: str, port: int = DEFAULT_TCP_PORT, unit_id: int = 1,
+                 timeout: float = 1.0, connect_timeout: float = 3.0):
+        self.host = host
+        self.port = port
+        self.address = unit_id
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._socket = None
+        self._transaction_id = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._socket is not None
+
+    def connect(self):
+        """Abre el socket si no está abierto."""
+        if self._socket is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+            sock.settimeout(self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._socket = sock
+
+    def close(self):
+        """Cierra el socket."""
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            finally:
+                self._socket = None
+
+    def _request(self, pdu: bytes) -> bytes:
+        with self._lock:
+            self.connect()
+            self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+            header = MBAP_HEADER.pack(self._transaction_id, 0, len(pdu) + 1, self.address)
+            try:
+                self._socket.sendall(header + pdu)
+                transaction_id, protocol_id, length, unit_id = MBAP_HEADER.unpack(
+                    _recv_exact(self._socket, MBAP_HEADER.size)
+                )
+                response = _recv_exact(self._socket, length - 1)
+            except OSError:
+                # El socket queda en estado desconocido: se reabre en la próxima petición
+                self.close()
+                raise
+        if transaction_id != self._transaction_id or protocol_id != 0 or unit_id != self.address:
+            self.close()
+            raise minimalmodbus.InvalidResponseError(
+                f"Cabecera MBAP inesperada: transacción {transaction_id}, unidad {unit_id}"
+            )
+        if response[0] == pdu[0] | 0x80:
+            raise minimalmodbus.SlaveReportedException(
+                f"El esclavo reportó la excepción {response[1]} para la función {pdu[0]}"
+            )
+        if response[0] != pdu[0]:
+            raise minimalmodbus.InvalidResponseError(f"Código de función inesperado: {response[0]}")
+        return response
+
+    def _read(self, functioncode: int, start: int, count: int) -> bytes:
+        response = self._request(struct.pack(">BHH", functioncode, start, count))
+        payload = response[2:]
+        if response[1] != len(payload):
+            raise minimalmodbus.InvalidResponseError("Longitud de respuesta inválida")
+        return payload
+
+    def read_registers(self, registeraddress: int, number_of_registers: int, functioncode: int = 3) -> list:
+        payload = self._read(functioncode, registeraddress, number_of_registers)
+        if len(payload) != 2 * number_of_registers:
+            raise minimalmodbus.InvalidResponseError("Cantidad de registros inválida en la respuesta")
+        return list(struct.unpack(f">{number_of_registers}H", payload))
+
+    def read_register(self, registeraddress: int, number_of_decimals: int = 0, functioncode: int = 3,
+                      signed: bool = False) -> int:
+        value = self.read_registers(registeraddress, 1, functioncode)[0]
+        if signed and value >= 0x8000:
+            value -= 0x10000
+        return value / 10 ** number_of_decimals if number_of_decimals else value
+
+    def read_bits(self, registeraddress: int, number_of_bits: int, functioncode: int = 2) -> list:
+        payload = self._read(functioncode, registeraddress, number_of_bits)
+        if len(payload) != (number_of_bits + 7) // 8:
+            raise minimalmodbus.InvalidResponseError("Cantidad de bits inválida en la respuesta")
+        return _unpack_bits(payload, number_of_bits)
+
+    def read_bit(self, registeraddress: int, functioncode: int = 2) -> int:
+        return self.read_bits(registeraddress, 1, functioncode)[0]
+
+    def write_register(self, registeraddress: int, value: int, number_of_decimals: int = 0,
+                       functioncode: int = 16, signed: bool = False) -> None:
+        value = int(round(value * 10 ** number_of_decimals)) & 0xFFFF
+        if functioncode == 6:
+            self._request(struct.pack(">BHH", 6, registeraddress, value))
+        else:
+            self._request(struct.pack(">BHHBH", 16, registeraddress, 1, 2, value))
+
+
+class ModbusTcpConnectionManager(IModbusConnectionManager):
+    """
+    Gestor de conexiones Modbus TCP, con la misma interfaz establish_connection()
+    que ModbusConnectionManager para poder usarse desde ModbusSession.
+    """
+    def __init__(self, log, host: str, port: int = DEFAULT_TCP_PORT, device_address: int = 1,
+                 timeout: float = 1.0, connect_timeout: float = 3.0):
+        self.logger = log
+        self.host = host
+        self.port = port
+        self.device_address = device_address
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+
+    def detectar_dispositivos(self) -> list:
+        return [f"{self.host}:{self.port}"]
+
+    def abrir_conexion(self, direccion: str) -> ModbusTcpInstrument:
+        host, _, port = direccion.rpartition(":")
+        instrument = ModbusTcpInstrument(
+            host, int(port), self.device_address, self.timeout, self.connect_timeout
+        )
+        try:
+            instrument.connect()
+        except OSError as e:
+            error_msg = f"Error al conectar con {direccion} por Modbus TCP: {e}"
+            self.logger.error(error_msg)
+            raise ModbusConnectionError(error_msg) from e
+        self.logger.info(f"Conexión Modbus TCP establecida en {direccion}, unidad {self.device_address}")
+        return instrument
+
+    def cerrar_conexion(self, conexion: ModbusTcpInstrument) -> None:
+        conexion.close()
+
+    def establish_connection(self) -> ModbusTcpInstrument:
+        return self.abrir_conexion(self.detectar_dispositivos()[0])
@@ -0,0 +1,140 @@
+"""
+Path: src/infrastructure/modbus_tcp_simulator.py
+Esclavo Modbus TCP en proceso, para pruebas y benchmarks sin hardware.
+Atiende las funciones 1, 2, 3, 4, 6 y 16 sobre un banco de registros en memoria,
+con varias unidades (unit id) por servidor.
+"""
+
+import socketserver
+import struct
+import threading
+from src.infrastructure.modbus_tcp import MBAP_HEADER, _recv_exact
+
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_ADDRESS = 2
+
+
+class RegisterBank:
+    """Banco de registros de un esclavo: bits (funciones 1 y 2) y registros (3 y 4)."""
+    def __init__(self, size: int = 65536):
+        self.size = size
+        self.bits = bytearray(size)
+        self.registers = [0] * size
+        self._lock = threading.Lock()
+
+    def set_register(self, address: int, value: int):
+        with self._lock:
+            self.registers[address] = value & 0xFFFF
+
+    def set_bit(self, address: int, value: int):
+        with self._lock:
+            self.bits[address] = 1 if value else 0
+
+    def read_registers(self, start: int, count: int) -> list:
+        with self._lock:
+            return self.registers[start:start + count]
+
+    def read_bits(self, start: int, count: int) -> list:
+        with self._lock:
+            return list(self.bits[start:start + count])
+
+
+def _pack_bits(bits: list) -> bytes:
+    packed = bytearray((len(bits) + 7) // 8)
+    for i, bit in enumerate(bits):
+        if bit:
+            packed[i // 8] |= 1 << (i % 8)
+    return bytes(packed)
+
+
+class _ModbusTcpHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        simulator = self.server.simulator
+        while True:
+            try:
+                transaction_id, _, length, unit_id = MBAP_HEADER.unpack(
+                    _recv_exact(self.request, MBAP_HEADER.size)
+                )
+                pdu = _recv_exact(self.request, length - 1)
+            except (ConnectionError, OSError):
+                return
+            response = simulator.responder(unit_id, pdu)
+            if response is None:
+                continue
+            self.request.sendall(MBAP_HEADER.pack(transaction_id, 0, len(response) + 1, unit_id) + response)
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ModbusTcpSimulator:
+    """
+    Servidor Modbus TCP local. Con port=0 se elige un puerto libre (ver self.port).
+    Puede usarse como context manager:
+
+        with ModbusTcpSimulator(unit_ids=(1, 2)) as sim:
+            sim.bank(1).set_register(22, 100)
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, unit_ids=(1,), bank_size: int = 65536):
+        self.host = host
+        self._banks = {unit_id: RegisterBank(bank_size) for unit_id in unit_ids}
+        self._server = _ThreadingTCPServer((host, port), _ModbusTcpHandler)
+        self._server.simulator = self
+        self.port = self._server.server_address[1]
+        self._thread = None
+        self.requests = 0
+
+    def bank(self, unit_id: int = 1) -> RegisterBank:
+        return self._banks[unit_id]
+
+    def responder(self, unit_id: int, pdu: bytes):
+        """Retorna la respuesta PDU para la petición, o None si la unidad no existe."""
+        bank = self._banks.get(unit_id)
+        if bank is None:
+            return None
+        self.requests += 1
+        functioncode = pdu[0]
+        try:
+            if functioncode in (1, 2, 3, 4):
+                start, count = struct.unpack(">HH", pdu[1:5])
+                if start + count > bank.size:
+                    return bytes((functioncode | 0x80, ILLEGAL_DATA_ADDRESS))
+                if functioncode in (1, 2):
+                    payload = _pack_bits(bank.read_bits(start, count))
+                else:
+                    payload = struct.pack(f">{count}H", *bank.read_registers(start, count))
+                return bytes((functioncode, len(payload))) + payload
+            if functioncode == 6:
+                address, value = struct.unpack(">HH", pdu[1:5])
+                bank.set_register(address, value)
+                return pdu[:5]
+            if functioncode == 16:
+                start, count, _ = struct.unpack(">HHB", pdu[1:6])
+                for i, value in enumerate(struct.unpack(f">{count}H", pdu[6:6 + 2 * count])):
+                    bank.set_register(start + i, value)
+                return pdu[:5]
+        except (struct.error, IndexError):
+            return bytes((functioncode | 0x80, ILLEGAL_DATA_ADDRESS))
+        return bytes((functioncode | 0x80, ILLEGAL_FUNCTION))
+
+    def start(self):
+        """Inicia el servidor en un hilo en segundo plano."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="modbus-tcp-sim", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el servidor y libera el puerto."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
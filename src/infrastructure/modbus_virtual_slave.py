@@ -0,0 +1,127 @@
+"""
+Path: src/infrastructure/modbus_virtual_slave.py
+Esclavo Modbus RTU virtual: implementa la interfaz de minimalmodbus.Instrument
+(read_bit, read_bits, read_register, read_registers, write_register, address, serial)
+sobre bancos de registros en memoria, con latencia, jitter e inyección de errores
+configurables. Permite medir ModbusProcessor con mapas grandes y sondeos rápidos sin hardware.
+"""
+
+import random
+import time
+import minimalmodbus  # pylint: disable=import-error
+from src.infrastructure.modbus_tcp_simulator import RegisterBank
+
+# Bits por carácter en la línea (inicio + 8 datos + paridad/parada + parada)
+BITS_POR_CARACTER = 11
+
+
+class _VirtualSerial:
+    """Imita los atributos de serial.Serial que usan SerialSettings y ModbusDevice."""
+    def __init__(self, port):
+        self.port = port
+        self.baudrate = 19200
+        self.parity = "N"
+        self.bytesize = 8
+        self.stopbits = 1
+        self.timeout = 0.05
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+
+
+class VirtualSlaveInstrument:
+    """
+    Sustituto de minimalmodbus.Instrument. Cada dirección en slave_ids tiene su RegisterBank;
+    las peticiones a otras direcciones no reciben respuesta, como en un bus RS-485 real.
+
+    - latencia_s / jitter_s: tiempo de respuesta del esclavo (uniforme en ±jitter_s).
+    - modelar_linea: suma el tiempo de transmisión de la trama según serial.baudrate.
+    - tasa_timeouts / tasa_crc: probabilidad de NoResponseError / InvalidResponseError por petición.
+    Si el tiempo total supera serial.timeout, la petición también termina en NoResponseError.
+    Con seed se obtienen secuencias de errores reproducibles.
+    """
+    def __init__(self, port="virtual", slave_ids=(1,), bank_size: int = 65536, latencia_s: float = 0.0,
+                 jitter_s: float = 0.0, tasa_timeouts: float = 0.0, tasa_crc: float = 0.0,
+                 modelar_linea: bool = False, seed=None, sleep=time.sleep):
+        self.serial = _VirtualSerial(port)
+        self.address = slave_ids[0]
+        self.close_port_after_each_call = False
+        self.latencia_s = latencia_s
+        self.jitter_s = jitter_s
+        self.tasa_timeouts = tasa_timeouts
+        self.tasa_crc = tasa_crc
+        self.modelar_linea = modelar_linea
+        self._banks = {slave_id: RegisterBank(bank_size) for slave_id in slave_ids}
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self.peticiones = 0
+
+    def bank(self, slave_id: int = 1) -> RegisterBank:
+        return self._banks[slave_id]
+
+    def _transaccion(self, bytes_respuesta: int) -> RegisterBank:
+        """Simula el tiempo y los errores de una petición y retorna el banco del esclavo direccionado."""
+        if not self.serial.is_open:
+            raise minimalmodbus.MasterReportedException("Puerto virtual cerrado")
+        self.peticiones += 1
+        demora = self.latencia_s
+        if self.jitter_s:
+            demora = max(0.0, demora + self._random.uniform(-self.jitter_s, self.jitter_s))
+        if self.modelar_linea:
+            # Petición de 8 bytes más respuesta (dirección, función, datos y CRC)
+            demora += (8 + bytes_respuesta + 5) * BITS_POR_CARACTER / self.serial.baudrate
+        bank = self._banks.get(self.address)
+        sin_respuesta = (
+            bank is None
+            or demora > self.serial.timeout
+            or self._random.random() < self.tasa_timeouts
+        )
+        if sin_respuesta:
+            if self.serial.timeout:
+                self._sleep(self.serial.timeout)
+            raise minimalmodbus.NoResponseError("No communication with the instrument (no answer)")
+        if demora:
+            self._sleep(demora)
+        if self._random.random() < self.tasa_crc:
+            raise minimalmodbus.InvalidResponseError("Checksum error in rtu mode")
+        return bank
+
+    @staticmethod
+    def _validar(start: int, count: int, maximo: int, size: int):
+        if not 1 <= count <= maximo:
+            raise ValueError(f"Cantidad fuera de rango: {count} (máximo {maximo})")
+        if start < 0 or start + count > size:
+            raise minimalmodbus.IllegalRequestError("Slave reported illegal data address")
+
+    def read_bits(self, registeraddress: int, number_of_bits: int, functioncode: int = 2) -> list:
+        if functioncode not in (1, 2):
+            raise ValueError(f"Código de función inválido para bits: {functioncode}")
+        bank = self._transaccion((number_of_bits + 7) // 8)
+        self._validar(registeraddress, number_of_bits, 2000, bank.size)
+        return bank.read_bits(registeraddress, number_of_bits)
+
+    def read_bit(self, registeraddress: int, functioncode: int = 2) -> int:
+        return self.read_bits(registeraddress, 1, functioncode)[0]
+
+    def read_registers(self, registeraddress: int, number_of_registers: int, functioncode: int = 3) -> list:
+        if functioncode not in (3, 4):
+            raise ValueError(f"Código de función inválido para registros: {functioncode}")
+        bank = self._transaccion(2 * number_of_registers)
+        self._validar(registeraddress, number_of_registers, 125, bank.size)
+        return bank.read_registers(registeraddress, number_of_registers)
+
+    def read_register(self, registeraddress: int, number_of_decimals: int = 0, functioncode: int = 3,
+                      signed: bool = False):
+        valor = self.read_registers(registeraddress, 1, functioncode)[0]
+        if signed and valor >= 0x8000:
+            valor -= 0x10000
+        return valor / 10 ** number_of_decimals if number_of_decimals else valor
+
+    def write_register(self, registeraddress: int, value, number_of_decimals: int = 0, functioncode: int = 16,
+                       signed: bool = False) -> None:
+        if functioncode not in (6, 16):
+            raise ValueError(f"Código de función inválido para escritura: {functioncode}")
+        bank = self._transaccion(4)
+        self._validar(registeraddress, 1, 1, bank.size)
+        bank.set_register(registeraddress, int(round(value * 10 ** number_of_decimals)))
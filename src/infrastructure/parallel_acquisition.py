@@ -0,0 +1,170 @@
+"""
+Path: src/infrastructure/parallel_acquisition.py
+Adquisición en paralelo sobre todos los adaptadores serie detectados.
+Cada puerto se sondea en su propio hilo (la E/S serie libera el GIL) y las
+lecturas se fusionan en una única cola que se persiste desde un solo hilo,
+ya que la sesión de SQLAlchemy no es segura entre hilos.
+"""
+
+import os
+import queue
+import threading
+from src.domain.change_detection import DetectorCambios
+from src.infrastructure.db_operations import DatabaseUpdateError
+from src.infrastructure.modbus_bus_scheduler import ModbusBusScheduler
+from src.domain.modbus_register import ultima_lectura
+from src.modbus_processor import ModbusConnectionManager, ModbusProcessor, ModbusSession
+from src.utils.fixed_rate_scheduler import FixedRateScheduler, OMITIR
+
+
+def _clave_puerto(port: str) -> str:
+    """Ruta real del puerto (resuelve los enlaces de by-id); los nombres como COM3 quedan igual."""
+    return os.path.realpath(port) if os.path.isabs(port) else port
+
+
+class PortWorker(threading.Thread):
+    """Hilo que sondea un puerto serie y publica sus lecturas en la cola compartida."""
+    def __init__(self, port, read_plan, salida, log, periodo_s, stop_event, politica_overrun=OMITIR):
+        super().__init__(name=f"modbus-{port}", daemon=True)
+        self.port = port
+        self.read_plan = read_plan
+        self.salida = salida
+        self.logger = log
+        self.periodo_s = periodo_s
+        self.stop_event = stop_event
+        self.politica_overrun = politica_overrun
+        self.session = ModbusSession(log, ModbusConnectionManager(log, port=port))
+        self.scheduler = ModbusBusScheduler(self.session, read_plan, log, periodo_por_defecto_s=periodo_s)
+        self.ciclos = 0
+
+    def run(self):
+        self.logger.info(f"Iniciando adquisición en el puerto {self.port}")
+        # Plazos absolutos: la duración de la transacción no se acumula como deriva del período
+        ritmo = FixedRateScheduler(self.periodo_s, self.politica_overrun, sleep=self.stop_event.wait)
+        ritmo.iniciar()
+        try:
+            while not self.stop_event.is_set():
+                registros = self.scheduler.poll_once()
+                self.ciclos += 1
+                if registros:
+                    self.salida.put((self.port, registros))
+                ritmo.esperar()
+        finally:
+            self.session.cerrar_conexion()
+            self.logger.info(f"Adquisición finalizada en el puerto {self.port}")
+
+
+class ParallelAcquisition:
+    """
+    Lanza un PortWorker por cada puerto que coincide con las descripciones conocidas
+    y expone drain() para persistir, desde el hilo que la llama, todo lo adquirido.
+    planes_por_puerto asigna a cada adaptador su propio mapa de registros (REGISTER_MAP_BY_PORT);
+    los puertos sin mapa propio usan read_plan. No se inicia si dos puertos escribirían las
+    mismas filas de registros_modbus. Cada puerto tiene su propio detector de cambios y sus
+    muestras se guardan bajo (puerto, nombre), para no mezclar valores de distintos equipos.
+    Los puertos se comparan por su ruta real: el mapa configurado para /dev/ttyUSB0 se aplica
+    al puerto que el descubrimiento reporta como su enlace en /dev/serial/by-id.
+    """
+    def __init__(self, read_plan, log, ports=None, planes_por_puerto=None, periodo_s=1.0,
+                 detectar_cambios=True, sample_store=None, politica_overrun=OMITIR):
+        self.read_plan = read_plan
+        self.detectar_cambios = detectar_cambios
+        self.detectores = {}
+        self.logger = log
+        self.ports = ports
+        self.planes_por_puerto = {
+            _clave_puerto(port): plan for port, plan in (planes_por_puerto or {}).items()
+        }
+        self.periodo_s = periodo_s
+        self.politica_overrun = politica_overrun
+        self.cola = queue.Queue()
+        self.workers = []
+        self._stop_event = threading.Event()
+        self.registros_persistidos = 0
+        # wall_time de la lectura más reciente persistida, para fechar la transferencia
+        self.ultima_lectura = None
+        self.sample_store = sample_store
+
+    def start(self):
+        """Detecta los puertos (si no se indicaron) y lanza un hilo por puerto."""
+        ports = self.ports
+        if ports is None:
+            ports = ModbusConnectionManager(self.logger).detect_com_ports()
+        if not ports:
+            self.logger.error("No se detectaron puertos COM para la adquisición en paralelo.")
+        self._verificar_destinos(ports)
+        for port in ports:
+            plan = self.plan_de(port)
+            if self.detectar_cambios:
+                self.detectores[port] = DetectorCambios(plan.bandas, plan.refresco_forzado_s)
+            worker = PortWorker(
+                port, plan, self.cola, self.logger, self.periodo_s, self._stop_event, self.politica_overrun
+            )
+            worker.start()
+            self.workers.append(worker)
+        self.logger.info(f"Adquisición en paralelo iniciada en {len(self.workers)} puertos")
+
+    def plan_de(self, port):
+        """Retorna el plan de lectura del puerto (el propio, si se configuró, o read_plan)."""
+        return self.planes_por_puerto.get(_clave_puerto(port), self.read_plan)
+
+    def _verificar_destinos(self, ports):
+        """Falla si dos puertos escribirían la misma fila de registros_modbus (se pisarían los valores)."""
+        duenos = {}
+        for port in ports:
+            plan = self.plan_de(port)
+            for destino in plan.destinos.values():
+                otro = duenos.setdefault(destino, port)
+                if otro != port:
+                    raise RuntimeError(
+                        f"Los puertos {otro} y {port} escriben la misma fila de registros_modbus "
+                        f"(direccion_db {destino[1]}). Asigne un mapa de registros por puerto "
+                        f"con REGISTER_MAP_BY_PORT."
+                    )
+
+    def drain(self, repository) -> int:
+        """
+        Persiste todas las lecturas pendientes de todos los puertos.
+        Retorna la cantidad de registros escritos.
+        """
+        escritos = 0
+        while True:
+            try:
+                port, registros = self.cola.get_nowait()
+            except queue.Empty:
+                break
+            if self.sample_store is not None:
+                self.sample_store.registrar(registros, origen=port)
+            marca = ultima_lectura(registros)
+            if marca is not None and (self.ultima_lectura is None or marca > self.ultima_lectura):
+                self.ultima_lectura = marca
+            plan = self.plan_de(port)
+            try:
+                ModbusProcessor(None, repository, self.logger, plan, self.detectores.get(port)).persist(registros)
+                escritos += len(registros)
+            except DatabaseUpdateError as e:
+                self.logger.error(f"Error al persistir las lecturas del puerto {port}: {e}")
+        self.registros_persistidos += escritos
+        return escritos
+
+    def stop(self, timeout=5.0):
+        """Detiene los hilos de adquisición y espera a que cierren sus puertos."""
+        self._stop_event.set()
+        for worker in self.workers:
+            worker.join(timeout)
+        self.workers.clear()
+
+    def get_stats(self) -> dict:
+        """Retorna ciclos por puerto, estadísticas por esclavo y el tamaño de la cola."""
+        return {
+            "puertos": {
+                worker.port: {
+                    "ciclos": worker.ciclos,
+                    "esclavos": worker.scheduler.get_stats(),
+                    "cambios": self.detectores[worker.port].get_stats() if worker.port in self.detectores else None,
+                }
+                for worker in self.workers
+            },
+            "pendientes": self.cola.qsize(),
+            "registros_persistidos": self.registros_persistidos,
+        }
@@ -0,0 +1,88 @@
+"""
+Path: src/infrastructure/register_map_loader.py
+Carga el mapa de registros Modbus desde un archivo JSON y lo compila en un plan de lectura.
+"""
+
+import os
+import json
+from functools import lru_cache
+from dotenv import load_dotenv
+from src.domain.register_map import DefinicionRegistro, PlanLectura, compilar_plan
+from src.utils.logging.dependency_injection import get_logger
+
+load_dotenv()
+logger = get_logger()
+
+DEFAULT_REGISTER_MAP_PATH = os.path.join(os.path.dirname(__file__), 'register_map.json')
+
+
+def get_register_map_path() -> str:
+    """Retorna la ruta del mapa de registros (REGISTER_MAP_PATH o el mapa incluido)."""
+    return os.getenv('REGISTER_MAP_PATH') or DEFAULT_REGISTER_MAP_PATH
+
+
+def _leer_archivo(path: str) -> dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error al cargar el mapa de registros {path}: {e}")
+        raise
+
+
+def cargar_definiciones(path: str) -> list:
+    """Lee el archivo de mapa de registros y retorna sus definiciones."""
+    datos = _leer_archivo(path)
+    try:
+        return [DefinicionRegistro.desde_dict(entrada) for entrada in datos['registros']]
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"Error al cargar el mapa de registros {path}: {e}")
+        raise
+
+
+def cargar_periodos(path: str) -> dict:
+    """
+    Lee la sección opcional "dispositivos" del mapa y retorna {dirección de esclavo: período en segundos}.
+    """
+    datos = _leer_archivo(path)
+    try:
+        return {
+            int(entrada['direccion']): float(entrada['periodo_s'])
+            for entrada in datos.get('dispositivos', [])
+        }
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"Error al cargar los dispositivos del mapa de registros {path}: {e}")
+        raise
+
+
+@lru_cache(maxsize=None)
+def _compilar_desde_archivo(path: str) -> PlanLectura:
+    refresco = float(_leer_archivo(path).get('refresco_forzado_s', 60.0))
+    plan = compilar_plan(cargar_definiciones(path), cargar_periodos(path), refresco)
+    logger.info(
+        f"Mapa de registros compilado desde {path}: "
+        f"{sum(len(p.lecturas) for p in plan.pasos)} registros en {len(plan.pasos)} peticiones"
+    )
+    return plan
+
+
+def cargar_plan_lectura(path: str = None) -> PlanLectura:
+    """
+    Retorna el plan de lectura compilado. La compilación se hace una sola vez por archivo.
+    """
+    return _compilar_desde_archivo(path or get_register_map_path())
+
+
+def cargar_planes_por_puerto(configuracion: str = None) -> dict:
+    """
+    Retorna {puerto: plan de lectura} según REGISTER_MAP_BY_PORT, con el formato
+    "PUERTO=ruta_mapa.json;PUERTO=ruta_mapa.json" (un mapa de registros por adaptador serie).
+    """
+    configuracion = os.getenv('REGISTER_MAP_BY_PORT', '') if configuracion is None else configuracion
+    planes = {}
+    for entrada in filter(None, (parte.strip() for parte in configuracion.split(';'))):
+        puerto, separador, path = entrada.partition('=')
+        if not separador or not puerto.strip() or not path.strip():
+            raise ValueError(f"Entrada inválida en REGISTER_MAP_BY_PORT: {entrada!r} (formato PUERTO=ruta)")
+        planes[puerto.strip()] = cargar_plan_lectura(path.strip())
+    return planes
@@ -0,0 +1,137 @@
+"""
+Path: src/infrastructure/sample_ring_buffer.py
+Buffer circular en memoria de las últimas N muestras de cada registro.
+Los valores y marcas de tiempo se guardan en array (tipos C contiguos), sin un objeto
+Python por muestra; el último valor se consulta en O(1) y las ventanas en O(log N + k).
+"""
+
+import os
+import threading
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class RingBuffer:
+    """Últimas capacidad muestras de un registro: valor, monotonic_ns y wall_time."""
+    def __init__(self, capacidad: int):
+        if capacidad <= 0:
+            raise ValueError(f"La capacidad debe ser positiva: {capacidad}")
+        self.capacidad = capacidad
+        self.valores = array("d", bytes(8 * capacidad))
+        self.monotonic_ns = array("q", bytes(8 * capacidad))
+        self.wall_time = array("d", bytes(8 * capacidad))
+        self._siguiente = 0
+        self.cantidad = 0
+
+    def agregar(self, valor: float, monotonic_ns: int, wall_time: float) -> None:
+        i = self._siguiente
+        self.valores[i] = valor
+        self.monotonic_ns[i] = monotonic_ns
+        self.wall_time[i] = wall_time
+        self._siguiente = (i + 1) % self.capacidad
+        if self.cantidad < self.capacidad:
+            self.cantidad += 1
+
+    def _fisico(self, logico: int) -> int:
+        """Posición en los arrays de la muestra logico (0 = la más antigua)."""
+        return (self._siguiente - self.cantidad + logico) % self.capacidad
+
+    def ultimo(self) -> Optional[Tuple[float, int, float]]:
+        """Retorna (valor, monotonic_ns, wall_time) de la muestra más reciente."""
+        if not self.cantidad:
+            return None
+        i = (self._siguiente - 1) % self.capacidad
+        return self.valores[i], self.monotonic_ns[i], self.wall_time[i]
+
+    def _rango(self, desde: int, hasta: int, datos: array) -> array:
+        """Copia las muestras lógicas [desde, hasta) en orden cronológico (a lo sumo dos rebanadas)."""
+        if desde >= hasta:
+            return array(datos.typecode)
+        inicio = self._fisico(desde)
+        fin = inicio + (hasta - desde)
+        if fin <= self.capacidad:
+            return datos[inicio:fin]
+        return datos[inicio:] + datos[:fin - self.capacidad]
+
+    def ultimos(self, n: int) -> array:
+        """Retorna los valores de las últimas n muestras, de la más antigua a la más reciente."""
+        return self._rango(max(0, self.cantidad - n), self.cantidad, self.valores)
+
+    def desde(self, monotonic_ns: int) -> Tuple[array, array]:
+        """Retorna (valores, monotonic_ns) de las muestras tomadas en o después del instante indicado."""
+        bajo, alto = 0, self.cantidad
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self.monotonic_ns[self._fisico(medio)] < monotonic_ns:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return (
+            self._rango(bajo, self.cantidad, self.valores),
+            self._rango(bajo, self.cantidad, self.monotonic_ns),
+        )
+
+
+class SampleStore:
+    """
+    Un RingBuffer por registro (clave: nombre del registro, o (origen, nombre) si la muestra
+    se registró con un origen, como el puerto en la adquisición en paralelo). Se alimenta desde
+    la adquisición con registrar() y se consulta desde cualquier hilo.
+    """
+    def __init__(self, capacidad: int = 3600):
+        self.capacidad = capacidad
+        self._buffers: Dict[str, RingBuffer] = {}
+        self._lock = threading.Lock()
+        self.muestras = 0
+
+    @classmethod
+    def from_env(cls):
+        """Crea el almacén con SAMPLE_BUFFER_SIZE muestras por registro."""
+        return cls(capacidad=int(os.getenv("SAMPLE_BUFFER_SIZE", "3600")))
+
+    def registrar(self, registros: Iterable, origen: Optional[str] = None) -> None:
+        """
+        Agrega las muestras de una lista de ModbusRegister (las que no tienen marca de tiempo usan 0).
+        Con origen, las muestras se guardan bajo (origen, nombre) y no se mezclan con las de otro origen.
+        """
+        with self._lock:
+            for reg in registros:
+                clave = reg.description if origen is None else (origen, reg.description)
+                buffer = self._buffers.get(clave)
+                if buffer is None:
+                    buffer = self._buffers[clave] = RingBuffer(self.capacidad)
+                buffer.agregar(reg.value, reg.monotonic_ns or 0, reg.wall_time or 0.0)
+                self.muestras += 1
+
+    def ultimo(self, nombre: str) -> Optional[Tuple[float, int, float]]:
+        """Retorna (valor, monotonic_ns, wall_time) de la última muestra del registro, o None."""
+        with self._lock:
+            buffer = self._buffers.get(nombre)
+            return buffer.ultimo() if buffer is not None else None
+
+    def ultimos_valores(self) -> Dict[str, float]:
+        """Retorna {registro: último valor} de todos los registros con muestras."""
+        with self._lock:
+            return {nombre: buffer.ultimo()[0] for nombre, buffer in self._buffers.items() if buffer.cantidad}
+
+    def ultimos(self, nombre: str, n: int) -> array:
+        """Retorna los valores de las últimas n muestras del registro, en orden cronológico."""
+        with self._lock:
+            buffer = self._buffers.get(nombre)
+            return buffer.ultimos(n) if buffer is not None else array("d")
+
+    def desde(self, nombre: str, monotonic_ns: int) -> Tuple[array, array]:
+        """Retorna (valores, monotonic_ns) del registro desde el instante indicado."""
+        with self._lock:
+            buffer = self._buffers.get(nombre)
+            return buffer.desde(monotonic_ns) if buffer is not None else (array("d"), array("q"))
+
+    def get_stats(self) -> dict:
+        """Retorna la cantidad de registros, muestras recibidas y la memoria ocupada por los arrays."""
+        with self._lock:
+            return {
+                "registros": len(self._buffers),
+                "muestras": self.muestras,
+                "capacidad": self.capacidad,
+                "bytes": len(self._buffers) * self.capacidad * 24,
+            }
@@ -0,0 +1,121 @@
+"""
+Path: src/infrastructure/serial_discovery.py
+Descubrimiento de puertos serie con caché.
+El escaneo completo (serial.tools.list_ports.comports, que en Linux recorre sysfs)
+solo se repite tras invalidate() (errores de conexión) o cuando una verificación
+barata detecta que cambiaron los nodos de dispositivo. En Linux, el puerto se
+resuelve a su enlace estable en /dev/serial/by-id, que sobrevive a la
+renumeración de /dev/ttyUSB*.
+"""
+
+import os
+import time
+import serial.tools.list_ports  # pylint: disable=import-error
+
+BY_ID_DIR = "/dev/serial/by-id"
+
+
+class SerialPortDiscovery:
+    """
+    Caché de los puertos que coinciden con las descripciones indicadas, en orden de prioridad.
+    Si el último escaneo no encontró nada, se reintenta como mucho cada reintento_vacio_s
+    (donde no hay /dev/serial/by-id es la única forma de notar un dispositivo nuevo).
+    """
+    def __init__(self, log, descriptions, by_id_dir=BY_ID_DIR, list_ports=None, clock=time.perf_counter,
+                 reintento_vacio_s=5.0):
+        self.logger = log
+        self.reintento_vacio_s = reintento_vacio_s
+        self._escaneado_en = None
+        self.descriptions = tuple(descriptions)
+        self.by_id_dir = by_id_dir
+        self._list_ports = list_ports or serial.tools.list_ports.comports
+        self.clock = clock
+        self._ports = None
+        self._firma = None
+        self.stats = {
+            "escaneos": 0,
+            "aciertos_cache": 0,
+            "verificaciones": 0,
+            "primer_escaneo_s": None,
+            "ultimo_escaneo_s": None,
+            "verificacion_total_s": 0.0,
+        }
+
+    def _firma_dispositivos(self):
+        """Verificación barata: fecha de modificación del directorio by-id (None si no existe)."""
+        try:
+            return os.stat(self.by_id_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _resolver_by_id(self, ports):
+        """Reemplaza cada puerto por su enlace en by-id, si existe."""
+        try:
+            enlaces = {
+                os.path.realpath(os.path.join(self.by_id_dir, nombre)): os.path.join(self.by_id_dir, nombre)
+                for nombre in os.listdir(self.by_id_dir)
+            }
+        except OSError:
+            return ports
+        return [enlaces.get(os.path.realpath(port), port) for port in ports]
+
+    def _scan(self):
+        inicio = self.clock()
+        por_descripcion = {description: [] for description in self.descriptions}
+        for port, desc, _ in self._list_ports():
+            for description in self.descriptions:
+                if description in desc:
+                    por_descripcion[description].append(port)
+                    break
+        ports = [port for description in self.descriptions for port in por_descripcion[description]]
+        self._ports = self._resolver_by_id(ports)
+        self._firma = self._firma_dispositivos()
+        self._escaneado_en = inicio
+        duracion = self.clock() - inicio
+        self.stats["escaneos"] += 1
+        self.stats["ultimo_escaneo_s"] = duracion
+        if self.stats["primer_escaneo_s"] is None:
+            self.stats["primer_escaneo_s"] = duracion
+        self.logger.info(f"Puertos serie detectados: {self._ports} ({duracion * 1000:.1f} ms)")
+
+    def _cache_vigente(self) -> bool:
+        if self._ports is None:
+            return False
+        if not self._ports and self.clock() - self._escaneado_en >= self.reintento_vacio_s:
+            return False
+        if self._firma_dispositivos() != self._firma:
+            self.logger.info("Cambio en los dispositivos serie detectado, se vuelve a escanear")
+            return False
+        if os.name == "posix" and not all(os.path.exists(port) for port in self._ports):
+            return False
+        return True
+
+    def find_ports(self) -> list:
+        """Retorna todos los puertos que coinciden, escaneando solo si el caché no es válido."""
+        inicio = self.clock()
+        vigente = self._cache_vigente()
+        self.stats["verificacion_total_s"] += self.clock() - inicio
+        self.stats["verificaciones"] += 1
+        if vigente:
+            self.stats["aciertos_cache"] += 1
+        else:
+            self._scan()
+        return list(self._ports)
+
+    def find_port(self):
+        """Retorna el primer puerto que coincide (según la prioridad de descripciones) o None."""
+        ports = self.find_ports()
+        return ports[0] if ports else None
+
+    def invalidate(self):
+        """Descarta el caché; la próxima consulta vuelve a escanear."""
+        self._ports = None
+
+    def get_stats(self) -> dict:
+        """Retorna escaneos, aciertos de caché y el costo del escaneo inicial frente al régimen estable."""
+        stats = dict(self.stats)
+        verificaciones = stats["verificaciones"]
+        stats["verificacion_promedio_s"] = (
+            stats["verificacion_total_s"] / verificaciones if verificaciones else 0.0
+        )
+        return stats
@@ -0,0 +1,62 @@
+"""
+Path: src/infrastructure/statement_cache.py
+Caché LRU de sentencias SQL ya construidas (TextClause), indexada por el texto de la consulta.
+Las consultas del bucle principal se repiten cada ciclo: reutilizar la TextClause evita volver
+a analizar los parámetros ligados del texto, y como la misma instancia conserva su clave de
+caché, SQLAlchemy reutiliza la compilación guardada en el engine.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+
+class StatementCache:
+    """Asocia el texto de cada consulta con su TextClause; descarta la menos usada al llenarse."""
+    def __init__(self, capacidad: int = 128):
+        if capacidad <= 0:
+            raise ValueError(f"La capacidad debe ser positiva: {capacidad}")
+        self.capacidad = capacidad
+        self._sentencias = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"aciertos": 0, "fallos": 0, "descartes": 0}
+
+    @classmethod
+    def from_env(cls):
+        """Crea la caché con SQL_STATEMENT_CACHE_SIZE entradas."""
+        return cls(capacidad=int(os.getenv("SQL_STATEMENT_CACHE_SIZE", "128")))
+
+    def obtener(self, consulta: str) -> TextClause:
+        """Retorna la TextClause de la consulta, construyéndola solo la primera vez."""
+        with self._lock:
+            sentencia = self._sentencias.get(consulta)
+            if sentencia is not None:
+                self._sentencias.move_to_end(consulta)
+                self.stats["aciertos"] += 1
+                return sentencia
+            self.stats["fallos"] += 1
+            sentencia = self._sentencias[consulta] = text(consulta)
+            if len(self._sentencias) > self.capacidad:
+                self._sentencias.popitem(last=False)
+                self.stats["descartes"] += 1
+            return sentencia
+
+    def get_stats(self) -> dict:
+        """Retorna aciertos, fallos, descartes, tasa de aciertos y ocupación."""
+        with self._lock:
+            consultas = self.stats["aciertos"] + self.stats["fallos"]
+            return {
+                **self.stats,
+                "tasa_aciertos": self.stats["aciertos"] / consultas if consultas else 0.0,
+                "entradas": len(self._sentencias),
+                "capacidad": self.capacidad,
+            }
+
+
+@lru_cache(maxsize=None)
+def obtener_cache_sentencias() -> StatementCache:
+    """Retorna la caché de sentencias del proceso, compartida por todos los repositorios."""
+    return StatementCache.from_env()
@@ -0,0 +1,312 @@
+"""
+Path: src/infrastructure/store_and_forward.py
+Almacenamiento local con reenvío (store-and-forward) para cortes de la base de datos.
+Mientras MySQL no responde, las escrituras se guardan en un archivo SQLite local;
+al volver la conexión se reenvían en lote, en orden, con consultas idempotentes.
+Las entradas que el destino rechaza (error de la consulta, no de conexión) pasan a la tabla
+rechazados del mismo archivo, con el error, para revisarlas sin bloquear la cola.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from sqlalchemy import exc as sa_exc
+from src.application.interfaces import IDatabaseRepository
+from src.infrastructure.db_operations import DatabaseConnectionError
+
+DEFAULT_STORE_FORWARD_PATH = os.path.join("data", "store_forward.sqlite3")
+
+
+def es_corte_de_conexion(error: BaseException) -> bool:
+    """
+    Indica si el error (o alguna de sus causas) es una falta de conexión con la base de datos,
+    a diferencia de un error de la consulta, que no se resolvería reintentando.
+    """
+    while error is not None:
+        if isinstance(error, (DatabaseConnectionError, sa_exc.OperationalError,
+                              sa_exc.InterfaceError, sa_exc.DisconnectionError)):
+            return True
+        error = error.__cause__
+    return False
+
+
+class StoreAndForwardBuffer:
+    """
+    Cola persistente de escrituras pendientes. Las entradas con la misma clave se consolidan
+    (solo se conserva la última). El archivo se crea recién con la primera escritura.
+    También registra el corte en curso, compartido por todos los repositorios del proceso.
+    """
+    def __init__(self, path=DEFAULT_STORE_FORWARD_PATH, reintento_s=5.0, clock=time.monotonic):
+        self.path = path
+        self.reintento_s = reintento_s
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pendientes = 0
+        self._corte_hasta = 0.0
+        self.stats = {
+            "guardados": 0,
+            "reenviados": 0,
+            "rechazados": 0,
+            "cortes": 0,
+            "reenvio_total_s": 0.0,
+        }
+        if os.path.exists(path):
+            self._abrir()
+
+    def _abrir(self):
+        if self._conn is not None:
+            return self._conn
+        directorio = os.path.dirname(self.path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pendientes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                consulta TEXT NOT NULL,
+                parametros TEXT NOT NULL,
+                clave TEXT UNIQUE,
+                creado REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rechazados (
+                id INTEGER PRIMARY KEY,
+                consulta TEXT NOT NULL,
+                parametros TEXT NOT NULL,
+                error TEXT NOT NULL,
+                creado REAL NOT NULL,
+                rechazado REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._pendientes = self._conn.execute("SELECT COUNT(*) FROM pendientes").fetchone()[0]
+        return self._conn
+
+    def pendientes(self) -> int:
+        """Cantidad de escrituras a la espera de reenvío."""
+        return self._pendientes
+
+    def rechazados(self) -> list:
+        """Retorna las entradas rechazadas por el destino como (consulta, parametros, error)."""
+        with self._lock:
+            if self._conn is None:
+                return []
+            filas = self._conn.execute("SELECT consulta, parametros, error FROM rechazados ORDER BY id").fetchall()
+        return [(consulta, json.loads(parametros), error) for consulta, parametros, error in filas]
+
+    def registrar_corte(self) -> None:
+        """Marca la base de datos como fuera de línea durante reintento_s segundos."""
+        if not self.en_corte():
+            self.stats["cortes"] += 1
+        self._corte_hasta = self.clock() + self.reintento_s
+
+    def en_corte(self) -> bool:
+        return self.clock() < self._corte_hasta
+
+    def guardar(self, consulta: str, lista_parametros: list, claves: list = None) -> None:
+        """
+        Guarda escrituras pendientes. claves indica, por cada juego de parámetros, una clave
+        de consolidación (o None): la entrada anterior con la misma clave se reemplaza.
+        """
+        with self._lock:
+            conn = self._abrir()
+            ahora = time.time()
+            for parametros, clave in zip(lista_parametros, claves or [None] * len(lista_parametros)):
+                if clave is not None:
+                    # La entrada consolidada pasa al final: respeta el orden respecto de las demás
+                    conn.execute("DELETE FROM pendientes WHERE clave = ?", (clave,))
+                conn.execute(
+                    "INSERT INTO pendientes (consulta, parametros, clave, creado) VALUES (?, ?, ?, ?)",
+                    (consulta, json.dumps(parametros), clave, ahora),
+                )
+            conn.commit()
+            self._pendientes = conn.execute("SELECT COUNT(*) FROM pendientes").fetchone()[0]
+            self.stats["guardados"] += len(lista_parametros)
+
+    def reenviar(self, repository, lote: int = 500) -> int:
+        """
+        Reenvía hasta lote entradas, en orden, agrupando las consecutivas con la misma consulta
+        en un único insertar_lote. Cada grupo se elimina del archivo solo tras confirmarse en el
+        destino, por lo que las consultas deben ser idempotentes (un grupo puede reenviarse dos veces).
+        Un corte de conexión se propaga. Si el grupo falla por un error de la consulta, se reintenta
+        fila por fila y solo las filas que vuelven a fallar pasan a rechazados.
+        Retorna la cantidad de entradas reenviadas.
+        """
+        with self._lock:
+            if self._conn is None:
+                return 0
+            filas = self._conn.execute(
+                "SELECT id, consulta, parametros, creado FROM pendientes ORDER BY id LIMIT ?", (lote,)
+            ).fetchall()
+            inicio = self.clock()
+            reenviados = 0
+            grupos = []
+            for fila in filas:
+                if grupos and grupos[-1][0][1] == fila[1]:
+                    grupos[-1].append(fila)
+                else:
+                    grupos.append([fila])
+            try:
+                for grupo in grupos:
+                    try:
+                        repository.insertar_lote(grupo[0][1], [json.loads(fila[2]) for fila in grupo])
+                    except Exception as e:
+                        if es_corte_de_conexion(e):
+                            raise
+                        reenviados += self._reenviar_por_fila(repository, grupo)
+                        continue
+                    reenviados += len(grupo)
+                    self._conn.executemany("DELETE FROM pendientes WHERE id = ?", [(fila[0],) for fila in grupo])
+                    self._conn.commit()
+            finally:
+                self._pendientes = self._conn.execute("SELECT COUNT(*) FROM pendientes").fetchone()[0]
+                self.stats["reenviados"] += reenviados
+                self.stats["reenvio_total_s"] += self.clock() - inicio
+            return reenviados
+
+    def _reenviar_por_fila(self, repository, grupo) -> int:
+        """Reenvía cada fila del grupo por separado; las que fallan pasan a rechazados."""
+        reenviados = 0
+        for id_, consulta, parametros, creado in grupo:
+            try:
+                repository.insertar_lote(consulta, [json.loads(parametros)])
+                reenviados += 1
+            except Exception as e:
+                if es_corte_de_conexion(e):
+                    raise
+                self._conn.execute(
+                    "INSERT INTO rechazados (id, consulta, parametros, error, creado, rechazado) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (id_, consulta, parametros, str(e), creado, time.time()),
+                )
+                self.stats["rechazados"] += 1
+            self._conn.execute("DELETE FROM pendientes WHERE id = ?", (id_,))
+            self._conn.commit()
+        return reenviados
+
+    def get_stats(self) -> dict:
+        """Retorna el backlog, los contadores y la tasa de drenaje (entradas por segundo de reenvío)."""
+        stats = dict(self.stats)
+        stats["pendientes"] = self._pendientes
+        stats["en_corte"] = self.en_corte()
+        stats["tasa_drenaje_por_s"] = (
+            stats["reenviados"] / stats["reenvio_total_s"] if stats["reenvio_total_s"] else 0.0
+        )
+        return stats
+
+
+@lru_cache(maxsize=None)
+def obtener_buffer(path: str = None) -> StoreAndForwardBuffer:
+    """Retorna el buffer del proceso para la ruta indicada (por defecto, STORE_FORWARD_PATH)."""
+    return StoreAndForwardBuffer(path or os.getenv("STORE_FORWARD_PATH", DEFAULT_STORE_FORWARD_PATH))
+
+
+class StoreAndForwardRepository(IDatabaseRepository):
+    """
+    Decorador de IDatabaseRepository que no pierde escrituras durante un corte:
+      - si la escritura falla por falta de conexión, se guarda en el buffer local;
+      - durante reintento_s segundos tras un corte no se intenta la red (la escritura va directo
+        al buffer y las lecturas fallan de inmediato con DatabaseConnectionError);
+      - antes de cada escritura con la base disponible se reenvía el backlog, y si queda backlog
+        la escritura nueva se encola detrás para conservar el orden.
+    Las actualizaciones con parámetro 'direccion' (registros_modbus) se consolidan por dirección:
+    el destino guarda el último valor, así que solo hace falta reenviar el más reciente.
+    """
+    def __init__(self, repository, buffer: StoreAndForwardBuffer, log, lote_reenvio: int = 500):
+        self.repository = repository
+        self.buffer = buffer
+        self.logger = log
+        self.lote_reenvio = lote_reenvio
+
+    def __getattr__(self, nombre):
+        # Métodos propios del repositorio concreto (obtener_engine, raw_connection, ...)
+        return getattr(self.repository, nombre)
+
+    def _corte(self, error):
+        if not self.buffer.en_corte():
+            self.logger.error(f"Base de datos fuera de línea, se guardan las escrituras localmente: {error}")
+        self.buffer.registrar_corte()
+
+    def reenviar_pendientes(self) -> int:
+        """Reenvía el backlog si la base no está en corte. Retorna la cantidad reenviada."""
+        if not self.buffer.pendientes() or self.buffer.en_corte():
+            return 0
+        reenviados = 0
+        try:
+            while self.buffer.pendientes():
+                enviados = self.buffer.reenviar(self.repository, self.lote_reenvio)
+                reenviados += enviados
+                if not enviados and self.buffer.pendientes():
+                    break
+        except Exception as e:
+            if not es_corte_de_conexion(e):
+                raise
+            self._corte(e)
+        if reenviados:
+            self.logger.info(
+                f"Reenviadas {reenviados} escrituras pendientes; quedan {self.buffer.pendientes()}"
+            )
+        return reenviados
+
+    @staticmethod
+    def _claves(consulta, lista_parametros):
+        return [f"{consulta}|{p['direccion']}" if "direccion" in p else None for p in lista_parametros]
+
+    def _escribir(self, escribir, consulta, lista_parametros, claves=None):
+        self.reenviar_pendientes()
+        if not (self.buffer.en_corte() or self.buffer.pendientes()):
+            try:
+                return escribir()
+            except Exception as e:
+                if not es_corte_de_conexion(e):
+                    raise
+                self._corte(e)
+        self.buffer.guardar(consulta, lista_parametros, claves)
+
+    def ejecutar_consulta(self, consulta, parametros):
+        if self.buffer.en_corte():
+            raise DatabaseConnectionError("Base de datos fuera de línea")
+        try:
+            return self.repository.ejecutar_consulta(consulta, parametros)
+        except Exception as e:
+            if es_corte_de_conexion(e):
+                self._corte(e)
+            raise
+
+    def actualizar_registro(self, consulta, parametros):
+        return self._escribir(
+            lambda: self.repository.actualizar_registro(consulta, parametros),
+            consulta, [parametros], self._claves(consulta, [parametros]),
+        )
+
+    def actualizar_lote(self, consulta, lista_parametros):
+        lista_parametros = list(lista_parametros)
+        self._escribir(
+            lambda: self.repository.actualizar_lote(consulta, lista_parametros),
+            consulta, lista_parametros, self._claves(consulta, lista_parametros),
+        )
+
+    def insertar_lote(self, consulta, lista_parametros):
+        return self._escribir(
+            lambda: self.repository.insertar_lote(consulta, lista_parametros), consulta, list(lista_parametros)
+        )
+
+    def commit(self):
+        if not self.buffer.en_corte():
+            self.repository.commit()
+
+    def rollback(self):
+        self.repository.rollback()
+
+    def cerrar_conexion(self):
+        self.repository.cerrar_conexion()
@@ -9,7 +9,7 @@ import platform
 from src.utils.logging.logger_configurator import set_debug_verbose
 from src.utils.logging.dependency_injection import get_logger
 from src.utils.logging.error_manager import init_error_manager, critical_error
-from src.infrastructure.factories import create_repository
+from src.infrastructure.factories import create_repository, ensure_schema
 from src.app_controller import AppController
 
 class MainApplication:
@@ -26,7 +26,15 @@ class MainApplication:
             self.controller = controller
         else:
             repo = create_repository()
-            self.controller = AppController(repository=repo)
+            # --parallel: un hilo de adquisición por cada adaptador serie detectado
+            # --async: motor asyncio con lectura, escritura y transferencia solapadas
+            # --pipeline: hilo de adquisición e hilo escritor unidos por una cola acotada
+            self.controller = AppController(
+                repository=repo,
+                parallel="--parallel" in sys.argv,
+                async_mode="--async" in sys.argv,
+                pipeline="--pipeline" in sys.argv,
+            )
 
     def initialize(self):
         """Realiza la configuración inicial de la aplicación."""
@@ -41,10 +49,29 @@ class MainApplication:
         init_error_manager(self.logger)
         self.logger.info("Gestor de errores inicializado")
 
+        # Índices de los que dependen las transferencias; sin base de datos se reintenta al reiniciar
+        try:
+            ensure_schema(self.logger)
+        except Exception as e:
+            self.logger.warning(f"No se pudo verificar el esquema de la base de datos: {e}")
+
+    def probe_link(self):
+        """Mide los tiempos de respuesta del enlace serie y sugiere baudios y timeout."""
+        from src.infrastructure.factories import create_modbus_connection_manager
+        from src.infrastructure.modbus_link_probe import sondear_enlace, formatear_resultados
+        from src.infrastructure.register_map_loader import cargar_plan_lectura
+        instrument = create_modbus_connection_manager(self.logger).establish_connection()
+        if getattr(instrument, "serial", None) is None:
+            raise RuntimeError("El sondeo del enlace solo está disponible para conexiones serie.")
+        print(formatear_resultados(sondear_enlace(instrument, cargar_plan_lectura(), self.logger)))
+
     def run(self):
         """Ejecuta el ciclo principal de la aplicación y gestiona el flujo de ejecución."""
         try:
             self.initialize()
+            if "--probe-link" in sys.argv:
+                self.probe_link()
+                sys.exit(0)
             self.controller.run()
             self.logger.info("Aplicación finalizada correctamente")
             sys.exit(0)
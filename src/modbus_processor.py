@@ -3,10 +3,20 @@ Path: src/core/modbus_processor.py
 Este módulo se encarga de procesar las operaciones Modbus siguiendo principios SOLID y POO.
 """
 
+import os
+import time
+from dataclasses import dataclass
 import minimalmodbus  # pylint: disable=import-error
-import serial.tools.list_ports  # pylint: disable=import-error
+import serial  # pylint: disable=import-error
 from src.infrastructure.db_operations import DatabaseUpdateError
-from src.application.interfaces import IDatabaseRepository
+from src.application.interfaces import IDatabaseRepository, IModbusConnectionManager
+from src.domain.modbus_read_plan import FUNCIONES_BITS
+from src.domain.register_map import PlanLectura
+from src.domain.change_detection import DetectorCambios
+from src.infrastructure.register_map_loader import cargar_plan_lectura
+from src.infrastructure.serial_discovery import SerialPortDiscovery
+from src.infrastructure.modbus_metrics import ModbusTransactionMetrics
+from src.utils.circuit_breaker import CircuitBreaker
 from src.utils.logging.dependency_injection import get_logger
 
 logger = get_logger()
@@ -20,73 +30,161 @@ class ModbusReadError(Exception):
     """Excepción para errores de lectura del dispositivo Modbus."""
     pass
 
-class ModbusConnectionManager:
+@dataclass
+class SerialSettings:
+    """
+    Parámetros del puerto serie. Los valores por defecto son los de minimalmodbus.
+    """
+    baudrate: int = 19200
+    parity: str = serial.PARITY_NONE
+    bytesize: int = 8
+    stopbits: int = 1
+    timeout: float = 0.05
+
+    @classmethod
+    def from_env(cls) -> "SerialSettings":
+        """Lee MODBUS_BAUDRATE, MODBUS_PARITY, MODBUS_BYTESIZE, MODBUS_STOPBITS y MODBUS_TIMEOUT."""
+        defaults = cls()
+        return cls(
+            baudrate=int(os.getenv('MODBUS_BAUDRATE', defaults.baudrate)),
+            parity=os.getenv('MODBUS_PARITY', defaults.parity),
+            bytesize=int(os.getenv('MODBUS_BYTESIZE', defaults.bytesize)),
+            stopbits=int(os.getenv('MODBUS_STOPBITS', defaults.stopbits)),
+            timeout=float(os.getenv('MODBUS_TIMEOUT', defaults.timeout)),
+        )
+
+    def aplicar(self, instrument):
+        """Aplica los parámetros al puerto serie del instrumento."""
+        port = instrument.serial
+        port.baudrate = self.baudrate
+        port.parity = self.parity
+        port.bytesize = self.bytesize
+        port.stopbits = self.stopbits
+        port.timeout = self.timeout
+
+
+class ModbusConnectionManager(IModbusConnectionManager):
     """
     Encapsula la lógica para detectar y establecer una conexión Modbus.
+    Si se indica port, se conecta a ese puerto sin escanear.
     """
-    def __init__(self, log, device_address=1):
+    DEVICE_DESCRIPTIONS = ("DigiRail Connect", "USB-SERIAL CH340")
+
+    def __init__(self, log, device_address=1, port=None, discovery=None, serial_settings=None):
         self.logger = log
         self.device_address = device_address
+        self.port = port
+        self.serial_settings = serial_settings or SerialSettings.from_env()
+        self.discovery = discovery or SerialPortDiscovery(log, self.DEVICE_DESCRIPTIONS)
 
-    def detect_com_port(self, device_description: str):
+    def detect_com_ports(self):
         """
-        Busca y retorna el puerto serie que coincide con la descripción del dispositivo.
+        Retorna todos los puertos serie que coinciden con alguna de las descripciones
+        conocidas, en un único escaneo (cacheado por SerialPortDiscovery).
         """
-        available_ports = list(serial.tools.list_ports.comports())
-        for port, desc, _ in available_ports:
-            if device_description in desc:
-                return port
-        return None
+        return self.discovery.find_ports()
+
+    def detectar_dispositivos(self) -> list:
+        return self.detect_com_ports()
+
+    def abrir_conexion(self, direccion: str):
+        return self._open_instrument(direccion)
+
+    def cerrar_conexion(self, conexion) -> None:
+        if conexion.serial is not None and conexion.serial.is_open:
+            conexion.serial.close()
 
     def establish_connection(self):
         """
         Inicializa y establece la conexión Modbus.
         Retorna un objeto minimalmodbus.Instrument.
         """
-        # Intentar detectar el dispositivo "DigiRail Connect"
-        device_description = "DigiRail Connect"
-        com_port = self.detect_com_port(device_description)
-        if com_port:
-            self.logger.info(f"Puerto {device_description} detectado: {com_port}")
-        else:
-            # Intentar con "USB-SERIAL CH340"
-            device_description = "USB-SERIAL CH340"
-            com_port = self.detect_com_port(device_description)
-            if com_port:
-                self.logger.info(f"Puerto detectado: {com_port}")
-            else:
-                error_msg = "No se detectaron puertos COM para el dispositivo."
-                self.logger.error(error_msg)
-                raise ModbusConnectionError(error_msg)
+        if self.port is not None:
+            return self._open_instrument(self.port)
+        # Un solo escaneo (cacheado) busca "DigiRail Connect" y luego "USB-SERIAL CH340"
+        com_port = self.discovery.find_port()
+        if com_port is None:
+            error_msg = "No se detectaron puertos COM para el dispositivo."
+            self.logger.error(error_msg)
+            raise ModbusConnectionError(error_msg)
+        self.logger.info(f"Puerto detectado: {com_port}")
+        try:
+            return self._open_instrument(com_port)
+        except ModbusConnectionError:
+            self.discovery.invalidate()
+            raise
+
+    def invalidate_discovery(self):
+        """
+        Descarta el puerto cacheado para que la próxima conexión vuelva a escanear.
+        """
+        self.discovery.invalidate()
 
+    def _open_instrument(self, com_port):
         try:
             instrument = minimalmodbus.Instrument(com_port, self.device_address)
+            self.serial_settings.aplicar(instrument)
             self.logger.info(
-                f"Conexión Modbus establecida en puerto {com_port}, dirección {self.device_address}"
+                f"Conexión Modbus establecida en puerto {com_port}, dirección {self.device_address}, "
+                f"{self.serial_settings.baudrate} baudios, timeout {self.serial_settings.timeout} s"
             )
             return instrument
-        except minimalmodbus.ModbusException as e:
+        except (minimalmodbus.ModbusException, serial.SerialException) as e:
             error_msg = f"Error al configurar el puerto serie: {e}"
             self.logger.error(error_msg)
             raise ModbusConnectionError(error_msg) from e
 
+
+# Métodos de minimalmodbus que leen un bloque (start, count): sus métricas se atribuyen a cada dirección
+LECTURAS_EN_BLOQUE = ("read_registers", "read_bits")
+
+
 class ModbusDevice:
     """
     Envuelve el objeto minimalmodbus.Instrument y provee métodos seguros para leer datos.
     """
-    def __init__(self, instrument, device_logger):
+    def __init__(self, instrument, device_logger, metrics: ModbusTransactionMetrics = None):
         self.instrument = instrument
         self.logger = device_logger
+        self.metrics = metrics
+        # Se activa ante un fallo del puerto serie (no ante errores de protocolo),
+        # para que la sesión sepa que debe reconectar.
+        self.connection_lost = False
 
     def safe_read(self, method, *args, **kwargs):
         """
         Realiza una lectura segura usando el método proporcionado.
+        Si hay métricas configuradas, registra la latencia y el tipo de error de la transacción.
         """
+        inicio = time.perf_counter()
+        error = None
         try:
             return method(*args, **kwargs)
-        except (serial.SerialException, IOError, ValueError, minimalmodbus.ModbusException) as e:
+        except minimalmodbus.ModbusException as e:
+            error = e
             self.logger.error(f"Error al leer del dispositivo Modbus: {e}")
             return None
+        except (serial.SerialException, IOError) as e:
+            error = e
+            self.connection_lost = True
+            self.logger.error(f"Error de puerto serie al leer del dispositivo Modbus: {e}")
+            return None
+        except ValueError as e:
+            error = e
+            self.logger.error(f"Error al leer del dispositivo Modbus: {e}")
+            return None
+        finally:
+            if self.metrics is not None:
+                self.metrics.registrar(
+                    method.__name__, args[0] if args else None, time.perf_counter() - inicio, error,
+                    cantidad=args[1] if method.__name__ in LECTURAS_EN_BLOQUE else 1,
+                )
+
+    def select_slave(self, slave_address: int):
+        """
+        Dirige las próximas peticiones al esclavo indicado, reutilizando el mismo puerto serie.
+        """
+        self.instrument.address = slave_address
 
     def read_digital_input(self, address: int):
         """
@@ -100,106 +198,358 @@ class ModbusDevice:
         """
         return self.safe_read(self.instrument.read_register, register, functioncode=functioncode)
 
+    def read_digital_inputs(self, start: int, count: int, functioncode: int = 2):
+        """
+        Lee un bloque de entradas digitales contiguas en una sola petición.
+        """
+        return self.safe_read(self.instrument.read_bits, start, count, functioncode=functioncode)
+
+    def read_registers(self, start: int, count: int, functioncode: int = 3):
+        """
+        Lee un bloque de registros contiguos en una sola petición.
+        """
+        return self.safe_read(self.instrument.read_registers, start, count, functioncode=functioncode)
+
+    def write_register(self, register: int, value: int, functioncode: int = 6):
+        """
+        Escribe un registro. A diferencia de las lecturas, los errores se propagan.
+        """
+        self.instrument.write_register(register, value, functioncode=functioncode)
+
+    def cerrar_conexion(self):
+        """
+        Cierra el puerto serie (o el socket, en Modbus TCP) subyacente, si está abierto.
+        """
+        port = getattr(self.instrument, "serial", None)
+        if port is not None and getattr(port, "is_open", False):
+            port.close()
+            self.logger.info("Puerto serie Modbus cerrado")
+        elif hasattr(self.instrument, "close"):
+            self.instrument.close()
+            self.logger.info("Conexión Modbus cerrada")
+
+
+class ModbusSession:
+    """
+    Sesión Modbus de larga duración.
+    Detecta el puerto y abre el instrumento una sola vez, y lo reutiliza entre
+    iteraciones del bucle principal. Solo reconecta tras un fallo real del
+    puerto serie (ver ModbusDevice.connection_lost) o tras invalidate().
+    """
+    def __init__(self, log, connection_manager=None):
+        self.logger = log
+        self.connection_manager = connection_manager or ModbusConnectionManager(log)
+        self.device = None
+        self._needs_reconnect = False
+        self.metrics = ModbusTransactionMetrics()
+        self.stats = {
+            "conexiones": 0,
+            "reconexiones": 0,
+            "escaneos_evitados": 0,
+        }
+
+    def get_device(self):
+        """
+        Retorna el ModbusDevice de la sesión, conectando solo si es necesario.
+        Lanza ModbusConnectionError si no se puede establecer la conexión.
+        """
+        if self.device is not None and not self.device.connection_lost:
+            self.stats["escaneos_evitados"] += 1
+            return self.device
+        if self.device is not None:
+            self.invalidate()
+        instrument = self.connection_manager.establish_connection()
+        self.device = ModbusDevice(instrument, self.logger, self.metrics)
+        self.stats["conexiones"] += 1
+        if self._needs_reconnect:
+            self.stats["reconexiones"] += 1
+            self._needs_reconnect = False
+            self.logger.info("Sesión Modbus reconectada")
+        return self.device
+
+    def invalidate(self):
+        """
+        Descarta el dispositivo actual; la próxima llamada a get_device reconecta.
+        """
+        if self.device is None:
+            return
+        try:
+            self.device.cerrar_conexion()
+        except (serial.SerialException, OSError) as e:
+            self.logger.error(f"Error al cerrar el puerto serie: {e}")
+        self.device = None
+        self._needs_reconnect = True
+        # Tras un error de conexión, el puerto cacheado puede haber cambiado
+        invalidate_discovery = getattr(self.connection_manager, "invalidate_discovery", None)
+        if invalidate_discovery is not None:
+            invalidate_discovery()
+
+    def get_stats(self) -> dict:
+        """
+        Retorna las métricas de la sesión (conexiones, reconexiones y escaneos evitados),
+        junto con las del descubrimiento de puertos si el gestor lo expone.
+        """
+        stats = dict(self.stats)
+        stats["transacciones"] = self.metrics.totales()
+        discovery = getattr(self.connection_manager, "discovery", None)
+        if discovery is not None:
+            stats["descubrimiento"] = discovery.get_stats()
+        return stats
+
+    def cerrar_conexion(self):
+        """
+        Cierra la sesión y reporta sus métricas.
+        """
+        if self.device is not None:
+            self.device.cerrar_conexion()
+            self.device = None
+        self.logger.info(f"Sesión Modbus finalizada: {self.get_stats()}")
+
+
+def leer_bloque(device, bloque):
+    """
+    Lee un bloque en una sola petición. Si el dispositivo no admite lecturas
+    en bloque, lee dirección por dirección.
+    """
+    if bloque.functioncode in FUNCIONES_BITS:
+        read_block = getattr(device, "read_digital_inputs", None)
+        if read_block is None:
+            return _leer_cada_direccion(bloque, device.read_digital_input)
+    else:
+        read_block = getattr(device, "read_registers", None)
+        if read_block is None:
+            return _leer_cada_direccion(
+                bloque, lambda address: device.read_register(address, bloque.functioncode)
+            )
+    return read_block(bloque.start, bloque.count, functioncode=bloque.functioncode)
+
+
+def _leer_cada_direccion(bloque, read_function):
+    valores = []
+    for address in bloque.addresses:
+        value = read_function(address)
+        if value is None:
+            return None
+        valores.append(value)
+    return valores
+
+
+def validar_bloque(paso, valores):
+    """
+    Lanza ModbusReadError si la lectura del paso falló o no trajo todas sus direcciones.
+    """
+    if valores is None or len(valores) != paso.bloque.count:
+        raise ModbusReadError(
+            f"Error al leer {paso.bloque.count} direcciones desde {paso.bloque.start} "
+            f"(función {paso.bloque.functioncode}, dispositivo {paso.dispositivo})"
+        )
+
 
 class ModbusProcessor:
     """
     Procesa las operaciones Modbus, actualizando la base de datos.
+    Las direcciones a leer provienen de un PlanLectura compilado a partir del
+    mapa de registros (ver src/infrastructure/register_map.json).
     """
-    # Constantes definidas para las direcciones y registros
-    D1 = 70
-    D2 = 71
-    HR_COUNTER1_LO = 22
-    HR_COUNTER1_HI = 23
-    HR_COUNTER2_LO = 24
-    HR_COUNTER2_HI = 25
-
-    def __init__(self, modbus_device, repository, modbus_logger):
+    def __init__(self, modbus_device, repository, modbus_logger, read_plan: PlanLectura = None,
+                 change_detector: DetectorCambios = None):
         """
         modbus_device: IModbusDevice
         repository: IDatabaseRepository
         modbus_logger: Logger
+        read_plan: PlanLectura (por defecto, el mapa de registros configurado)
+        change_detector: DetectorCambios opcional; si se indica, solo se escriben los cambios
         """
         self.device = modbus_device
         self.repository = repository
         self.logger = modbus_logger
+        self.read_plan = read_plan or cargar_plan_lectura()
+        self.change_detector = change_detector
 
-    def process(self):
+    def process(self) -> list:
         """
-        Procesa todas las operaciones Modbus.
+        Procesa todas las operaciones Modbus. Retorna los ModbusRegister leídos.
         """
-        self.process_digital_inputs()
-        self.process_high_resolution_registers()
+        registros = self.acquire()
+        self.persist(registros)
+        return registros
 
     def process_digital_inputs(self):
         """
         Procesa las entradas digitales y actualiza la base de datos.
         """
-        from src.domain.modbus_processing_service import procesar_entrada_digital
-        for address, description in [
-            (self.D1, "HR_INPUT1_STATE"),
-            (self.D2, "HR_INPUT2_STATE")
-        ]:
-            reg = procesar_entrada_digital(address, description, self.device.read_digital_input)
-            self._update_database(reg.address, reg.value, reg.description)
+        self.persist(self.acquire(self.read_plan.filtrar(funciones=FUNCIONES_BITS)))
 
     def process_high_resolution_registers(self):
         """
         Procesa los registros de alta resolución y actualiza la base de datos.
         """
-        from src.domain.modbus_processing_service import procesar_registro_alta_resolucion
-        for register, description in [
-            (self.HR_COUNTER1_LO, "HR_COUNTER1_LO"),
-            (self.HR_COUNTER1_HI, "HR_COUNTER1_HI"),
-            (self.HR_COUNTER2_LO, "HR_COUNTER2_LO"),
-            (self.HR_COUNTER2_HI, "HR_COUNTER2_HI")
-        ]:
-            reg = procesar_registro_alta_resolucion(register, description, self.device.read_register)
-            self._update_database(reg.address, reg.value, reg.description)
+        self.persist(self.acquire(self.read_plan.filtrar(funciones=(3, 4))))
+
+    def acquire(self, plan: PlanLectura = None) -> list:
+        """
+        Ejecuta las peticiones del plan y retorna los ModbusRegister leídos,
+        marcados con el instante en que llegó la respuesta de su bloque.
+        """
+        from src.domain.modbus_processing_service import procesar_paso
+        select_slave = getattr(self.device, "select_slave", None)
+        registros = []
+        for paso in (plan or self.read_plan).pasos:
+            if select_slave is not None:
+                select_slave(paso.dispositivo)
+            valores = leer_bloque(self.device, paso.bloque)
+            validar_bloque(paso, valores)
+            registros.extend(procesar_paso(paso, valores, time.monotonic_ns(), time.time()))
+        return registros
+
+    def persist(self, registros: list):
+        """
+        Actualiza en la base de datos los registros leídos. Con un DetectorCambios,
+        se omiten los que no superan su banda muerta.
+        """
+        destinos = self.read_plan.destinos
+        detector = self.change_detector
+        if detector is not None:
+            registros = detector.filtrar(registros)
+        actualizar_lote = getattr(self.repository, "actualizar_lote", None)
+        if actualizar_lote is None:
+            for reg in registros:
+                consulta, direccion_db = destinos[reg.description]
+                self._update_database(consulta, direccion_db, reg)
+                if detector is not None:
+                    detector.confirmar(reg)
+            return
+        # Un lote por consulta (columna destino): una transacción y un commit por ciclo
+        por_consulta = {}
+        for reg in registros:
+            consulta, direccion_db = destinos[reg.description]
+            por_consulta.setdefault(consulta, []).append((reg, direccion_db))
+        for consulta, grupo in por_consulta.items():
+            self._update_batch(actualizar_lote, consulta, grupo)
+            if detector is not None:
+                for reg, _ in grupo:
+                    detector.confirmar(reg)
 
-    # _process_input y _process_register eliminados: la lógica de dominio se delega al servicio en models/
+    def _update_batch(self, actualizar_lote, consulta: str, grupo: list):
+        """
+        Actualiza en una sola operación los registros del grupo [(ModbusRegister, direccion_db)].
+        """
+        try:
+            actualizar_lote(consulta, [{'valor': reg.value, 'direccion': direccion_db} for reg, direccion_db in grupo])
+            self.logger.info(
+                f"{len(grupo)} registros actualizados en lote: "
+                + ", ".join(f"{reg.description}={reg.value}" for reg, _ in grupo)
+            )
+        except Exception as e:
+            self.logger.error(f"Error al actualizar el lote de {len(grupo)} registros: {e}")
+            raise DatabaseUpdateError(f"Error al actualizar la base de datos: {e}") from e
 
-    def _update_database(self, address: int, value, description: str):
+    def _update_database(self, consulta: str, direccion_db: int, reg):
         """
         Actualiza el registro correspondiente en la base de datos.
         """
-        query, params = self._build_update_query(address, value)
         try:
-            self.repository.actualizar_registro(query, params)
+            self.repository.actualizar_registro(consulta, {'valor': reg.value, 'direccion': direccion_db})
             self.logger.info(
-                f"Registro actualizado: dirección {address}, "
-                f"descripción: {description}, valor {value}"
+                f"Registro actualizado: dirección {reg.address}, "
+                f"descripción: {reg.description}, valor {reg.value}"
             )
         except Exception as e:
             self.logger.error(
-                f"Error al actualizar el registro: dirección {address}, {description}: {e}"
+                f"Error al actualizar el registro: dirección {reg.address}, {reg.description}: {e}"
             )
             raise DatabaseUpdateError(f"Error al actualizar la base de datos: {e}") from e
 
-    def _build_update_query(self, address: int, value):
-        """
-        Construye la consulta SQL para actualizar el registro.
-        """
-        query = "UPDATE registros_modbus SET valor = :valor WHERE direccion_modbus = :direccion"
-        params = {'valor': value, 'direccion': address}
-        return query, params
+def _registrar_resultado(circuit_breaker, ok: bool) -> None:
+    if circuit_breaker is None:
+        return
+    if ok:
+        circuit_breaker.registrar_exito()
+    else:
+        circuit_breaker.registrar_fallo()
+
 
-def process_modbus_operations(repository: IDatabaseRepository = None):
+def adquirir_registros(
+    session: ModbusSession,
+    read_plan: PlanLectura = None,
+    circuit_breaker: CircuitBreaker = None,
+) -> list:
+    """
+    Lee el plan completo a través de la sesión sin escribir en la base de datos.
+    Retorna los ModbusRegister leídos, o una lista vacía si el circuito está abierto
+    o la lectura falló. La persistencia queda a cargo del llamador.
+    """
+    if circuit_breaker is not None and not circuit_breaker.permitir():
+        return []
+    try:
+        modbus_device = session.get_device()
+    except ModbusConnectionError as e:
+        logger.error(f"Error de conexión Modbus: {e}")
+        _registrar_resultado(circuit_breaker, False)
+        return []
+    try:
+        registros = ModbusProcessor(modbus_device, None, logger, read_plan).acquire()
+    except ModbusReadError as e:
+        logger.error(f"Error durante la adquisición Modbus: {e}")
+        _registrar_resultado(circuit_breaker, False)
+        return []
+    finally:
+        if modbus_device.connection_lost:
+            session.invalidate()
+    _registrar_resultado(circuit_breaker, True)
+    return registros
+
+
+def process_modbus_operations(
+    repository: IDatabaseRepository = None,
+    session: ModbusSession = None,
+    read_plan: PlanLectura = None,
+    change_detector: DetectorCambios = None,
+    circuit_breaker: CircuitBreaker = None,
+):
     """
     Función de orquestación que inicializa la conexión, procesa las operaciones
     y actualiza la base de datos. Requiere que se inyecte un repositorio.
+    Si se inyecta una ModbusSession, se reutiliza su conexión entre llamadas; si se
+    inyecta un DetectorCambios, solo se escriben los registros que cambiaron.
+    Si se inyecta un CircuitBreaker abierto, el ciclo se omite sin tocar el puerto.
+    Retorna los ModbusRegister leídos (lista vacía si no hubo lectura).
     """
     if repository is None:
         raise ValueError("Se requiere un repositorio IDatabaseRepository inyectado.")
-    connection_manager = ModbusConnectionManager(logger)
-    try:
-        instrument = connection_manager.establish_connection()
-    except ModbusConnectionError as e:
-        logger.error(f"Error de conexión Modbus: {e}")
-        return
+    if circuit_breaker is not None and not circuit_breaker.permitir():
+        return []
+    if session is None:
+        connection_manager = ModbusConnectionManager(logger)
+        try:
+            instrument = connection_manager.establish_connection()
+        except ModbusConnectionError as e:
+            logger.error(f"Error de conexión Modbus: {e}")
+            _registrar_resultado(circuit_breaker, False)
+            return []
+        modbus_device = ModbusDevice(instrument, logger)
+    else:
+        try:
+            modbus_device = session.get_device()
+        except ModbusConnectionError as e:
+            logger.error(f"Error de conexión Modbus: {e}")
+            _registrar_resultado(circuit_breaker, False)
+            return []
 
-    modbus_device = ModbusDevice(instrument, logger)
-    processor = ModbusProcessor(modbus_device, repository, logger)
+    processor = ModbusProcessor(modbus_device, repository, logger, read_plan, change_detector)
+    registros = []
     try:
-        processor.process()
-    except (ModbusReadError, DatabaseUpdateError) as e:
+        registros = processor.process() or []
+    except ModbusReadError as e:
+        logger.error(f"Error durante el procesamiento de operaciones Modbus: {e}")
+        _registrar_resultado(circuit_breaker, False)
+    except DatabaseUpdateError as e:
+        # El dispositivo respondió: un fallo de la base de datos no abre el circuito
         logger.error(f"Error durante el procesamiento de operaciones Modbus: {e}")
+        _registrar_resultado(circuit_breaker, True)
+    else:
+        _registrar_resultado(circuit_breaker, True)
+    finally:
+        if session is not None and modbus_device.connection_lost:
+            session.invalidate()
+    return registros
@@ -0,0 +1,81 @@
+"""
+CircuitBreaker: Evita insistir sobre un recurso caído (por ejemplo, un esclavo Modbus apagado).
+
+- cerrado: las operaciones pasan normalmente.
+- abierto: tras umbral_fallos fallos consecutivos, las operaciones se rechazan sin tocar
+  el recurso hasta que vence la espera; la espera se duplica en cada reapertura.
+- semiabierto: vencida la espera, se permite una única operación de prueba; si tiene éxito
+  el circuito se cierra, si falla vuelve a abrirse.
+
+Los cambios de estado se registran una sola vez en el log, no en cada iteración.
+"""
+import time
+
+CERRADO = "cerrado"
+ABIERTO = "abierto"
+SEMIABIERTO = "semiabierto"
+
+
+class CircuitBreaker:
+    """Circuito de tres estados (cerrado, abierto, semiabierto) con espera exponencial entre reaperturas."""
+    def __init__(self, nombre, logger, umbral_fallos=3, espera_inicial_s=1.0, espera_max_s=60.0,
+                 clock=time.monotonic):
+        self.nombre = nombre
+        self.logger = logger
+        self.umbral_fallos = umbral_fallos
+        self.espera_inicial_s = espera_inicial_s
+        self.espera_max_s = espera_max_s
+        self.clock = clock
+        self.estado = CERRADO
+        self.fallos_consecutivos = 0
+        self.espera_actual_s = espera_inicial_s
+        self.reintentar_en = 0.0
+        self.rechazos = 0
+        self.aperturas = 0
+
+    def permitir(self) -> bool:
+        """Indica si la operación puede intentarse ahora."""
+        if self.estado == ABIERTO:
+            if self.clock() < self.reintentar_en:
+                self.rechazos += 1
+                return False
+            self.estado = SEMIABIERTO
+            self.logger.info(f"Circuito de {self.nombre} semiabierto: probando nuevamente")
+        return True
+
+    def registrar_exito(self) -> None:
+        """Registra una operación exitosa y cierra el circuito."""
+        if self.estado != CERRADO:
+            self.logger.info(f"Circuito de {self.nombre} cerrado: el recurso respondió")
+        self.estado = CERRADO
+        self.fallos_consecutivos = 0
+        self.espera_actual_s = self.espera_inicial_s
+
+    def registrar_fallo(self) -> None:
+        """Registra una operación fallida; abre el circuito si corresponde."""
+        self.fallos_consecutivos += 1
+        if self.estado == SEMIABIERTO:
+            self.espera_actual_s = min(self.espera_actual_s * 2, self.espera_max_s)
+            self._abrir()
+        elif self.estado == CERRADO and self.fallos_consecutivos >= self.umbral_fallos:
+            self.espera_actual_s = self.espera_inicial_s
+            self._abrir()
+
+    def _abrir(self) -> None:
+        self.estado = ABIERTO
+        self.aperturas += 1
+        self.reintentar_en = self.clock() + self.espera_actual_s
+        self.logger.error(
+            f"Circuito de {self.nombre} abierto tras {self.fallos_consecutivos} fallos: "
+            f"próximo intento en {self.espera_actual_s:.1f} s"
+        )
+
+    def get_stats(self) -> dict:
+        """Retorna el estado del circuito y sus contadores."""
+        return {
+            "estado": self.estado,
+            "fallos_consecutivos": self.fallos_consecutivos,
+            "espera_actual_s": self.espera_actual_s,
+            "aperturas": self.aperturas,
+            "rechazos": self.rechazos,
+        }
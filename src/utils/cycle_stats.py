@@ -0,0 +1,52 @@
+"""
+CycleJitterStats: Mide el período real de un bucle periódico y su desvío (jitter) respecto
+del período objetivo, con percentiles p50/p99 y máximo sobre una ventana de ciclos recientes.
+"""
+import math
+import time
+from collections import deque
+
+
+def _percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+class CycleJitterStats:
+    """Acumula los intervalos entre ciclos y calcula su jitter respecto del período objetivo."""
+    def __init__(self, periodo_objetivo_s=1.0, ventana=1000, clock=time.monotonic):
+        self.periodo_objetivo_s = periodo_objetivo_s
+        self.clock = clock
+        self._intervalos = deque(maxlen=ventana)
+        self._ultimo = None
+        self.ciclos = 0
+        self.periodo_max_s = 0.0
+
+    def marcar(self) -> None:
+        """Se llama una vez al comienzo de cada ciclo."""
+        ahora = self.clock()
+        if self._ultimo is not None:
+            intervalo = ahora - self._ultimo
+            self._intervalos.append(intervalo)
+            self.ciclos += 1
+            self.periodo_max_s = max(self.periodo_max_s, intervalo)
+        self._ultimo = ahora
+
+    def get_stats(self) -> dict:
+        """
+        Retorna el período medido y el jitter (|período - objetivo|) en p50, p99 y máximo.
+        Los percentiles se calculan sobre la ventana; periodo_max_s abarca toda la ejecución.
+        """
+        periodos = sorted(self._intervalos)
+        jitter = sorted(abs(intervalo - self.periodo_objetivo_s) for intervalo in self._intervalos)
+        return {
+            "ciclos": self.ciclos,
+            "periodo_objetivo_s": self.periodo_objetivo_s,
+            "periodo_p50_s": _percentil(periodos, 50),
+            "periodo_p99_s": _percentil(periodos, 99),
+            "periodo_max_s": self.periodo_max_s,
+            "jitter_p50_s": _percentil(jitter, 50),
+            "jitter_p99_s": _percentil(jitter, 99),
+            "jitter_max_s": jitter[-1] if jitter else 0.0,
+        }
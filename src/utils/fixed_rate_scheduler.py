@@ -0,0 +1,78 @@
+"""
+FixedRateScheduler: Marca el ritmo de un bucle con plazos absolutos sobre un reloj monótono.
+
+Cada ciclo tiene como plazo inicio + n * periodo_s, de modo que la duración del trabajo
+no se acumula como deriva (a diferencia de trabajar y luego dormir un período fijo).
+Si un ciclo termina después de su plazo (overrun), se aplica la política elegida:
+
+- omitir: se descartan los plazos vencidos y se espera al siguiente plazo de la grilla.
+- recuperar: no se duerme; los ciclos atrasados se ejecutan seguidos hasta alcanzar la grilla.
+"""
+import math
+import os
+import time
+
+OMITIR = "omitir"
+RECUPERAR = "recuperar"
+POLITICAS = (OMITIR, RECUPERAR)
+
+
+class FixedRateScheduler:
+    """Espera hasta el próximo plazo de la grilla de período fijo y contabiliza los overruns."""
+    def __init__(self, periodo_s=1.0, politica=OMITIR, clock=time.monotonic, sleep=time.sleep):
+        if periodo_s <= 0:
+            raise ValueError(f"El período debe ser positivo: {periodo_s}")
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de overrun desconocida: {politica} (opciones: {', '.join(POLITICAS)})")
+        self.periodo_s = periodo_s
+        self.politica = politica
+        self.clock = clock
+        self._sleep = sleep
+        self._proximo = None
+        self.ciclos = 0
+        self.overruns = 0
+        self.plazos_omitidos = 0
+        self.retraso_max_s = 0.0
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Crea el planificador con MAIN_LOOP_PERIOD_S y MAIN_LOOP_OVERRUN_POLICY."""
+        return cls(
+            periodo_s=float(os.getenv("MAIN_LOOP_PERIOD_S", "1.0")),
+            politica=os.getenv("MAIN_LOOP_OVERRUN_POLICY", OMITIR),
+            **kwargs,
+        )
+
+    def iniciar(self) -> None:
+        """Fija el origen de la grilla de plazos en el instante actual."""
+        self._proximo = self.clock()
+
+    def esperar(self) -> None:
+        """Se llama al terminar cada ciclo: duerme hasta el próximo plazo o aplica la política de overrun."""
+        if self._proximo is None:
+            self.iniciar()
+        self.ciclos += 1
+        self._proximo += self.periodo_s
+        ahora = self.clock()
+        if ahora < self._proximo:
+            self._sleep(self._proximo - ahora)
+            return
+        retraso = ahora - self._proximo
+        self.overruns += 1
+        self.retraso_max_s = max(self.retraso_max_s, retraso)
+        if self.politica == OMITIR:
+            omitidos = math.floor(retraso / self.periodo_s) + 1
+            self.plazos_omitidos += omitidos
+            self._proximo += omitidos * self.periodo_s
+            self._sleep(self._proximo - ahora)
+
+    def get_stats(self) -> dict:
+        """Retorna ciclos, overruns, plazos omitidos y el mayor retraso observado."""
+        return {
+            "periodo_s": self.periodo_s,
+            "politica": self.politica,
+            "ciclos": self.ciclos,
+            "overruns": self.overruns,
+            "plazos_omitidos": self.plazos_omitidos,
+            "retraso_max_s": self.retraso_max_s,
+        }
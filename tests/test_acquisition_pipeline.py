@@ -0,0 +1,72 @@
+"""
+Test del pipeline de adquisición: Verifica que una escritura lenta no frena el muestreo,
+las políticas de desborde y la escritura por lotes del último valor de cada registro.
+"""
+import threading
+import time
+import pytest  # pylint: disable=import-error
+from src.domain.modbus_register import ModbusRegister
+from src.infrastructure.acquisition_pipeline import (
+    AcquisitionPipeline, BLOQUEAR, DESCARTAR_ANTIGUO, DESCARTAR_NUEVO,
+)
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+
+class Contador:
+    def __init__(self):
+        self.n = 0
+    def __call__(self):
+        self.n += 1
+        return [ModbusRegister(address=1, value=self.n, description="R1", wall_time=float(self.n))]
+
+
+def test_escritura_lenta_no_frena_la_adquisicion():
+    lotes = []
+    liberar = threading.Event()
+    def persistir_lento(registros):
+        liberar.wait(2.0)
+        lotes.append(registros)
+    adquirir = Contador()
+    pipeline = AcquisitionPipeline(adquirir, persistir_lento, DummyLogger(), periodo_s=0.01, capacidad=5)
+    pipeline.start()
+    time.sleep(0.3)
+    ciclos_con_db_bloqueada = pipeline.get_stats()["ciclos"]
+    liberar.set()
+    pipeline.stop()
+    assert ciclos_con_db_bloqueada >= 10
+    stats = pipeline.get_stats()
+    assert stats["descartadas"] > 0
+    assert stats["profundidad_max"] == 5
+    # Tras el lote bloqueado, el siguiente lote escribe solo el valor más reciente de R1
+    assert len(lotes[1]) == 1
+    assert lotes[-1][0].value == adquirir.n
+    assert pipeline.ultima_lectura == float(adquirir.n)
+
+
+def test_politicas_de_desborde():
+    for politica, esperado in ((DESCARTAR_ANTIGUO, [2, 3]), (DESCARTAR_NUEVO, [1, 2])):
+        pipeline = AcquisitionPipeline(Contador(), None, DummyLogger(), capacidad=2, politica=politica)
+        for valor in (1, 2, 3):
+            pipeline._encolar([ModbusRegister(address=1, value=valor, description="R1")])
+        assert [pipeline.cola.get_nowait()[0].value for _ in range(2)] == esperado
+        assert pipeline.get_stats()["descartadas"] == 1
+
+
+def test_politica_bloquear_aplica_contrapresion():
+    lotes = []
+    pipeline = AcquisitionPipeline(Contador(), lotes.append, DummyLogger(), periodo_s=0.001, capacidad=1,
+                                   politica=BLOQUEAR)
+    pipeline.start()
+    time.sleep(0.1)
+    pipeline.stop()
+    stats = pipeline.get_stats()
+    assert stats["descartadas"] == 0
+    assert stats["encoladas"] >= stats["lotes"]
+
+
+def test_politica_invalida():
+    with pytest.raises(ValueError):
+        AcquisitionPipeline(Contador(), None, DummyLogger(), politica="ignorar")
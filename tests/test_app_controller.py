@@ -24,8 +24,8 @@ def test_appcontroller_with_injected_repo(monkeypatch):
     repo = DummyRepo()
     logger = DummyLogger()
     # Mock process_modbus_operations y main_transfer_controller para no ejecutar lógica real
-    monkeypatch.setattr('src.app_controller.process_modbus_operations', lambda repository: repo.__setattr__('called', True))
-    monkeypatch.setattr('src.app_controller.main_transfer_controller', lambda: None)
+    monkeypatch.setattr('src.app_controller.process_modbus_operations', lambda repository, **kwargs: repo.__setattr__('called', True))
+    monkeypatch.setattr('src.app_controller.main_transfer_controller', lambda **kwargs: None)
     app = AppController(logger=logger, repository=repo)
     app.execute_main_operations()
     assert repo.called
@@ -33,8 +33,8 @@ def test_appcontroller_with_injected_repo(monkeypatch):
 def test_appcontroller_without_repo(monkeypatch):
     logger = DummyLogger()
     # Mock process_modbus_operations y main_transfer_controller para no ejecutar lógica real
-    monkeypatch.setattr('src.app_controller.process_modbus_operations', lambda repository: None)
-    monkeypatch.setattr('src.app_controller.main_transfer_controller', lambda: None)
+    monkeypatch.setattr('src.app_controller.process_modbus_operations', lambda repository, **kwargs: None)
+    monkeypatch.setattr('src.app_controller.main_transfer_controller', lambda **kwargs: None)
     app = AppController(logger=logger)
     # No debe lanzar excepción aunque no se pase repo
     app.execute_main_operations()
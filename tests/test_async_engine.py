@@ -0,0 +1,85 @@
+"""
+Test del motor asyncio: Verifica que adquisición, persistencia y transferencia corren sobre el event loop con la lógica de ModbusProcessor.
+"""
+import asyncio
+from src.domain.register_map import DefinicionRegistro, compilar_plan
+from src.infrastructure.async_engine import AsyncAcquisitionEngine, AsyncModbusDeviceAdapter, AsyncRepositoryAdapter
+
+class FakeDevice:
+    connection_lost = False
+    def select_slave(self, slave_address): pass
+    def read_register(self, register, functioncode=3):
+        return 7
+    def read_registers(self, start, count, functioncode=3):
+        return [7] * count
+
+class FakeSession:
+    def get_device(self):
+        return FakeDevice()
+    def invalidate(self): pass
+
+class DummyRepo:
+    def __init__(self):
+        self.updates = []
+    def actualizar_registro(self, consulta, parametros):
+        self.updates.append(parametros)
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+
+def test_async_engine_runs_processor_logic():
+    repo = DummyRepo()
+    transfers = []
+    plan = compilar_plan([DefinicionRegistro("A", 1), DefinicionRegistro("B", 2)])
+    engine = AsyncAcquisitionEngine(
+        FakeSession(), repo, plan, DummyLogger(), periodo_s=0.001,
+        transfer_callback=lambda: transfers.append(1), intervalo_transferencia_s=0.001,
+    )
+    asyncio.run(engine.run(lambda: engine.stats["ciclos"] < 5))
+    assert engine.get_stats()["ciclos"] == 5
+    assert len(repo.updates) == 10
+    assert transfers
+
+
+def test_async_adapters_delegate_to_sync_ports():
+    async def scenario():
+        device = AsyncModbusDeviceAdapter(FakeDevice())
+        repo = AsyncRepositoryAdapter(DummyRepo())
+        valor = await device.leer_registro(1)
+        bloque = await device.read_registers(1, 3)
+        await repo.actualizar_registro("UPDATE", {"valor": valor})
+        device.shutdown()
+        repo.shutdown()
+        return valor, bloque, repo.repository.updates
+    valor, bloque, updates = asyncio.run(scenario())
+    assert valor == 7
+    assert bloque == [7, 7, 7]
+    assert updates == [{"valor": 7}]
+
+
+def test_async_engine_reads_through_device_adapter():
+    class LostDevice(FakeDevice):
+        def read_registers(self, start, count, functioncode=3):
+            self.connection_lost = True
+            return None
+
+    class CountingSession:
+        def __init__(self):
+            self.invalidaciones = 0
+            self.device = LostDevice()
+        def get_device(self):
+            return self.device
+        def invalidate(self):
+            self.invalidaciones += 1
+
+    session = CountingSession()
+    plan = compilar_plan([DefinicionRegistro("A", 1)])
+    engine = AsyncAcquisitionEngine(session, DummyRepo(), plan, DummyLogger())
+    assert isinstance(engine._modbus, AsyncModbusDeviceAdapter)
+    registros = asyncio.run(engine.acquire_once())
+    engine._modbus.shutdown()
+    assert registros == []
+    assert engine.get_stats()["errores"] == 1
+    assert session.invalidaciones == 1
@@ -0,0 +1,71 @@
+"""
+Test del detector de cambios: Verifica la banda muerta por registro y el refresco forzado.
+"""
+from src.domain.change_detection import DetectorCambios
+from src.domain.modbus_register import ModbusRegister
+from src.domain.register_map import DefinicionRegistro, compilar_plan
+from src.modbus_processor import ModbusProcessor
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+class SequenceDevice:
+    def __init__(self, valores):
+        self.valores = list(valores)
+    def read_registers(self, start, count, functioncode=3):
+        return [self.valores.pop(0)] * count
+
+class DummyRepo:
+    def __init__(self, fail=False):
+        self.updates = []
+        self.fail = fail
+    def actualizar_registro(self, consulta, parametros):
+        if self.fail:
+            raise RuntimeError("MySQL no disponible")
+        self.updates.append(parametros["valor"])
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+
+def test_detector_aplica_banda_muerta_y_refresco():
+    clock = FakeClock()
+    detector = DetectorCambios({"T": 0.5}, refresco_forzado_s=10, clock=clock)
+    def escribir(valor):
+        cambiados = detector.filtrar([ModbusRegister(1, valor, "T")])
+        for reg in cambiados:
+            detector.confirmar(reg)
+        return len(cambiados)
+    assert escribir(20.0) == 1
+    assert escribir(20.4) == 0
+    assert escribir(20.6) == 1
+    clock.now = 11
+    assert escribir(20.6) == 1
+    assert detector.get_stats()["omitidos"] == 1
+
+
+def test_processor_omite_valores_sin_cambios():
+    plan = compilar_plan([DefinicionRegistro("ESTADO", 1)])
+    detector = DetectorCambios(plan.bandas, clock=FakeClock())
+    repo = DummyRepo()
+    processor = ModbusProcessor(SequenceDevice([0, 0, 0, 1, 1]), repo, DummyLogger(), plan, detector)
+    for _ in range(5):
+        processor.process()
+    assert repo.updates == [0, 1]
+
+
+def test_processor_reintenta_si_la_escritura_falla():
+    plan = compilar_plan([DefinicionRegistro("ESTADO", 1)])
+    detector = DetectorCambios(plan.bandas, clock=FakeClock())
+    reg = ModbusRegister(1, 5, "ESTADO")
+    try:
+        ModbusProcessor(None, DummyRepo(fail=True), DummyLogger(), plan, detector).persist([reg])
+    except Exception:
+        pass
+    repo = DummyRepo()
+    ModbusProcessor(None, repo, DummyLogger(), plan, detector).persist([reg])
+    assert repo.updates == [5]
@@ -0,0 +1,82 @@
+"""
+Test del CircuitBreaker: Verifica la apertura tras fallos, el backoff exponencial, la prueba semiabierta
+y que process_modbus_operations omite el dispositivo caído sin tocar el puerto.
+"""
+from src.utils.circuit_breaker import CircuitBreaker, ABIERTO, CERRADO, SEMIABIERTO
+from src.modbus_processor import ModbusConnectionError, process_modbus_operations
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+class DummyLogger:
+    def __init__(self):
+        self.mensajes = []
+    def info(self, msg): self.mensajes.append(msg)
+    def error(self, msg): self.mensajes.append(msg)
+    def debug(self, msg): pass
+
+class DeadSession:
+    def __init__(self):
+        self.intentos = 0
+    def get_device(self):
+        self.intentos += 1
+        raise ModbusConnectionError("sin puerto")
+
+class DummyRepo:
+    def actualizar_registro(self, consulta, parametros): pass
+
+
+def test_breaker_abre_tras_umbral_y_duplica_la_espera():
+    clock = FakeClock()
+    logger = DummyLogger()
+    breaker = CircuitBreaker("test", logger, umbral_fallos=2, espera_inicial_s=1.0, espera_max_s=3.0, clock=clock)
+    breaker.registrar_fallo()
+    assert breaker.estado == CERRADO
+    breaker.registrar_fallo()
+    assert breaker.estado == ABIERTO
+    assert not breaker.permitir()
+    clock.now = 1.0
+    assert breaker.permitir()
+    assert breaker.estado == SEMIABIERTO
+    breaker.registrar_fallo()
+    assert breaker.estado == ABIERTO
+    assert breaker.espera_actual_s == 2.0
+    clock.now = 3.0
+    assert breaker.permitir()
+    breaker.registrar_fallo()
+    # La espera se limita a espera_max_s
+    assert breaker.espera_actual_s == 3.0
+    clock.now = 6.0
+    assert breaker.permitir()
+    breaker.registrar_exito()
+    assert breaker.estado == CERRADO
+    assert breaker.espera_actual_s == 1.0
+    assert breaker.get_stats()["rechazos"] == 1
+
+
+def test_breaker_registra_cada_cambio_de_estado_una_sola_vez():
+    clock = FakeClock()
+    logger = DummyLogger()
+    breaker = CircuitBreaker("test", logger, umbral_fallos=1, espera_inicial_s=10.0, clock=clock)
+    breaker.registrar_fallo()
+    for _ in range(100):
+        breaker.permitir()
+    assert len(logger.mensajes) == 1
+    assert breaker.get_stats()["rechazos"] == 100
+
+
+def test_process_modbus_operations_omite_dispositivo_caido():
+    clock = FakeClock()
+    session = DeadSession()
+    breaker = CircuitBreaker("dispositivo Modbus", DummyLogger(), umbral_fallos=3, clock=clock)
+    for _ in range(10):
+        process_modbus_operations(repository=DummyRepo(), session=session, circuit_breaker=breaker)
+    # Tras tres fallos el puerto no se vuelve a tocar hasta que vence la espera
+    assert session.intentos == 3
+    clock.now = 1.0
+    process_modbus_operations(repository=DummyRepo(), session=session, circuit_breaker=breaker)
+    assert session.intentos == 4
+    assert breaker.estado == ABIERTO
@@ -0,0 +1,40 @@
+"""
+Test de CycleJitterStats: Verifica el período medido y los percentiles de jitter del bucle.
+"""
+from src.utils.cycle_stats import CycleJitterStats
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+
+def test_jitter_percentiles_y_maximo():
+    clock = FakeClock()
+    stats = CycleJitterStats(periodo_objetivo_s=1.0, clock=clock)
+    periodos = [1.0] * 98 + [1.2, 1.5]
+    stats.marcar()
+    for periodo in periodos:
+        clock.now += periodo
+        stats.marcar()
+    resultado = stats.get_stats()
+    assert resultado["ciclos"] == 100
+    assert resultado["periodo_p50_s"] == 1.0
+    assert abs(resultado["jitter_p99_s"] - 0.2) < 1e-9
+    assert abs(resultado["jitter_max_s"] - 0.5) < 1e-9
+    assert abs(resultado["periodo_max_s"] - 1.5) < 1e-9
+
+
+def test_ventana_limita_los_percentiles_pero_no_el_maximo():
+    clock = FakeClock()
+    stats = CycleJitterStats(periodo_objetivo_s=1.0, ventana=10, clock=clock)
+    stats.marcar()
+    clock.now += 3.0
+    stats.marcar()
+    for _ in range(10):
+        clock.now += 1.0
+        stats.marcar()
+    resultado = stats.get_stats()
+    assert resultado["jitter_max_s"] == 0.0
+    assert resultado["periodo_max_s"] == 3.0
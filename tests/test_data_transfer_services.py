@@ -9,13 +9,16 @@ class DummyRepo:
         self.actualizar_registro_called = False
         self.commit_called = False
         self.ejecutar_consulta_called = False
+        self.lotes = []
     def actualizar_registro(self, consulta, parametros):
         self.actualizar_registro_called = True
     def obtener_engine(self): pass
     def ejecutar_consulta(self, consulta, parametros):
         self.ejecutar_consulta_called = True
         return [(1, 2, 3, 4)]
-    def insertar_lote(self, consulta, lista_parametros): pass
+    def insertar_lote(self, consulta, lista_parametros):
+        self.lotes.append(list(lista_parametros))
+        return len(lista_parametros)
     def commit(self):
         self.commit_called = True
     def rollback(self): pass
@@ -33,13 +36,131 @@ def test_production_log_transfer_service_with_mock():
     logger = DummyLogger()
     service = ProductionLogTransferService(logger, repo)
     service.insertar_datos([(1,2,3,4)], "INSERT ...", ["a","b","c","d"])
-    assert repo.actualizar_registro_called
-    assert repo.commit_called
+    assert repo.lotes == [[{"a": 1, "b": 2, "c": 3, "d": 4}]]
+    assert not repo.actualizar_registro_called
 
 def test_interval_production_transfer_service_with_mock():
     repo = DummyRepo()
     logger = DummyLogger()
     service = IntervalProductionTransferService(logger, repo)
     service.insertar_datos([(1,2)], "INSERT ...", ["a","b"])
-    assert repo.actualizar_registro_called
-    assert repo.commit_called
+    assert repo.lotes == [[{"a": 1, "b": 2}]]
+    assert not repo.actualizar_registro_called
+
+def test_unixtime_se_alinea_a_la_lectura():
+    service = ProductionLogTransferService(DummyLogger(), DummyRepo())
+    # Una lectura 1,6 s antes del límite del intervalo se fecha en ese límite, aunque la transferencia corra después
+    assert service._get_unix_time(1_700_000_098.4) == 1_700_000_100
+    assert service._get_unix_time(1_700_000_098.4) % 300 == 0
+
+def test_insertar_datos_cuenta_duplicados_por_filas_afectadas():
+    class RepoConClaveUnica(DummyRepo):
+        def __init__(self):
+            super().__init__()
+            self.unixtimes = set()
+        def insertar_lote(self, consulta, lista_parametros):
+            # INSERT IGNORE: no se afectan las filas cuyo unixtime ya existe
+            nuevos = {p["unixtime"] for p in lista_parametros} - self.unixtimes
+            self.unixtimes |= nuevos
+            return len(nuevos)
+    service = IntervalProductionTransferService(
+        DummyLogger(), RepoConClaveUnica(), confirmar_claves=lambda: {"intervalproduction"}
+    )
+    _, consulta, campos = service.get_queries()
+    assert "INSERT IGNORE" in consulta
+    service.insertar_datos([(300, 1, 2), (300, 1, 2), (600, 3, 4)], consulta, campos)
+    assert service.stats == {"insertados": 2, "duplicados": 1}
+
+def test_not_exists_hasta_confirmar_la_clave_unica():
+    confirmaciones = []
+    def confirmar_claves():
+        confirmaciones.append(1)
+        if len(confirmaciones) == 1:
+            raise ConnectionError("sin base de datos")
+        return set() if len(confirmaciones) == 2 else {"ProductionLog", "intervalproduction"}
+    service = ProductionLogTransferService(DummyLogger(), DummyRepo(), confirmar_claves=confirmar_claves)
+    assert "NOT EXISTS" in service.get_queries()[1]
+    # Antes de REINTENTO_CLAVES_S no se vuelve a consultar
+    assert "NOT EXISTS" in service.get_queries()[1]
+    assert len(confirmaciones) == 1
+    service._proxima_verificacion = 0.0
+    assert "NOT EXISTS" in service.get_queries()[1]
+    service._proxima_verificacion = 0.0
+    assert "INSERT IGNORE" in service.get_queries()[1]
+    # Confirmada la clave, no se vuelve a verificar el esquema
+    service._proxima_verificacion = 0.0
+    assert "INSERT IGNORE" in service.get_queries()[1]
+    assert len(confirmaciones) == 3
+
+def test_intervalo_incremental_en_memoria():
+    class RepoIntervalos(DummyRepo):
+        def __init__(self):
+            super().__init__()
+            self.consultas = 0
+            self.insertados = []
+        def ejecutar_consulta(self, consulta, parametros):
+            self.consultas += 1
+            return [(100, 0, 65530, 0)]  # snapshot anterior al arranque
+        def insertar_lote(self, consulta, lista_parametros):
+            self.insertados.extend(lista_parametros)
+            return len(lista_parametros)
+    repo = RepoIntervalos()
+    service = IntervalProductionTransferService(DummyLogger(), repo)
+    service.transfer(snapshot=(600, 150, 0, 4, 1))
+    service.transfer(snapshot=(900, 170, 0, 10, 1))
+    service.transfer(snapshot=None)  # ProductionLog no escribió (unixtime repetido)
+    assert repo.consultas == 1  # solo la lectura inicial del snapshot anterior
+    assert repo.insertados == [
+        {"unixtime": 600, "HR_COUNTER1": 50, "HR_COUNTER2": 10},  # 65530 -> 65540 cruza la palabra alta
+        {"unixtime": 900, "HR_COUNTER1": 20, "HR_COUNTER2": 6},
+    ]
+
+def test_snapshot_anterior_se_reintenta_si_la_consulta_falla():
+    class RepoCaido(DummyRepo):
+        def __init__(self):
+            super().__init__()
+            self.consultas = 0
+        def ejecutar_consulta(self, consulta, parametros):
+            self.consultas += 1
+            if self.consultas == 1:
+                raise ConnectionError("sin base de datos")
+            return [(150, 0, 4, 1)]
+    repo = RepoCaido()
+    service = IntervalProductionTransferService(DummyLogger(), repo)
+    service.transfer(snapshot=(600, 150, 0, 4, 1))
+    assert not service._sembrado
+    service.transfer(snapshot=(900, 170, 0, 10, 1))
+    service.transfer(snapshot=(1200, 180, 0, 12, 1))
+    assert service._sembrado
+    assert repo.consultas == 2
+
+def test_snapshot_desde_el_almacen_local_y_consulta_pivote_como_respaldo():
+    class RepoSnapshot(DummyRepo):
+        def __init__(self):
+            super().__init__()
+            self.consultas = []
+            self.insertados = []
+        def ejecutar_consulta(self, consulta, parametros):
+            self.consultas.append(consulta)
+            return [(1, 2, 3, 4)]
+        def insertar_lote(self, consulta, lista_parametros):
+            self.insertados.extend(lista_parametros)
+            return len(lista_parametros)
+    valores = {"HR_COUNTER1_LO": 10.0, "HR_COUNTER1_HI": 0.0, "HR_COUNTER2_LO": 20.0}
+    repo = RepoSnapshot()
+    service = ProductionLogTransferService(DummyLogger(), repo, lambda: valores)
+    # Falta HR_COUNTER2_HI en las lecturas locales: una única consulta pivote a registros_modbus
+    assert service.transfer(marca_lectura=300) == (300, 1, 2, 3, 4)
+    assert len(repo.consultas) == 1
+    assert "MAX(CASE WHEN registro = 'HR_COUNTER2_HI' THEN valor END)" in repo.consultas[0]
+    valores["HR_COUNTER2_HI"] = 1.0
+    assert service.transfer(marca_lectura=600) == (600, 10, 0, 20, 1)
+    assert len(repo.consultas) == 1
+
+def test_insertar_datos_en_lotes_de_tamano_configurable():
+    repo = DummyRepo()
+    service = IntervalProductionTransferService(DummyLogger(), repo)
+    service.tamano_lote = 2
+    filas = [(300 * i, i, i) for i in range(5)]
+    assert service.insertar_datos(filas, "INSERT ...", ["unixtime", "HR_COUNTER1", "HR_COUNTER2"]) == 5
+    assert [len(lote) for lote in repo.lotes] == [2, 2, 1]
@@ -0,0 +1,52 @@
+"""
+Test del esquema: Verifica que solo se crean los índices que faltan.
+"""
+from src.infrastructure.db_schema import INDICES, asegurar_indices, claves_unicas_presentes, ddl_indice
+
+class FakeResult:
+    def __init__(self, valor):
+        self.valor = valor
+    def scalar(self):
+        return self.valor
+
+class FakeConnection:
+    def __init__(self, existentes):
+        self.existentes = existentes
+        self.ddl = []
+    def __enter__(self):
+        return self
+    def __exit__(self, *args):
+        return False
+    def execute(self, sentencia, parametros=None):
+        if parametros is not None:
+            return FakeResult(int(parametros["nombre"] in self.existentes))
+        self.ddl.append(str(sentencia))
+        return FakeResult(None)
+    def commit(self): pass
+    def rollback(self): pass
+
+class FakeEngine:
+    def __init__(self, conn):
+        self.conn = conn
+    def connect(self):
+        return self.conn
+
+class DummyLogger:
+    def info(self, msg, *args): pass
+    def error(self, msg, *args): pass
+
+
+def test_solo_crea_los_indices_faltantes():
+    conn = FakeConnection(existentes={"uq_productionlog_unixtime"})
+    creadas = asegurar_indices(FakeEngine(conn), DummyLogger())
+    assert creadas == ["uq_intervalproduction_unixtime", "ix_registros_modbus_registro"]
+    assert conn.ddl == [ddl_indice(*INDICES[1]), ddl_indice(*INDICES[2])]
+    assert conn.ddl == [
+        "ALTER TABLE intervalproduction ADD UNIQUE KEY uq_intervalproduction_unixtime (unixtime)",
+        "ALTER TABLE registros_modbus ADD INDEX ix_registros_modbus_registro (registro)",
+    ]
+
+
+def test_claves_unicas_presentes_solo_informa_las_existentes():
+    conn = FakeConnection(existentes={"uq_productionlog_unixtime", "ix_registros_modbus_registro"})
+    assert claves_unicas_presentes(FakeEngine(conn)) == {"ProductionLog"}
@@ -0,0 +1,33 @@
+"""
+Test del registro de engines: Verifica que los repositorios comparten un único engine por URL
+y que el pool expone sus métricas de checkout.
+"""
+from sqlalchemy import text
+from src.infrastructure.db_operations import SQLAlchemyDatabaseRepository
+from src.infrastructure.engine_registry import EngineRegistry, MeteredQueuePool
+
+
+def test_un_engine_por_url_con_metricas_del_pool(tmp_path):
+    registro = EngineRegistry(pool_size=2, max_overflow=1, pool_recycle_s=60)
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = registro.obtener(url)
+    assert registro.obtener(url) is engine
+    assert isinstance(engine.pool, MeteredQueuePool)
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    stats = next(iter(registro.get_stats().values()))
+    assert stats["checkouts"] == 3
+    assert stats["en_uso"] == 0
+    assert stats["tamano"] == 2
+    registro.cerrar_todos()
+    assert registro.get_stats() == {}
+
+
+def test_los_repositorios_comparten_el_engine():
+    primero = SQLAlchemyDatabaseRepository()
+    segundo = SQLAlchemyDatabaseRepository()
+    assert primero.engine is segundo.engine
+    assert primero.session is not segundo.session
+    primero.cerrar_conexion()
+    assert segundo.engine.pool is primero.engine.pool
@@ -28,7 +28,7 @@ def test_create_modbus_device(monkeypatch):
 def test_create_data_transfer_controller(monkeypatch):
     # Mock DataTransferController para evitar dependencias reales
     from src.infrastructure import factories
-    monkeypatch.setattr(factories, 'DataTransferController', lambda logger, repo: type('FakeController', (), {'logger': logger, 'repo': repo})())
+    monkeypatch.setattr(factories, 'DataTransferController', lambda logger, repo, confirmar_claves=None: type('FakeController', (), {'logger': logger, 'repo': repo})())
     controller = create_data_transfer_controller()
     assert hasattr(controller, 'logger')
     assert hasattr(controller, 'repo')
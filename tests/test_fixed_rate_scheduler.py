@@ -0,0 +1,58 @@
+"""
+Test de FixedRateScheduler: Verifica que los plazos no derivan y las políticas ante overruns.
+"""
+import pytest  # pylint: disable=import-error
+from src.utils.fixed_rate_scheduler import FixedRateScheduler, OMITIR, RECUPERAR
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.dormido = []
+    def __call__(self):
+        return self.now
+    def sleep(self, segundos):
+        self.dormido.append(segundos)
+        self.now += segundos
+
+
+def _ejecutar(scheduler, clock, duraciones):
+    inicios = []
+    scheduler.iniciar()
+    for duracion in duraciones:
+        inicios.append(clock.now)
+        clock.now += duracion
+        scheduler.esperar()
+    return inicios
+
+
+def test_plazos_absolutos_sin_deriva():
+    clock = FakeClock()
+    scheduler = FixedRateScheduler(periodo_s=0.25, clock=clock, sleep=clock.sleep)
+    inicios = _ejecutar(scheduler, clock, [0.1, 0.2, 0.05, 0.24] * 25)
+    # Tras 100 ciclos de duración variable, cada ciclo empieza exactamente en su plazo
+    assert inicios[-1] == pytest.approx(99 * 0.25)
+    assert scheduler.get_stats()["overruns"] == 0
+
+
+def test_politica_omitir_espera_al_siguiente_plazo():
+    clock = FakeClock()
+    scheduler = FixedRateScheduler(periodo_s=1.0, politica=OMITIR, clock=clock, sleep=clock.sleep)
+    inicios = _ejecutar(scheduler, clock, [0.5, 2.3, 0.5, 0.5])
+    assert inicios == pytest.approx([0.0, 1.0, 4.0, 5.0])
+    stats = scheduler.get_stats()
+    assert stats["overruns"] == 1
+    assert stats["plazos_omitidos"] == 2
+    assert stats["retraso_max_s"] == pytest.approx(1.3)
+
+
+def test_politica_recuperar_ejecuta_los_ciclos_atrasados():
+    clock = FakeClock()
+    scheduler = FixedRateScheduler(periodo_s=1.0, politica=RECUPERAR, clock=clock, sleep=clock.sleep)
+    inicios = _ejecutar(scheduler, clock, [0.5, 2.3, 0.1, 0.1, 0.1])
+    assert inicios == pytest.approx([0.0, 1.0, 3.3, 3.4, 4.0])
+    assert scheduler.get_stats()["overruns"] == 2
+
+
+def test_politica_invalida():
+    with pytest.raises(ValueError):
+        FixedRateScheduler(politica="esperar")
@@ -0,0 +1,79 @@
+"""
+Test del planificador de bus: Verifica el sondeo round-robin de varios esclavos y el backoff de esclavos ausentes.
+"""
+from src.domain.register_map import DefinicionRegistro, compilar_plan
+from src.infrastructure.modbus_bus_scheduler import ModbusBusScheduler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+class MultiSlaveDevice:
+    def __init__(self, dead=()):
+        self.dead = set(dead)
+        self.slave = None
+        self.requests = []
+        self.connection_lost = False
+    def select_slave(self, slave_address):
+        self.slave = slave_address
+    def read_registers(self, start, count, functioncode=3):
+        self.requests.append(self.slave)
+        if self.slave in self.dead:
+            return None
+        return [self.slave] * count
+
+class FakeSession:
+    def __init__(self, device):
+        self.device = device
+    def get_device(self):
+        return self.device
+    def invalidate(self): pass
+
+class DummyRepo:
+    def __init__(self):
+        self.updates = []
+    def actualizar_registro(self, consulta, parametros):
+        self.updates.append(parametros)
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+
+def _plan():
+    return compilar_plan(
+        [DefinicionRegistro(f"R{d}", 10, dispositivo=d, direccion_db=d) for d in (1, 2, 3)],
+        periodos={1: 1.0, 2: 1.0, 3: 2.0},
+    )
+
+
+def test_scheduler_respeta_periodo_por_esclavo():
+    clock = FakeClock()
+    device = MultiSlaveDevice()
+    scheduler = ModbusBusScheduler(FakeSession(device), _plan(), DummyLogger(), clock=clock)
+    repo = DummyRepo()
+    for _ in range(4):
+        scheduler.poll_once(repo)
+        clock.now += 1.0
+    stats = scheduler.get_stats()
+    assert stats[1]["sondeos"] == 4
+    assert stats[2]["sondeos"] == 4
+    assert stats[3]["sondeos"] == 2
+    assert {"valor": 3, "direccion": 3} in repo.updates
+
+
+def test_scheduler_posterga_esclavo_ausente():
+    clock = FakeClock()
+    device = MultiSlaveDevice(dead={2})
+    scheduler = ModbusBusScheduler(FakeSession(device), _plan(), DummyLogger(), clock=clock)
+    for _ in range(8):
+        scheduler.poll_once(DummyRepo())
+        clock.now += 1.0
+    stats = scheduler.get_stats()
+    assert stats[1]["sondeos"] == 8
+    # Backoff de 2, 4 y 8 segundos: solo tres intentos en ocho rondas
+    assert stats[2]["sondeos"] == 3
+    assert stats[2]["fallos_consecutivos"] == 3
+    assert stats[2]["omisiones"] == 5
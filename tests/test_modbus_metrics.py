@@ -0,0 +1,75 @@
+"""
+Test de métricas Modbus: Verifica la latencia por transacción, la clasificación de errores y la sugerencia del sondeo de enlace.
+"""
+import minimalmodbus  # pylint: disable=import-error
+from src.infrastructure.modbus_metrics import ModbusTransactionMetrics, LatencyHistogram
+from src.infrastructure.modbus_link_probe import ResultadoSondeo, sugerir_configuracion
+from src.modbus_processor import ModbusDevice
+
+class FlakyInstrument:
+    def __init__(self, errores):
+        self.errores = list(errores)
+    def read_registers(self, start, count, functioncode=3):
+        if self.errores:
+            raise self.errores.pop(0)
+        return [0] * count
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+
+def test_device_records_latency_and_errors():
+    metrics = ModbusTransactionMetrics()
+    device = ModbusDevice(FlakyInstrument([
+        minimalmodbus.NoResponseError("No communication with the instrument (no answer)"),
+        minimalmodbus.InvalidResponseError("Checksum error in rtu mode"),
+    ]), DummyLogger(), metrics)
+    for _ in range(3):
+        device.read_registers(22, 4)
+    resumen = metrics.resumen()
+    assert sorted(resumen) == [f"read_registers@{d}" for d in range(22, 26)]
+    for direccion in range(22, 26):
+        assert resumen[f"read_registers@{direccion}"]["latencia"]["cantidad"] == 3
+        assert resumen[f"read_registers@{direccion}"]["timeouts"] == 1
+        assert resumen[f"read_registers@{direccion}"]["errores_crc"] == 1
+    assert metrics.totales() == {"transacciones": 3, "timeouts": 1, "errores_crc": 1, "otros_errores": 0}
+    assert not device.connection_lost
+
+
+def test_histogram_percentiles():
+    histograma = LatencyHistogram()
+    for _ in range(99):
+        histograma.add(0.004)
+    histograma.add(0.3)
+    assert histograma.percentil(50) == 5.0
+    assert histograma.percentil(100) == 500.0
+    assert histograma.a_dict()["max_ms"] == 300.0
+
+
+def test_sugerir_configuracion_elige_la_estable_mas_rapida():
+    resultados = [
+        ResultadoSondeo(115200, 0.05, 20, 3, 3, 0, 0.004, 0.05),
+        ResultadoSondeo(57600, 0.05, 20, 0, 0, 0, 0.006, 0.008),
+        ResultadoSondeo(57600, 0.2, 20, 0, 0, 0, 0.006, 0.008),
+        ResultadoSondeo(9600, 0.2, 20, 0, 0, 0, 0.03, 0.04),
+    ]
+    sugerida = sugerir_configuracion(resultados)
+    assert (sugerida.baudrate, sugerida.timeout) == (57600, 0.2)
+
+
+def test_resumen_concurrente_con_registrar():
+    import threading
+    metrics = ModbusTransactionMetrics()
+    listo = threading.Event()
+    def escribir():
+        for direccion in range(2000):
+            metrics.registrar("read_registers", direccion, 0.001, cantidad=4)
+        listo.set()
+    hilo = threading.Thread(target=escribir)
+    hilo.start()
+    while not listo.is_set():
+        metrics.resumen()
+    hilo.join()
+    assert metrics.totales()["transacciones"] == 2000
+    assert len(metrics.resumen()) == 2003
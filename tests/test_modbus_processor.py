@@ -42,3 +42,36 @@ def test_process_high_resolution_registers(processor):
     assert len(repo.actualizaciones) == 4
     for query, params in repo.actualizaciones:
         assert params["valor"] == 1234
+
+def test_acquire_marca_el_instante_de_lectura():
+    import time
+    antes_mono, antes_wall = time.monotonic_ns(), time.time()
+    registros = ModbusProcessor(MockModbusDevice(), MockRepository(), MockLogger()).acquire()
+    assert registros
+    for reg in registros:
+        assert reg.monotonic_ns >= antes_mono
+        assert antes_wall <= reg.wall_time <= time.time()
+
+def test_persist_usa_actualizar_lote_con_un_commit(tmp_path):
+    from sqlalchemy import create_engine, text
+    from src.domain.register_map import DefinicionRegistro, compilar_plan
+    from src.domain.modbus_register import ModbusRegister
+    from src.infrastructure.db_operations import SQLAlchemyDatabaseRepository
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'registros.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE registros_modbus (direccion_modbus INTEGER PRIMARY KEY, valor INTEGER)"))
+        conn.execute(text("INSERT INTO registros_modbus VALUES (1, 0), (2, 0), (3, 0)"))
+    repo = SQLAlchemyDatabaseRepository(engine=engine)
+    commits = []
+    repo.session.commit = lambda c=repo.session.commit: (commits.append(1), c())
+    plan = compilar_plan([DefinicionRegistro(f"R{i}", i, direccion_db=i) for i in (1, 2, 3)])
+    processor = ModbusProcessor(None, repo, MockLogger(), plan)
+
+    processor.persist([ModbusRegister(i, i * 10, f"R{i}") for i in (1, 2, 3)])
+
+    assert len(commits) == 1
+    with engine.connect() as conn:
+        filas = conn.execute(text("SELECT direccion_modbus, valor FROM registros_modbus ORDER BY 1")).fetchall()
+    assert [tuple(f) for f in filas] == [(1, 10), (2, 20), (3, 30)]
+    repo.cerrar_conexion()
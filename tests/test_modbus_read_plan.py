@@ -0,0 +1,48 @@
+"""
+Test del planificador de lecturas: Verifica la fusión de direcciones contiguas en bloques y su uso en ModbusProcessor.
+"""
+from src.domain.modbus_read_plan import BloqueLectura, planificar_bloques, MAX_REGISTROS_POR_PETICION
+from src.modbus_processor import ModbusProcessor
+
+class BlockModbusDevice:
+    def __init__(self):
+        self.requests = []
+    def read_digital_inputs(self, start, count, functioncode=2):
+        self.requests.append((functioncode, start, count))
+        return [1] * count
+    def read_registers(self, start, count, functioncode=3):
+        self.requests.append((functioncode, start, count))
+        return [start + i for i in range(count)]
+
+class MockRepository:
+    def __init__(self):
+        self.actualizaciones = []
+    def actualizar_registro(self, query, params):
+        self.actualizaciones.append(params)
+
+class MockLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+
+def test_planificar_bloques_fusiona_contiguas():
+    bloques = planificar_bloques([25, 22, 23, 24, 70, 71, 90], functioncode=3)
+    assert bloques == [
+        BloqueLectura(3, 22, 4),
+        BloqueLectura(3, 70, 2),
+        BloqueLectura(3, 90, 1),
+    ]
+
+
+def test_planificar_bloques_respeta_limite():
+    bloques = planificar_bloques(range(0, MAX_REGISTROS_POR_PETICION + 5), functioncode=3)
+    assert [b.count for b in bloques] == [MAX_REGISTROS_POR_PETICION, 5]
+
+
+def test_processor_usa_lecturas_en_bloque():
+    device = BlockModbusDevice()
+    repo = MockRepository()
+    ModbusProcessor(device, repo, MockLogger()).process()
+    assert device.requests == [(2, 70, 2), (3, 22, 4)]
+    assert len(repo.actualizaciones) == 6
+    assert {"valor": 23, "direccion": 23} in repo.actualizaciones
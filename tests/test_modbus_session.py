@@ -0,0 +1,63 @@
+"""
+Test de ModbusSession: Verifica que la conexión se reutiliza entre iteraciones y solo se reconecta tras un fallo serie.
+"""
+import serial  # pylint: disable=import-error
+from src.modbus_processor import ModbusSession, process_modbus_operations
+
+class FakeInstrument:
+    def __init__(self, fail=False):
+        self.fail = fail
+    def read_bit(self, address, functioncode=2):
+        if self.fail:
+            raise serial.SerialException("puerto desconectado")
+        return 1
+    def read_bits(self, start, count, functioncode=2):
+        return [self.read_bit(start)] * count
+    def read_register(self, register, functioncode=3):
+        return 42
+    def read_registers(self, start, count, functioncode=3):
+        return [42] * count
+
+class FakeConnectionManager:
+    def __init__(self, instruments):
+        self.instruments = list(instruments)
+        self.calls = 0
+    def establish_connection(self):
+        self.calls += 1
+        return self.instruments.pop(0)
+
+class DummyRepo:
+    def __init__(self):
+        self.updates = 0
+    def actualizar_registro(self, consulta, parametros):
+        self.updates += 1
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+    def debug(self, msg): pass
+
+
+def test_session_reuses_connection():
+    manager = FakeConnectionManager([FakeInstrument()])
+    session = ModbusSession(DummyLogger(), connection_manager=manager)
+    repo = DummyRepo()
+    for _ in range(3):
+        process_modbus_operations(repository=repo, session=session)
+    assert manager.calls == 1
+    stats = session.get_stats()
+    assert stats["conexiones"] == 1
+    assert stats["escaneos_evitados"] == 2
+    assert stats["reconexiones"] == 0
+    assert repo.updates == 18
+
+
+def test_session_reconnects_after_serial_failure():
+    manager = FakeConnectionManager([FakeInstrument(fail=True), FakeInstrument()])
+    session = ModbusSession(DummyLogger(), connection_manager=manager)
+    device = session.get_device()
+    assert device.read_digital_input(70) is None
+    assert device.connection_lost
+    session.get_device()
+    assert manager.calls == 2
+    assert session.get_stats()["reconexiones"] == 1
@@ -0,0 +1,63 @@
+"""
+Test del transporte Modbus TCP: Verifica lecturas contra el simulador local y el uso desde ModbusSession y ModbusProcessor.
+"""
+import pytest  # pylint: disable=import-error
+import minimalmodbus  # pylint: disable=import-error
+from src.infrastructure.modbus_tcp import ModbusTcpConnectionManager, ModbusTcpInstrument
+from src.infrastructure.modbus_tcp_simulator import ModbusTcpSimulator
+from src.modbus_processor import ModbusSession, ModbusProcessor, ModbusConnectionError
+
+class DummyRepo:
+    def __init__(self):
+        self.updates = []
+    def actualizar_registro(self, consulta, parametros):
+        self.updates.append(parametros)
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+
+@pytest.fixture
+def simulator():
+    with ModbusTcpSimulator(unit_ids=(1, 2)) as sim:
+        yield sim
+
+
+def test_tcp_instrument_reads_registers_and_bits(simulator):
+    simulator.bank(1).set_register(22, 1234)
+    simulator.bank(1).set_register(23, 1)
+    simulator.bank(1).set_bit(71, 1)
+    instrument = ModbusTcpInstrument("127.0.0.1", simulator.port)
+    assert instrument.read_registers(22, 2) == [1234, 1]
+    assert instrument.read_register(22) == 1234
+    assert instrument.read_bits(70, 2) == [0, 1]
+    instrument.write_register(30, 77)
+    assert simulator.bank(1).read_registers(30, 1) == [77]
+    instrument.address = 2
+    assert instrument.read_register(22) == 0
+    with pytest.raises(minimalmodbus.SlaveReportedException):
+        instrument.read_registers(65535, 2)
+    instrument.close()
+
+
+def test_tcp_session_runs_processor(simulator):
+    simulator.bank(1).set_register(24, 500)
+    manager = ModbusTcpConnectionManager(DummyLogger(), "127.0.0.1", simulator.port)
+    session = ModbusSession(DummyLogger(), connection_manager=manager)
+    repo = DummyRepo()
+    for _ in range(3):
+        ModbusProcessor(session.get_device(), repo, DummyLogger()).process()
+    assert {"valor": 500, "direccion": 24} in repo.updates
+    assert session.get_stats()["conexiones"] == 1
+    # Dos peticiones en bloque por ciclo sobre el mismo socket
+    assert simulator.requests == 6
+    session.cerrar_conexion()
+
+
+def test_tcp_manager_reports_connection_error():
+    with ModbusTcpSimulator() as sim:
+        port = sim.port
+    manager = ModbusTcpConnectionManager(DummyLogger(), "127.0.0.1", port, connect_timeout=0.5)
+    with pytest.raises(ModbusConnectionError):
+        manager.establish_connection()
@@ -0,0 +1,63 @@
+"""
+Test del esclavo virtual: Verifica que ModbusProcessor lee un mapa grande a través de él
+y que la latencia, los esclavos ausentes y la inyección de errores se comportan como en el bus real.
+"""
+import minimalmodbus  # pylint: disable=import-error
+import pytest  # pylint: disable=import-error
+from src.domain.register_map import DefinicionRegistro, compilar_plan
+from src.infrastructure.modbus_metrics import ModbusTransactionMetrics
+from src.infrastructure.modbus_virtual_slave import VirtualSlaveInstrument
+from src.modbus_processor import ModbusDevice, ModbusProcessor, SerialSettings
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+class DummyRepo:
+    def __init__(self):
+        self.updates = []
+    def actualizar_registro(self, consulta, parametros):
+        self.updates.append(parametros)
+
+
+def _sin_espera(_segundos):
+    pass
+
+
+def test_processor_lee_mapa_grande_en_bloques():
+    instrument = VirtualSlaveInstrument(sleep=_sin_espera)
+    for direccion in range(300):
+        instrument.bank(1).set_register(direccion, direccion * 2)
+    plan = compilar_plan([DefinicionRegistro(f"R{i}", i, direccion_db=i) for i in range(300)])
+    repo = DummyRepo()
+    ModbusProcessor(ModbusDevice(instrument, DummyLogger()), repo, DummyLogger(), plan).process()
+    assert instrument.peticiones == 3
+    assert len(repo.updates) == 300
+    assert {"valor": 598, "direccion": 299} in repo.updates
+
+
+def test_esclavo_ausente_y_latencia_mayor_al_timeout_no_responden():
+    esperas = []
+    instrument = VirtualSlaveInstrument(slave_ids=(1,), latencia_s=0.01, sleep=esperas.append)
+    instrument.address = 2
+    with pytest.raises(minimalmodbus.NoResponseError):
+        instrument.read_register(0)
+    instrument.address = 1
+    assert instrument.read_register(0) == 0
+    SerialSettings(timeout=0.005).aplicar(instrument)
+    with pytest.raises(minimalmodbus.NoResponseError):
+        instrument.read_register(0)
+    assert esperas == [0.05, 0.01, 0.005]
+
+
+def test_errores_inyectados_se_clasifican_en_las_metricas():
+    instrument = VirtualSlaveInstrument(tasa_timeouts=0.2, tasa_crc=0.2, seed=7, sleep=_sin_espera)
+    metrics = ModbusTransactionMetrics()
+    device = ModbusDevice(instrument, DummyLogger(), metrics)
+    for _ in range(200):
+        device.read_registers(0, 10)
+    totales = metrics.totales()
+    assert totales["transacciones"] == 200
+    assert 20 < totales["timeouts"] < 60
+    assert 10 < totales["errores_crc"] < 60
+    assert totales["otros_errores"] == 0
@@ -0,0 +1,115 @@
+"""
+Test de adquisición en paralelo: Verifica que cada puerto se sondea en su hilo y que las lecturas se fusionan en un solo flujo de persistencia.
+"""
+import threading
+import time
+from src.domain.register_map import DefinicionRegistro, compilar_plan
+from src.infrastructure import parallel_acquisition
+from src.infrastructure.parallel_acquisition import ParallelAcquisition
+
+class FakeDevice:
+    def __init__(self, port):
+        self.port = port
+        self.connection_lost = False
+    def select_slave(self, slave_address): pass
+    def read_registers(self, start, count, functioncode=3):
+        return [int(self.port[-1])] * count
+
+class FakeSession:
+    def __init__(self, log, manager):
+        self.device = FakeDevice(manager.port)
+        self.threads = set()
+    def get_device(self):
+        self.threads.add(threading.current_thread().name)
+        return self.device
+    def invalidate(self): pass
+    def cerrar_conexion(self): pass
+
+class FakeManager:
+    def __init__(self, log, port=None):
+        self.port = port
+
+class DummyRepo:
+    def __init__(self):
+        self.updates = []
+    def actualizar_registro(self, consulta, parametros):
+        self.updates.append(parametros)
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+
+def test_parallel_acquisition_merges_ports(monkeypatch):
+    monkeypatch.setattr(parallel_acquisition, 'ModbusSession', FakeSession)
+    monkeypatch.setattr(parallel_acquisition, 'ModbusConnectionManager', FakeManager)
+    plan_a = compilar_plan([DefinicionRegistro("A", 1, direccion_db=101)])
+    plan_b = compilar_plan([DefinicionRegistro("B", 1, direccion_db=201)])
+    acquisition = ParallelAcquisition(
+        plan_a, DummyLogger(), ports=["/dev/ttyUSB1", "/dev/ttyUSB2"],
+        planes_por_puerto={"/dev/ttyUSB2": plan_b}, periodo_s=0.01,
+    )
+    acquisition.start()
+    workers = list(acquisition.workers)
+    deadline = time.monotonic() + 2.0
+    while not all(worker.ciclos for worker in workers) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    acquisition.stop()
+    threads = set().union(*(worker.session.threads for worker in workers))
+    repo = DummyRepo()
+    acquisition.drain(repo)
+    assert threads == {"modbus-/dev/ttyUSB1", "modbus-/dev/ttyUSB2"}
+    assert {"valor": 1, "direccion": 101} in repo.updates
+    assert {"valor": 2, "direccion": 201} in repo.updates
+    assert acquisition.get_stats()["pendientes"] == 0
+
+
+def test_no_inicia_si_dos_puertos_comparten_destinos(monkeypatch):
+    monkeypatch.setattr(parallel_acquisition, 'ModbusSession', FakeSession)
+    monkeypatch.setattr(parallel_acquisition, 'ModbusConnectionManager', FakeManager)
+    plan = compilar_plan([DefinicionRegistro("A", 1, direccion_db=101)])
+    acquisition = ParallelAcquisition(plan, DummyLogger(), ports=["/dev/ttyUSB1", "/dev/ttyUSB2"])
+    try:
+        acquisition.start()
+    except RuntimeError as e:
+        assert "REGISTER_MAP_BY_PORT" in str(e)
+    else:
+        raise AssertionError("se esperaba RuntimeError")
+    assert acquisition.workers == []
+
+
+def test_muestras_y_cambios_separados_por_puerto(monkeypatch):
+    from src.domain.modbus_register import ModbusRegister
+    from src.infrastructure.sample_ring_buffer import SampleStore
+    plan_a = compilar_plan([DefinicionRegistro("HR", 1, direccion_db=101)])
+    plan_b = compilar_plan([DefinicionRegistro("HR", 1, direccion_db=201)])
+    store = SampleStore(capacidad=4)
+    acquisition = ParallelAcquisition(
+        plan_a, DummyLogger(), ports=[], planes_por_puerto={"COM4": plan_b}, sample_store=store,
+    )
+    acquisition.detectores = {"COM3": parallel_acquisition.DetectorCambios(), "COM4": parallel_acquisition.DetectorCambios()}
+    acquisition.cola.put(("COM3", [ModbusRegister(1, 7, "HR")]))
+    acquisition.cola.put(("COM4", [ModbusRegister(1, 7, "HR")]))
+    repo = DummyRepo()
+    acquisition.drain(repo)
+    # Mismo nombre y valor en dos equipos: ninguno se omite por el detector del otro
+    assert repo.updates == [{"valor": 7, "direccion": 101}, {"valor": 7, "direccion": 201}]
+    assert store.ultimo(("COM3", "HR"))[0] == 7
+    assert store.ultimo(("COM4", "HR"))[0] == 7
+    assert "HR" not in store.ultimos_valores()
+
+
+def test_mapa_por_puerto_coincide_con_el_enlace_by_id(tmp_path):
+    tty = tmp_path / "ttyUSB0"
+    tty.touch()
+    by_id = tmp_path / "by-id"
+    by_id.mkdir()
+    enlace = by_id / "usb-DigiRail_Connect-if00-port0"
+    enlace.symlink_to(tty)
+    plan_a = compilar_plan([DefinicionRegistro("A", 1, direccion_db=101)])
+    plan_b = compilar_plan([DefinicionRegistro("B", 1, direccion_db=201)])
+    # El mapa se configura con el dispositivo; el descubrimiento reporta el enlace by-id
+    acquisition = ParallelAcquisition(plan_a, DummyLogger(), planes_por_puerto={str(tty): plan_b})
+    assert acquisition.plan_de(str(enlace)) is plan_b
+    assert acquisition.plan_de("/dev/ttyUSB9") is plan_a
+    acquisition._verificar_destinos([str(enlace), "/dev/ttyUSB9"])
@@ -43,6 +43,6 @@ def test_process_modbus_operations_with_mock(monkeypatch):
     from src import modbus_processor
     monkeypatch.setattr(modbus_processor, 'ModbusConnectionManager', lambda logger: type('FakeMgr', (), {'establish_connection': lambda self: 'fake_instrument', 'device_address': 1})())
     monkeypatch.setattr(modbus_processor, 'ModbusDevice', lambda instrument, logger: DummyDevice())
-    monkeypatch.setattr(modbus_processor, 'ModbusProcessor', lambda device, repo, logger: DummyModbusProcessor(device, repo, logger))
+    monkeypatch.setattr(modbus_processor, 'ModbusProcessor', lambda device, repo, logger, read_plan=None, change_detector=None: DummyModbusProcessor(device, repo, logger))
     process_modbus_operations(repository=repo)
     assert hasattr(repo, 'called')
@@ -0,0 +1,32 @@
+"""
+Test de los contadores de producción: Verifica el ensamblado de 32 bits y los deltas con desborde y reinicio.
+"""
+from src.domain.production_counter import MODULO_32, calcular_deltas, delta_contador, ensamblar_32, ensamblar_serie
+from src.data_transfer_controller import IntervalProductionTransferService
+
+
+def test_ensamblar_32_combina_palabras():
+    assert ensamblar_32(0xFFFF, 0) == 65535
+    assert ensamblar_32(0, 1) == 65536
+    assert list(ensamblar_serie([1, 2], [0, 3])) == [1, 3 << 16 | 2]
+
+
+def test_delta_contador_distingue_desborde_de_reinicio():
+    assert delta_contador(100, 150) == 50
+    assert delta_contador(MODULO_32 - 10, 5) == 15
+    # Una caída grande no es un desborde: el equipo se reinició y contó 5 desde entonces
+    assert delta_contador(1_000_000, 5) == 5
+
+
+def test_calcular_deltas_serie_completa():
+    valores = [MODULO_32 - 20, MODULO_32 - 5, 10, 40, 3, 8]
+    serie = calcular_deltas(valores)
+    assert list(serie.deltas) == [15, 15, 30, 3, 5]
+    assert serie.vueltas == 1
+    assert serie.reinicios == 1
+
+
+def test_intervalo_no_es_negativo_cuando_la_palabra_baja_desborda():
+    # Palabra baja de 65530 a 4 con la alta incrementada: 10 unidades, no -65526
+    filas = [(65530, 0, 100, 0), (4, 1, 130, 0)]
+    assert IntervalProductionTransferService.calcular_intervalos(filas) == [(10, 30)]
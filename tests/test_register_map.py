@@ -0,0 +1,67 @@
+"""
+Test del mapa de registros: Verifica la compilación del mapa declarativo en un plan de lectura.
+"""
+import json
+import pytest  # pylint: disable=import-error
+from src.domain.register_map import DefinicionRegistro, compilar_plan
+from src.domain.modbus_processing_service import procesar_paso
+from src.infrastructure.register_map_loader import cargar_plan_lectura
+
+
+def test_compilar_plan_agrupa_por_dispositivo_y_funcion():
+    plan = compilar_plan([
+        DefinicionRegistro("A", 10, funcion=3, dispositivo=1),
+        DefinicionRegistro("B", 11, funcion=3, dispositivo=1, ancho=2),
+        DefinicionRegistro("C", 10, funcion=3, dispositivo=2),
+        DefinicionRegistro("D", 5, funcion=2, dispositivo=1),
+    ])
+    resumen = [(p.dispositivo, p.bloque.functioncode, p.bloque.start, p.bloque.count) for p in plan.pasos]
+    assert resumen == [(1, 2, 5, 1), (1, 3, 10, 3), (2, 3, 10, 1)]
+    assert plan.dispositivos() == (1, 2)
+    assert plan.destinos["B"] == (
+        "UPDATE registros_modbus SET valor = :valor WHERE direccion_modbus = :direccion", 11
+    )
+
+
+def test_procesar_paso_aplica_ancho_y_escala():
+    plan = compilar_plan([
+        DefinicionRegistro("CONTADOR", 0, ancho=2),
+        DefinicionRegistro("TEMPERATURA", 2, escala=0.1, desplazamiento=-10),
+    ])
+    registros = procesar_paso(plan.pasos[0], [1, 2, 300])
+    assert registros[0].value == 1 + (2 << 16)
+    assert registros[1].value == pytest.approx(20.0)
+
+
+def test_compilar_plan_rechaza_definiciones_invalidas():
+    with pytest.raises(ValueError):
+        compilar_plan([DefinicionRegistro("A", 1, columna="valor; DROP TABLE x")])
+    with pytest.raises(ValueError):
+        compilar_plan([DefinicionRegistro("A", 1), DefinicionRegistro("A", 2)])
+    with pytest.raises(ValueError):
+        compilar_plan([DefinicionRegistro("A", 1, funcion=2, ancho=2)])
+
+
+def test_cargar_plan_lectura_desde_archivo(tmp_path):
+    path = tmp_path / "mapa.json"
+    path.write_text(json.dumps({"registros": [
+        {"nombre": "X", "direccion": 1, "columna": "valor", "direccion_db": 100},
+        {"nombre": "Y", "direccion": 2},
+    ]}))
+    plan = cargar_plan_lectura(str(path))
+    assert len(plan.pasos) == 1
+    assert plan.destinos["X"][1] == 100
+    assert cargar_plan_lectura(str(path)) is plan
+
+
+def test_planes_por_puerto_desde_la_configuracion(tmp_path):
+    import json
+    import pytest  # pylint: disable=import-error
+    from src.infrastructure.register_map_loader import cargar_planes_por_puerto
+    mapa = tmp_path / "com4.json"
+    mapa.write_text(json.dumps({"registros": [{"nombre": "X", "direccion": 5, "direccion_db": 500}]}))
+    planes = cargar_planes_por_puerto(f"COM4={mapa}; ")
+    assert list(planes) == ["COM4"]
+    assert planes["COM4"].destinos["X"][1] == 500
+    with pytest.raises(ValueError):
+        cargar_planes_por_puerto("COM4")
@@ -0,0 +1,44 @@
+"""
+Test del buffer circular de muestras: Verifica el último valor, las ventanas tras dar la vuelta
+y que el almacén se alimenta con ModbusRegister.
+"""
+import pytest  # pylint: disable=import-error
+from src.domain.modbus_register import ModbusRegister
+from src.infrastructure.sample_ring_buffer import RingBuffer, SampleStore
+
+
+def test_ring_buffer_ultimo_y_ventanas_tras_dar_la_vuelta():
+    buffer = RingBuffer(4)
+    assert buffer.ultimo() is None
+    for i in range(1, 7):
+        buffer.agregar(i * 10, i * 1000, float(i))
+    assert buffer.cantidad == 4
+    assert buffer.ultimo() == (60.0, 6000, 6.0)
+    assert list(buffer.ultimos(3)) == [40.0, 50.0, 60.0]
+    assert list(buffer.ultimos(10)) == [30.0, 40.0, 50.0, 60.0]
+    valores, marcas = buffer.desde(4500)
+    assert list(valores) == [50.0, 60.0]
+    assert list(marcas) == [5000, 6000]
+    assert list(buffer.desde(0)[0]) == [30.0, 40.0, 50.0, 60.0]
+    assert list(buffer.desde(7000)[0]) == []
+
+
+def test_sample_store_registra_lecturas():
+    store = SampleStore(capacidad=10)
+    for ciclo in range(3):
+        store.registrar([
+            ModbusRegister(address=22, value=100 + ciclo, description="HR_COUNTER1_LO",
+                           monotonic_ns=ciclo, wall_time=float(ciclo)),
+            ModbusRegister(address=70, value=ciclo % 2, description="HR_INPUT1_STATE",
+                           monotonic_ns=ciclo, wall_time=float(ciclo)),
+        ])
+    assert store.ultimos_valores() == {"HR_COUNTER1_LO": 102.0, "HR_INPUT1_STATE": 0.0}
+    assert store.ultimo("HR_COUNTER1_LO") == (102.0, 2, 2.0)
+    assert list(store.ultimos("HR_COUNTER1_LO", 2)) == [101.0, 102.0]
+    assert store.ultimo("INEXISTENTE") is None
+    assert store.get_stats()["muestras"] == 6
+
+
+def test_capacidad_invalida():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
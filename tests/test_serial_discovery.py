@@ -0,0 +1,74 @@
+"""
+Test del descubrimiento de puertos: Verifica el caché, la invalidación y la detección de cambios en by-id.
+"""
+import os
+from src.infrastructure.serial_discovery import SerialPortDiscovery
+
+class FakeListPorts:
+    def __init__(self, ports):
+        self.ports = ports
+        self.calls = 0
+    def __call__(self):
+        self.calls += 1
+        return list(self.ports)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+DESCRIPTIONS = ("DigiRail Connect", "USB-SERIAL CH340")
+
+
+def _discovery(tmp_path, ports, **kwargs):
+    by_id = tmp_path / "by-id"
+    by_id.mkdir()
+    list_ports = FakeListPorts(ports)
+    discovery = SerialPortDiscovery(DummyLogger(), DESCRIPTIONS, by_id_dir=str(by_id), list_ports=list_ports, **kwargs)
+    return discovery, list_ports, by_id
+
+
+def test_discovery_caches_and_prefers_digirail(tmp_path):
+    tty_ch340 = tmp_path / "ttyUSB0"
+    tty_digirail = tmp_path / "ttyUSB1"
+    tty_ch340.touch()
+    tty_digirail.touch()
+    discovery, list_ports, _ = _discovery(tmp_path, [
+        (str(tty_ch340), "USB-SERIAL CH340 (COM3)", ""),
+        (str(tty_digirail), "DigiRail Connect", ""),
+    ])
+    for _ in range(5):
+        assert discovery.find_port() == str(tty_digirail)
+    assert list_ports.calls == 1
+    assert discovery.get_stats()["aciertos_cache"] == 4
+    discovery.invalidate()
+    discovery.find_port()
+    assert list_ports.calls == 2
+
+
+def test_discovery_resolves_by_id_and_detects_hotplug(tmp_path):
+    tty = tmp_path / "ttyUSB0"
+    tty.touch()
+    discovery, list_ports, by_id = _discovery(tmp_path, [(str(tty), "DigiRail Connect", "")])
+    os.symlink(tty, by_id / "usb-DigiRail_Connect-if00")
+    assert discovery.find_port() == str(by_id / "usb-DigiRail_Connect-if00")
+    os.utime(by_id, ns=(0, 0))
+    discovery.find_port()
+    assert list_ports.calls == 2
+
+
+def test_discovery_retries_empty_result_periodically(tmp_path):
+    clock = FakeClock()
+    discovery, list_ports, _ = _discovery(tmp_path, [], clock=clock, reintento_vacio_s=5.0)
+    assert discovery.find_port() is None
+    clock.now = 1.0
+    assert discovery.find_port() is None
+    assert list_ports.calls == 1
+    clock.now = 6.0
+    discovery.find_port()
+    assert list_ports.calls == 2
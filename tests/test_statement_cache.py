@@ -0,0 +1,33 @@
+"""
+Test de la caché de sentencias: Verifica la reutilización de TextClause, el descarte LRU
+y que el repositorio no reconstruye las consultas repetidas.
+"""
+from sqlalchemy import create_engine
+from src.infrastructure.db_operations import SQLAlchemyDatabaseRepository
+from src.infrastructure.statement_cache import StatementCache
+
+
+def test_lru_con_contadores():
+    cache = StatementCache(capacidad=2)
+    primera = cache.obtener("SELECT 1")
+    assert cache.obtener("SELECT 1") is primera
+    cache.obtener("SELECT 2")
+    cache.obtener("SELECT 1")  # SELECT 2 queda como la menos usada
+    cache.obtener("SELECT 3")
+    stats = cache.get_stats()
+    assert (stats["aciertos"], stats["fallos"], stats["descartes"]) == (2, 3, 1)
+    assert stats["entradas"] == 2
+    assert cache.obtener("SELECT 1") is primera
+    assert cache.get_stats()["fallos"] == 3
+
+
+def test_repositorio_reutiliza_las_sentencias(tmp_path):
+    cache = StatementCache()
+    repo = SQLAlchemyDatabaseRepository(
+        engine=create_engine(f"sqlite:///{tmp_path / 'cache.db'}"), cache_sentencias=cache
+    )
+    for _ in range(5):
+        assert repo.ejecutar_consulta("SELECT :valor", {"valor": 7}) == [(7,)]
+    assert cache.get_stats()["fallos"] == 1
+    assert cache.get_stats()["aciertos"] == 4
+    repo.cerrar_conexion()
@@ -0,0 +1,164 @@
+"""
+Test del store-and-forward: Verifica que las escrituras durante un corte se guardan localmente,
+sobreviven a un reinicio y se reenvían en orden, consolidadas y en lote al volver la conexión.
+"""
+from src.infrastructure.db_operations import DatabaseConnectionError, DatabaseUpdateError
+from src.infrastructure.store_and_forward import StoreAndForwardBuffer, StoreAndForwardRepository
+from src.data_transfer_controller import ProductionLogTransferService
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+class DummyLogger:
+    def info(self, msg, *args): pass
+    def error(self, msg, *args): pass
+    def warning(self, msg, *args): pass
+
+class FlakyRepo:
+    def __init__(self):
+        self.caida = False
+        self.escrituras = []
+        self.lotes = []
+    def _verificar(self):
+        if self.caida:
+            raise DatabaseUpdateError("Error al actualizar la base de datos") from DatabaseConnectionError("sin red")
+    def ejecutar_consulta(self, consulta, parametros):
+        self._verificar()
+        return []
+    def actualizar_registro(self, consulta, parametros):
+        self._verificar()
+        self.escrituras.append((consulta, parametros))
+    def insertar_lote(self, consulta, lista_parametros):
+        self._verificar()
+        self.lotes.append((consulta, list(lista_parametros)))
+    def commit(self): pass
+    def rollback(self): pass
+    def cerrar_conexion(self): pass
+
+
+UPDATE = "UPDATE registros_modbus SET valor = :valor WHERE direccion_modbus = :direccion"
+
+
+def test_corte_guarda_consolida_y_reenvia(tmp_path):
+    clock = FakeClock()
+    buffer = StoreAndForwardBuffer(str(tmp_path / "sf.sqlite3"), reintento_s=5.0, clock=clock)
+    repo = FlakyRepo()
+    sf = StoreAndForwardRepository(repo, buffer, DummyLogger())
+    repo.caida = True
+    for valor in range(10):
+        sf.actualizar_registro(UPDATE, {"valor": valor, "direccion": 1})
+        sf.actualizar_registro(UPDATE, {"valor": valor, "direccion": 2})
+    sf.insertar_lote("INSERT INTO ProductionLog ...", [{"unixtime": 300}])
+    # Dos direcciones consolidadas en su último valor más la fila de ProductionLog
+    assert buffer.pendientes() == 3
+    assert buffer.get_stats()["cortes"] == 1
+
+    repo.caida = False
+    sf.actualizar_registro(UPDATE, {"valor": 99, "direccion": 3})
+    # Todavía dentro de la ventana de reintento: no se intenta la red
+    assert repo.lotes == [] and repo.escrituras == []
+    clock.now = 6.0
+    sf.actualizar_registro(UPDATE, {"valor": 100, "direccion": 3})
+    assert buffer.pendientes() == 0
+    assert repo.lotes[0] == (UPDATE, [{"valor": 9, "direccion": 1}, {"valor": 9, "direccion": 2}])
+    assert repo.lotes[1][0] == "INSERT INTO ProductionLog ..."
+    assert repo.escrituras == [(UPDATE, {"valor": 100, "direccion": 3})]
+    assert buffer.get_stats()["reenviados"] == 4
+
+
+def test_backlog_sobrevive_a_un_reinicio(tmp_path):
+    path = str(tmp_path / "sf.sqlite3")
+    repo = FlakyRepo()
+    repo.caida = True
+    StoreAndForwardRepository(repo, StoreAndForwardBuffer(path), DummyLogger()).insertar_lote("INSERT ...", [{"a": 1}])
+    repo.caida = False
+    buffer = StoreAndForwardBuffer(path)
+    assert buffer.pendientes() == 1
+    assert buffer.reenviar(repo) == 1
+    assert repo.lotes == [("INSERT ...", [{"a": 1}])]
+
+
+
+def test_fila_rechazada_pasa_a_rechazados_sin_perder_el_resto(tmp_path):
+    buffer = StoreAndForwardBuffer(str(tmp_path / "sf.sqlite3"))
+    class PickyRepo(FlakyRepo):
+        def insertar_lote(self, consulta, lista_parametros):
+            if any(p["a"] == 2 for p in lista_parametros):
+                raise DatabaseUpdateError("valor fuera de rango")
+            super().insertar_lote(consulta, lista_parametros)
+    buffer.guardar("INSERT ...", [{"a": 1}, {"a": 2}, {"a": 3}])
+    repo = PickyRepo()
+    assert buffer.reenviar(repo) == 2
+    assert repo.lotes == [("INSERT ...", [{"a": 1}]), ("INSERT ...", [{"a": 3}])]
+    assert buffer.pendientes() == 0
+    assert buffer.rechazados() == [("INSERT ...", {"a": 2}, "valor fuera de rango")]
+    assert buffer.get_stats()["rechazados"] == 1
+
+def test_error_de_consulta_no_se_guarda(tmp_path):
+    buffer = StoreAndForwardBuffer(str(tmp_path / "sf.sqlite3"))
+    class BadRepo(FlakyRepo):
+        def actualizar_registro(self, consulta, parametros):
+            raise DatabaseUpdateError("columna inexistente")
+    sf = StoreAndForwardRepository(BadRepo(), buffer, DummyLogger())
+    try:
+        sf.actualizar_registro(UPDATE, {"valor": 1, "direccion": 1})
+    except DatabaseUpdateError:
+        pass
+    else:
+        raise AssertionError("se esperaba DatabaseUpdateError")
+    assert buffer.pendientes() == 0
+
+
+def test_snapshot_de_production_log_durante_un_corte(tmp_path):
+    buffer = StoreAndForwardBuffer(str(tmp_path / "sf.sqlite3"))
+    repo = FlakyRepo()
+    repo.caida = True
+    valores = {"HR_COUNTER1_LO": 10, "HR_COUNTER1_HI": 0, "HR_COUNTER2_LO": 20, "HR_COUNTER2_HI": 1}
+    service = ProductionLogTransferService(
+        DummyLogger(), StoreAndForwardRepository(repo, buffer, DummyLogger()), lambda: valores
+    )
+    service.transfer(marca_lectura=1_700_000_098)
+    assert buffer.pendientes() == 1
+    repo.caida = False
+    buffer.reenviar(repo)
+    consulta, filas = repo.lotes[0]
+    # Sin la clave única confirmada, la inserción idempotente es la de NOT EXISTS
+    assert "NOT EXISTS" in consulta
+    assert filas == [{"unixtime": 1_700_000_100, **valores}]
+
+
+def test_un_solo_snapshot_por_intervalo_durante_un_corte(tmp_path):
+    from src.data_transfer_controller import IntervalProductionTransferService
+    buffer = StoreAndForwardBuffer(str(tmp_path / "sf.sqlite3"))
+    repo = FlakyRepo()
+    repo.caida = True
+    sf = StoreAndForwardRepository(repo, buffer, DummyLogger())
+    valores = {"HR_COUNTER1_LO": 10, "HR_COUNTER1_HI": 0, "HR_COUNTER2_LO": 20, "HR_COUNTER2_HI": 1}
+    production = ProductionLogTransferService(DummyLogger(), sf, lambda: valores)
+    intervalos = IntervalProductionTransferService(DummyLogger(), sf)
+    intervalos._sembrado = True
+    intervalos.snapshot_anterior = (0, 0, 0, 1)
+    snapshots = []
+    # Varias llamadas dentro de la misma ventana de transferencia, con el contador avanzando
+    for marca in (1_700_000_098, 1_700_000_100, 1_700_000_102):
+        snapshot = production.transfer(marca_lectura=marca)
+        snapshots.append(snapshot)
+        intervalos.transfer(marca, snapshot)
+        valores["HR_COUNTER1_LO"] += 5
+    assert snapshots[1:] == [None, None]
+    assert intervalos.snapshot_anterior == (10, 0, 20, 1)
+    assert buffer.pendientes() == 2
+
+
+def test_actualizar_lote_durante_un_corte_consolida_por_direccion(tmp_path):
+    clock = FakeClock()
+    repo = FlakyRepo()
+    repo.caida = True
+    repo.actualizar_lote = repo.insertar_lote
+    sf = StoreAndForwardRepository(repo, StoreAndForwardBuffer(str(tmp_path / "sf.db"), clock=clock), DummyLogger())
+    for valor in range(3):
+        sf.actualizar_lote(UPDATE, [{"valor": valor, "direccion": 1}, {"valor": valor, "direccion": 2}])
+    assert sf.buffer.pendientes() == 2